@@ -0,0 +1,317 @@
+import asyncio
+import hashlib
+import logging
+import secrets
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+
+from dedup import apply_merges, load_merges
+from evaluation_db import DB_FILE, evaluations_from_rows, migrate_member_keys, open_store
+from evaluation_model import MIN_SCORE, validate_score
+from evaluation_storage import COLLECTIVE_CRITERIA, EVALUATIONS_FILE, INDIVIDUAL_CRITERIA, TEAM_LEVEL_MEMBER
+from exports import (
+    EXPORT_FORMATS,
+    EXPORT_KINDS,
+    ExportCache,
+    available_formats,
+    evaluation_chunks,
+    file_name,
+    iter_file,
+    ranking_row_chunks,
+)
+from leaderboard import Leaderboard, detailed_ranking_rows
+from roster import DATA_FILE, MemberDirectory, load_roster_snapshot, roster_slots
+from scoring import ScoreEngine
+
+# ------ SERVICE HTTP DES ÉVALUATIONS ------
+# API FastAPI au-dessus de la base partagée des jurys (evaluation_db) et du même moteur de scores
+# que le tableau de bord. Lancement : uvicorn api:app
+#
+# Les notes sont gardées en mémoire dans un ScoreEngine et un Leaderboard, synchronisés avec la
+# base à chaque requête (seules les notes modifiées depuis la dernière synchronisation sont lues ;
+# les requêtes simultanées partagent la même lecture). Les accès SQLite s'exécutent dans le pool
+# de threads pour ne pas bloquer la boucle asyncio. Les réponses de lecture portent un ETag
+# (identifiant du processus + version du moteur de scores) : un client qui renvoie If-None-Match
+# reçoit 304 tant qu'aucune note n'a changé.
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreSubmission(BaseModel):
+    team: str
+    # Identifiant ou nom du membre ; vide pour les critères collectifs
+    member: str = TEAM_LEVEL_MEMBER
+    criterion: str
+    # Bornée par la note maximale du critère (grille d'évaluation)
+    score: float = Field(ge=MIN_SCORE)
+    # Version de la note sur laquelle le client s'est basé (0 = jamais notée), lue dans
+    # GET /teams/{team} : la note n'est écrite que si elle n'a pas changé depuis
+    expected_version: int = Field(ge=0)
+    # Écraser la note quelle que soit sa version actuelle (expected_version est alors ignoré)
+    force: bool = False
+    judge: str = ""
+
+
+class ScoringService:
+    def __init__(self, store, teams):
+        self.store = store
+        self.teams = {team.name: team for team in teams}
+        self.members = MemberDirectory(teams)
+        migrate_member_keys(store, self.members)
+        rows, self.seq = store.load()
+        self.versions = {(row.team, row.member, row.criterion): row.version for row in rows}
+        self.engine = ScoreEngine(evaluations_from_rows(rows, self.members))
+        for team in teams:
+            for member_id in self.members.ids(team.name):
+                self.engine.ensure_member(team.name, member_id)
+        self.leaderboard = Leaderboard(
+            list(self.teams),
+            {team_name: self.engine.evaluations[team_name]["finalScore"] for team_name in self.teams}
+        )
+        self.engine.subscribe(lambda team_name, score: team_name in self.leaderboard and self.leaderboard.update(team_name, score))
+        # Identifiant du processus : les ETag d'un redémarrage précédent ne sont jamais reconnus
+        self._instance = secrets.token_hex(4)
+        self._refresh_task = None
+        self._payloads = {}
+        self._payloads_version = None
+        self.exports = ExportCache()
+
+    def etag(self, *parts):
+        return '"' + "-".join([self._instance, str(self.engine.version), *map(str, parts)]) + '"'
+
+    # ETag du détail d'une équipe : le nom (quelconque, pas forcément ASCII) est remplacé par son
+    # empreinte pour rester utilisable dans un en-tête HTTP
+    def team_etag(self, team_name):
+        return self.etag("team", hashlib.blake2b(team_name.encode("utf-8"), digest_size=6).hexdigest())
+
+    # Réponse mise en cache tant que la version du moteur de scores ne change pas
+    def cached_payload(self, key, build):
+        if self._payloads_version != self.engine.version:
+            self._payloads = {}
+            self._payloads_version = self.engine.version
+        if key not in self._payloads:
+            self._payloads[key] = build()
+        return self._payloads[key]
+
+    # Appliquer une note lue dans la base, sauf si une version plus récente est déjà connue
+    def _apply(self, team_name, member_name, criterion, score, version):
+        key = (team_name, member_name, criterion)
+        if version <= self.versions.get(key, 0):
+            return
+        # Notes d'un membre non inscrit : gardées dans la base, pas dans les scores
+        if member_name != TEAM_LEVEL_MEMBER and (team_name, member_name) not in self.members:
+            return
+        self.versions[key] = version
+        self.engine.set_score(team_name, member_name, criterion, score, record=False)
+
+    async def _refresh(self):
+        rows, latest = await run_in_threadpool(self.store.changes_since, self.seq)
+        for row in rows:
+            self._apply(row.team, row.member, row.criterion, row.score, row.version)
+        self.seq = max(self.seq, latest)
+
+    # Récupérer les notes écrites par les autres (tableau de bord, autres processus)
+    async def refresh(self):
+        task = self._refresh_task
+        if task is None:
+            task = self._refresh_task = asyncio.ensure_future(self._refresh())
+            task.add_done_callback(lambda _: setattr(self, "_refresh_task", None))
+        await asyncio.shield(task)
+
+    async def submit(self, submission):
+        result = await run_in_threadpool(
+            self.store.upsert, submission.team, submission.member, submission.criterion, submission.score,
+            None if submission.force else submission.expected_version, submission.judge
+        )
+        if result.ok:
+            self._apply(submission.team, submission.member, submission.criterion, submission.score, result.version)
+            # Avancer la séquence seulement si aucune écriture d'un autre n'a été intercalée
+            if result.seq == self.seq + 1:
+                self.seq = result.seq
+        return result
+
+    def team_breakdown(self, team_name):
+        team_eval = self.engine.evaluations[team_name]
+        summary = self.engine.team_summary(team_name)
+        return {
+            "team": team_name,
+            "rank": self.leaderboard.rank_of(team_name),
+            "position": self.leaderboard.position_of(team_name),
+            "finalScore": summary["final"],
+            "collectiveScore": summary["collective"],
+            "individualAverage": summary["individual_average"],
+            "collective": dict(team_eval["collective"]),
+            "members": {member: self.members.name(team_name, member) for member in team_eval["individual"]},
+            "individual": {member: dict(scores) for member, scores in team_eval["individual"].items()},
+            "versions": {
+                "collective": {
+                    criterion: self.versions.get((team_name, TEAM_LEVEL_MEMBER, criterion), 0)
+                    for criterion in COLLECTIVE_CRITERIA
+                },
+                "individual": {
+                    member: {
+                        criterion: self.versions.get((team_name, member, criterion), 0)
+                        for criterion in INDIVIDUAL_CRITERIA
+                    }
+                    for member in team_eval["individual"]
+                },
+            },
+        }
+
+    # Instantané des données d'un export, pris sur la boucle asyncio où submit et _refresh
+    # modifient les notes : le fichier peut ensuite être généré dans le pool de threads sans lire
+    # le moteur de scores pendant une écriture
+    def export_chunks(self, kind):
+        if kind == "classement":
+            teams = list(self.teams.values())
+            slots = roster_slots(teams)
+            rows = list(detailed_ranking_rows(self.engine, self.leaderboard, teams, slots))
+            return lambda: ranking_row_chunks(rows, slots)
+        evaluations = {team_name: team_eval.copy() for team_name, team_eval in self.engine.evaluations.items()}
+        return lambda: evaluation_chunks(evaluations)
+
+    # Fichier d'export pour la version courante des notes : l'instantané n'est pris que si le
+    # fichier de cette version n'est pas déjà en cache, et le fichier est écrit dans le pool de threads
+    async def export_file(self, kind, export_format):
+        version = self.engine.version
+        path = self.exports.cached(kind, export_format, version)
+        if path is None:
+            path = await run_in_threadpool(self.exports.get, kind, export_format, version, self.export_chunks(kind))
+        return path
+
+    def ranking(self, limit):
+        teams = []
+        for rank, team_name, final_score in self.leaderboard.top(limit):
+            summary = self.engine.team_summary(team_name)
+            teams.append({
+                "rank": rank,
+                "team": team_name,
+                "finalScore": final_score,
+                "collectiveScore": summary["collective"],
+                "individualAverage": summary["individual_average"],
+            })
+        return {"teams": teams}
+
+
+# Fonction pour charger les équipes inscrites (aucune équipe si data.csv est absent), depuis
+# l'instantané binaire du roster tant que data.csv n'a pas changé. Les lignes mal formées sont
+# signalées dans le journal du serveur.
+def load_teams(data_file=DATA_FILE):
+    try:
+        snapshot = load_roster_snapshot(data_file)
+    except FileNotFoundError:
+        logger.warning("Fichier %s non trouvé : aucune équipe chargée", data_file)
+        return ()
+    for problem in snapshot.problems:
+        logger.warning("%s : %s", data_file, problem)
+    return apply_merges(snapshot.teams, load_merges())
+
+# Vérifier si l'ETag du client correspond (If-None-Match peut contenir une liste ou "*")
+def etag_matches(request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def cached_response(request, etag, build):
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(build(), headers=headers)
+
+
+def create_app(db_file=DB_FILE, data_file=DATA_FILE):
+    @asynccontextmanager
+    async def lifespan(app):
+        teams = await run_in_threadpool(load_teams, data_file)
+        store = await run_in_threadpool(open_store, db_file, EVALUATIONS_FILE, MemberDirectory(teams))
+        app.state.service = ScoringService(store, teams)
+        yield
+
+    app = FastAPI(title="HACKVERSE 2025 - Évaluations", lifespan=lifespan)
+
+    @app.post("/scores")
+    async def submit_score(submission: ScoreSubmission):
+        service = app.state.service
+        if submission.team not in service.teams:
+            raise HTTPException(status_code=404, detail=f"Équipe inconnue : {submission.team}")
+        if submission.criterion in COLLECTIVE_CRITERIA:
+            if submission.member != TEAM_LEVEL_MEMBER:
+                raise HTTPException(status_code=422, detail=f"Le critère {submission.criterion} est collectif : member doit être vide")
+        elif submission.criterion in INDIVIDUAL_CRITERIA:
+            member_id = service.members.resolve(submission.team, submission.member)
+            if member_id is None:
+                raise HTTPException(status_code=404, detail=f"Membre inconnu dans l'équipe {submission.team} : {submission.member}")
+            # Affectation simple : compatible avec pydantic 1 et 2 (requirements.txt)
+            submission.member = member_id
+        else:
+            raise HTTPException(status_code=422, detail=f"Critère inconnu : {submission.criterion}")
+        try:
+            validate_score(submission.criterion, submission.score)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+        result = await service.submit(submission)
+        if not result.ok:
+            raise HTTPException(status_code=409, detail={
+                "message": "La note a été modifiée entre-temps",
+                "score": result.score,
+                "version": result.version,
+                "judge": result.judge,
+            })
+        return {
+            "team": submission.team,
+            "member": submission.member,
+            "criterion": submission.criterion,
+            "score": result.score,
+            "version": result.version,
+            "finalScore": service.engine.evaluations[submission.team]["finalScore"],
+        }
+
+    @app.get("/teams/{team_name}")
+    async def team_breakdown(team_name: str, request: Request):
+        service = app.state.service
+        await service.refresh()
+        if team_name not in service.teams:
+            raise HTTPException(status_code=404, detail=f"Équipe inconnue : {team_name}")
+        return cached_response(
+            request, service.team_etag(team_name),
+            lambda: service.cached_payload(("team", team_name), lambda: service.team_breakdown(team_name))
+        )
+
+    @app.get("/leaderboard")
+    async def leaderboard(request: Request, limit: Optional[int] = Query(default=None, ge=1)):
+        service = app.state.service
+        await service.refresh()
+        return cached_response(
+            request, service.etag("leaderboard", limit or "all"),
+            lambda: service.cached_payload(("leaderboard", limit), lambda: service.ranking(limit))
+        )
+
+    # Export du classement détaillé ou de toutes les notes, envoyé par blocs
+    @app.get("/export/{kind}")
+    async def export(kind: str, request: Request, format: str = Query(default="csv")):
+        service = app.state.service
+        if kind not in EXPORT_KINDS:
+            raise HTTPException(status_code=404, detail=f"Export inconnu : {kind}")
+        if format not in available_formats():
+            raise HTTPException(status_code=422, detail=f"Format non disponible : {format}")
+        await service.refresh()
+        etag = service.etag("export", kind, format)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        path = await service.export_file(kind, format)
+        headers["Content-Disposition"] = f'attachment; filename="{file_name(kind, format)}"'
+        return StreamingResponse(iter_file(path), media_type=EXPORT_FORMATS[format].mime, headers=headers)
+
+    return app
+
+
+app = create_app()
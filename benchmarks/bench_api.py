@@ -0,0 +1,139 @@
+# Benchmark du service HTTP (api.py) sous clients concurrents : débit et latence de chaque
+# point d'accès, avec et sans If-None-Match. Le serveur uvicorn tourne dans un processus séparé,
+# sur une base et un data.csv synthétiques (dossier temporaire).
+#
+# Utilisation (depuis la racine du dépôt) :
+#     python benchmarks/bench_api.py --teams 500 --clients 1 16 64 --duration 3
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from evaluation_storage import COLLECTIVE_CRITERIA
+
+
+# Fonction pour générer un data.csv synthétique (3 membres par équipe)
+def write_roster(path, n_teams):
+    columns = {"team_name": [f"Equipe_{i}" for i in range(n_teams)]}
+    for prefix in ["leader", "member1", "member2"]:
+        columns[f"{prefix}_name"] = [f"{prefix}_{i}" for i in range(n_teams)]
+    pd.DataFrame(columns).to_csv(path, index=False)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# Le serveur tourne dans un processus séparé pour ne pas partager le GIL avec les clients
+def start_server(db_file, data_file):
+    port = free_port()
+    code = (
+        "import uvicorn; from api import create_app; "
+        f"uvicorn.run(create_app({db_file!r}, {data_file!r}), port={port}, log_level='warning')"
+    )
+    server = subprocess.Popen([sys.executable, "-c", code], cwd=REPO_DIR)
+    base_url = f"http://127.0.0.1:{port}"
+    while True:
+        try:
+            httpx.get(f"{base_url}/leaderboard", params={"limit": 1})
+            return server, base_url
+        except httpx.TransportError:
+            if server.poll() is not None:
+                raise RuntimeError("Le serveur n'a pas démarré")
+            time.sleep(0.1)
+
+
+# Requêtes des différents scénarios ; chaque fonction effectue une requête et vérifie son statut
+def scenarios(n_teams):
+    rng = np.random.default_rng(0)
+
+    async def leaderboard(client, state):
+        response = await client.get("/leaderboard", params={"limit": 10})
+        assert response.status_code == 200
+
+    async def leaderboard_etag(client, state):
+        headers = {"If-None-Match": state["etag"]} if "etag" in state else {}
+        response = await client.get("/leaderboard", params={"limit": 10}, headers=headers)
+        assert response.status_code in (200, 304)
+        state["etag"] = response.headers["etag"]
+
+    async def team(client, state):
+        response = await client.get(f"/teams/Equipe_{rng.integers(n_teams)}")
+        assert response.status_code == 200
+
+    async def submit(client, state):
+        response = await client.post("/scores", json={
+            "team": f"Equipe_{rng.integers(n_teams)}",
+            "criterion": COLLECTIVE_CRITERIA[rng.integers(len(COLLECTIVE_CRITERIA))],
+            "score": float(rng.integers(0, 21)),
+            "expected_version": 0,
+            "force": True,
+            "judge": "bench",
+        })
+        assert response.status_code == 200
+
+    return {
+        "GET /leaderboard": leaderboard,
+        "GET /leaderboard (If-None-Match)": leaderboard_etag,
+        "GET /teams/{team}": team,
+        "POST /scores": submit,
+    }
+
+
+async def run_clients(base_url, request, n_clients, duration):
+    latencies = []
+    limits = httpx.Limits(max_connections=n_clients, max_keepalive_connections=n_clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            state = {}
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await request(client, state)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(n_clients)))
+        elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return len(latencies) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du service HTTP des évaluations")
+    parser.add_argument("--teams", type=int, default=500)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=3.0, help="Durée de chaque mesure (s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "data.csv")
+        write_roster(data_file, args.teams)
+        server, base_url = start_server(os.path.join(directory, "bench.db"), data_file)
+        try:
+            print(f"{'scénario':<34} {'clients':>7} {'req/s':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+            for name, request in scenarios(args.teams).items():
+                for n_clients in args.clients:
+                    throughput, p50, p95 = asyncio.run(run_clients(base_url, request, n_clients, args.duration))
+                    print(f"{name:<34} {n_clients:>7} {throughput:>9.0f} {p50:>9.2f} {p95:>9.2f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Benchmark du démarrage à froid du tableau de bord : chaque mesure est faite dans un processus
+# Python neuf, sur une copie de l'application et un data.csv synthétique.
+#   - roster : lecture de data.csv avec pandas (read_registrations + transform_data) comparée à
+#     la relecture de l'instantané binaire (load_roster_snapshot) ;
+#   - premier rendu : première exécution complète du script (AppTest), sans instantané puis avec,
+#     et modules de graphiques importés à la fin de cette exécution (onglet 1 affiché).
+#
+# Utilisation (depuis la racine du dépôt) :
+#     python benchmarks/bench_cold_start.py --teams 100 1000 10000
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from bench_read_registrations import write_registrations
+
+# Bibliothèques de graphiques dont on vérifie l'import au démarrage
+CHART_MODULES = ["matplotlib", "plotly", "seaborn"]
+
+# Lecture du roster dans un processus neuf (imports de l'application exclus)
+ROSTER_SCRIPT = """
+import json, sys, time
+import roster
+start = time.perf_counter()
+if sys.argv[1] == "csv":
+    df, problems = roster.read_registrations(roster.DATA_FILE)
+    roster.transform_data(df)
+else:
+    roster.load_roster_snapshot(roster.DATA_FILE)
+print(json.dumps({"seconds": time.perf_counter() - start}))
+"""
+
+# Première exécution du script dans un processus neuf (import de l'outil de test exclu)
+FIRST_RENDER_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file("hackathon_dashboard.py", default_timeout=600).run()
+seconds = time.perf_counter() - start
+print(json.dumps({
+    "seconds": seconds,
+    "exceptions": [str(e.value) for e in at.exception],
+    "chart_modules": [name for name in %r if name in sys.modules],
+}))
+""" % (CHART_MODULES,)
+
+
+def run_script(script, directory, *args):
+    output = subprocess.run(
+        [sys.executable, "-c", script, *args], cwd=directory, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+# Copie de l'application (modules, grille) dans un dossier de travail, avec un data.csv synthétique
+def prepare_app(directory, n_teams):
+    for path in glob.glob(os.path.join(ROOT_DIR, "*.py")) + [os.path.join(ROOT_DIR, "rubric.json")]:
+        shutil.copy(path, directory)
+    write_registrations(os.path.join(directory, "data.csv"), n_teams)
+
+def remove_snapshots(directory):
+    for path in glob.glob(os.path.join(directory, ".*.roster.pkl")):
+        os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage à froid du tableau de bord")
+    parser.add_argument("--teams", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--skip-render", action="store_true", help="Mesurer seulement la lecture du roster")
+    args = parser.parse_args()
+
+    print(f"{'équipes':>7} {'mesure':<34} {'temps (ms)':>11}  graphiques importés")
+    for n_teams in args.teams:
+        with tempfile.TemporaryDirectory() as directory:
+            prepare_app(directory, n_teams)
+            remove_snapshots(directory)
+            csv = run_script(ROSTER_SCRIPT, directory, "csv")
+            run_script(ROSTER_SCRIPT, directory, "snapshot")
+            snapshot = run_script(ROSTER_SCRIPT, directory, "snapshot")
+            print(f"{n_teams:>7} {'roster (CSV pandas)':<34} {csv['seconds'] * 1000:>11.1f}")
+            print(f"{n_teams:>7} {'roster (instantané)':<34} {snapshot['seconds'] * 1000:>11.1f}")
+            if args.skip_render:
+                continue
+
+            remove_snapshots(directory)
+            for label in ["premier rendu (sans instantané)", "premier rendu (avec instantané)"]:
+                result = run_script(FIRST_RENDER_SCRIPT, directory)
+                if result["exceptions"]:
+                    print(f"{n_teams:>7} {label:<34} erreur : {result['exceptions'][0]}")
+                    continue
+                modules = ", ".join(result["chart_modules"]) or "aucun"
+                print(f"{n_teams:>7} {label:<34} {result['seconds'] * 1000:>11.1f}  {modules}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# Benchmark des chemins de données du tableau de bord, hors Streamlit, sur des inscriptions et des
+# évaluations synthétiques de 10 à 10 000 équipes : lecture de data.csv, construction du roster,
+# sauvegarde/chargement des évaluations (format long et ancien format large), calcul des scores et
+# construction du classement (onglet 2), répartition des équipes entre les jurys et exports (CSV,
+# XLSX, Parquet). Chaque mesure donne le meilleur temps et le pic de mémoire allouée (tracemalloc).
+#
+# Les résultats peuvent être enregistrés comme référence (--save-baseline) puis comparés à chaque
+# exécution (--compare) : une mesure plus lente que la référence au-delà de --tolerance est
+# signalée et le script se termine avec le code 1.
+#
+# Utilisation (depuis la racine du dépôt) :
+#     python benchmarks/bench_data_paths.py --teams 10 100 1000 10000
+#     python benchmarks/bench_data_paths.py --save-baseline
+#     python benchmarks/bench_data_paths.py --compare
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+
+from bench_read_registrations import write_registrations
+from evaluation_storage import (
+    COLLECTIVE_CRITERIA,
+    INDIVIDUAL_CRITERIA,
+    dataframe_to_evaluations,
+    evaluations_to_dataframe,
+    evaluations_to_long_dataframe,
+    long_dataframe_to_evaluations,
+)
+from evaluation_model import TeamEvaluation
+from exports import WRITERS, available_formats, evaluation_chunks, ranking_chunks
+from judge_assignment import Judge, assign_teams
+from leaderboard import Leaderboard, ranking_frame
+from roster import MemberDirectory, member_ids, read_registrations, transform_data
+from scoring import ScoreEngine, calculate_final_score
+
+BASELINE_FILE = os.path.join(BENCHMARKS_DIR, "baseline_data_paths.json")
+
+# L'ancien format large a trois colonnes par membre : au-delà, le tableau devient démesuré
+WIDE_MAX_TEAMS = 1000
+
+# Jurys de la répartition : un tiers sans département, les autres en conflit avec une partie des équipes
+JUDGES = [Judge(f"Jury {i}", ["", "Informatique", "Mathématiques"][i % 3], "") for i in range(20)]
+JUDGE_OVERLAP = 2
+
+
+# Fonction pour générer des évaluations synthétiques (toutes les notes remplies) pour un roster
+def make_evaluations(teams, seed=0):
+    rng = np.random.default_rng(seed)
+    evaluations = {}
+    for team in teams:
+        team_eval = evaluations[team.name] = TeamEvaluation()
+        team_eval.collective.values[:] = rng.integers(0, 21, len(COLLECTIVE_CRITERIA))
+        for member_id in member_ids(team):
+            team_eval.individual[member_id] = dict(zip(INDIVIDUAL_CRITERIA, rng.integers(0, 21, len(INDIVIDUAL_CRITERIA)).tolist()))
+    return evaluations
+
+# Moteur de scores et classement trié comme dans l'onglet 2
+def build_leaderboard(evaluations, teams):
+    engine = ScoreEngine(evaluations)
+    for team in teams:
+        for member_id in member_ids(team):
+            engine.ensure_member(team.name, member_id)
+    leaderboard = Leaderboard(
+        [team.name for team in teams],
+        {team.name: evaluations[team.name]["finalScore"] for team in teams}
+    )
+    return engine, leaderboard
+
+def build_ranking(evaluations, teams):
+    return ranking_frame(*build_leaderboard(evaluations, teams))
+
+# Export écrit dans un fichier temporaire, comme dans le cache des exports
+def write_export(path, export_format, chunks):
+    with open(path, "wb") as f:
+        WRITERS[export_format](chunks, f)
+
+def calculate_all_scores(evaluations):
+    for team_name in evaluations:
+        calculate_final_score(evaluations, team_name)
+
+
+# Meilleur temps sur repeat exécutions, puis pic de mémoire sur une exécution supplémentaire
+def measure(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1e6
+
+
+# Mesures pour un nombre d'équipes : {nom de la mesure: (temps en s, pic en Mo)}
+def run_size(n_teams, repeat, directory):
+    path = os.path.join(directory, f"data_{n_teams}.csv")
+    write_registrations(path, n_teams)
+    df, _ = read_registrations(path)
+    teams = transform_data(df)
+    evaluations = make_evaluations(teams)
+    calculate_all_scores(evaluations)
+    long_df = evaluations_to_long_dataframe(evaluations)
+
+    cases = {
+        "read_registrations": lambda: read_registrations(path),
+        "transform_data": lambda: transform_data(df),
+        "MemberDirectory": lambda: MemberDirectory(teams),
+        "evaluations_to_long_dataframe": lambda: evaluations_to_long_dataframe(evaluations),
+        "long_dataframe_to_evaluations": lambda: long_dataframe_to_evaluations(long_df),
+        "calculate_final_score (toutes)": lambda: calculate_all_scores(evaluations),
+        "ScoreEngine": lambda: ScoreEngine(evaluations),
+        "classement (onglet 2)": lambda: build_ranking(long_dataframe_to_evaluations(long_df), teams),
+        "répartition des jurys": lambda: assign_teams(teams, JUDGES, JUDGE_OVERLAP),
+    }
+    engine, leaderboard = build_leaderboard(evaluations, teams)
+    export_path = os.path.join(directory, "export")
+    for export_format in available_formats():
+        cases[f"export classement ({export_format})"] = (
+            lambda export_format=export_format: write_export(export_path, export_format, ranking_chunks(engine, leaderboard, teams))
+        )
+        cases[f"export évaluations ({export_format})"] = (
+            lambda export_format=export_format: write_export(export_path, export_format, evaluation_chunks(evaluations))
+        )
+    if n_teams <= WIDE_MAX_TEAMS:
+        wide_df = evaluations_to_dataframe(evaluations)
+        cases["evaluations_to_dataframe"] = lambda: evaluations_to_dataframe(evaluations)
+        cases["dataframe_to_evaluations"] = lambda: dataframe_to_evaluations(wide_df)
+
+    return {name: measure(func, repeat) for name, func in cases.items()}
+
+
+def load_baseline(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baseline(path, results):
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {
+            str(n_teams): {name: {"seconds": seconds, "peak_mb": peak} for name, (seconds, peak) in cases.items()}
+            for n_teams, cases in results.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des chemins de données du tableau de bord")
+    parser.add_argument("--teams", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Fichier de référence (JSON)")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistrer les résultats comme référence")
+    parser.add_argument("--compare", action="store_true", help="Comparer les résultats à la référence")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Ralentissement toléré par rapport à la référence (1.5 = +50 %%)")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)["results"] if args.compare else {}
+    regressions = []
+    results = {}
+    print(f"{'équipes':>7} {'mesure':<32} {'temps (ms)':>11} {'pic (Mo)':>9} {'référence':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_teams in args.teams:
+            results[n_teams] = run_size(n_teams, args.repeat, directory)
+            for name, (seconds, peak) in results[n_teams].items():
+                reference = baseline.get(str(n_teams), {}).get(name)
+                comparison = ""
+                if reference:
+                    ratio = seconds / reference["seconds"]
+                    comparison = f"x{ratio:.2f}"
+                    if ratio > args.tolerance:
+                        comparison += " !"
+                        regressions.append((n_teams, name, ratio))
+                print(f"{n_teams:>7} {name:<32} {seconds * 1000:>11.2f} {peak:>9.1f} {comparison:>10}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Référence enregistrée dans {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} mesure(s) plus lente(s) que la référence (tolérance x{args.tolerance}) :")
+        for n_teams, name, ratio in regressions:
+            print(f"  {name} ({n_teams} équipes) : x{ratio:.2f}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
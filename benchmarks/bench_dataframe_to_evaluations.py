@@ -0,0 +1,101 @@
+# Benchmark du chargement de l'ancien format large : dataframe_to_evaluations vectorisé
+# comparé à l'implémentation historique basée sur iterrows.
+#
+# Utilisation (depuis la racine du dépôt) :
+#     python benchmarks/bench_dataframe_to_evaluations.py --teams 1000 10000
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evaluation_storage import COLLECTIVE_CRITERIA, dataframe_to_evaluations
+
+
+# Implémentation historique (iterrows + réanalyse des colonnes à chaque ligne), gardée comme référence
+def legacy_dataframe_to_evaluations(df):
+    evaluations = {}
+    for _, row in df.iterrows():
+        team_name = row["team_name"]
+        evaluations[team_name] = {
+            "collective": {
+                criterion: float(row[f"collective_{criterion}"])
+                for criterion in COLLECTIVE_CRITERIA + ["totalScore"]
+            },
+            "individual": {},
+            "finalScore": float(row["finalScore"])
+        }
+        individual_columns = [col for col in row.index if col.startswith("individual_")]
+        member_prefixes = set()
+        for col in individual_columns:
+            parts = col.split('_')
+            if len(parts) >= 3:
+                member_prefixes.add('_'.join(parts[1:-1]))
+        for member_prefix in member_prefixes:
+            member_name = member_prefix.replace('_', ' ')
+            member_data = {}
+            for criterion in ['webProgramming', 'algorithmic', 'totalScore']:
+                col_name = f'individual_{member_prefix}_{criterion}'
+                if col_name in row:
+                    try:
+                        member_data[criterion] = float(row[col_name])
+                    except (ValueError, TypeError):
+                        member_data[criterion] = 0.0
+                else:
+                    member_data[criterion] = 0.0
+            evaluations[team_name]["individual"][member_name] = member_data
+    return evaluations
+
+
+# Fonction pour générer un fichier large synthétique : chaque équipe a 3 membres tirés d'un
+# vivier de noms partagé (le vivier borne le nombre de colonnes, comme dans un vrai export).
+def make_wide_dataframe(n_teams, member_pool=150, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {"team_name": [f"Equipe_{i}" for i in range(n_teams)]}
+    for criterion in COLLECTIVE_CRITERIA + ["totalScore"]:
+        columns[f"collective_{criterion}"] = rng.integers(0, 21, n_teams).astype(float)
+    columns["finalScore"] = rng.uniform(0, 20, n_teams).round(2)
+
+    members = rng.integers(0, member_pool, (n_teams, 3))
+    for m in range(member_pool):
+        in_team = (members == m).any(axis=1)
+        for criterion in ["webProgramming", "algorithmic", "totalScore"]:
+            values = np.where(in_team, rng.integers(0, 21, n_teams).astype(float), np.nan)
+            columns[f"individual_Membre_{m}_{criterion}"] = values
+    return pd.DataFrame(columns)
+
+
+def time_call(func, df, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de dataframe_to_evaluations")
+    parser.add_argument("--teams", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--member-pool", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true", help="Ne pas mesurer l'implémentation iterrows")
+    args = parser.parse_args()
+
+    print(f"{'équipes':>8} {'colonnes':>9} {'vectorisé (s)':>14} {'iterrows (s)':>13} {'gain':>7}")
+    for n_teams in args.teams:
+        df = make_wide_dataframe(n_teams, args.member_pool)
+        vectorized = time_call(dataframe_to_evaluations, df, args.repeat)
+        if args.skip_legacy:
+            print(f"{n_teams:>8} {df.shape[1]:>9} {vectorized:>14.3f} {'-':>13} {'-':>7}")
+            continue
+        legacy = time_call(legacy_dataframe_to_evaluations, df, 1)
+        print(f"{n_teams:>8} {df.shape[1]:>9} {vectorized:>14.3f} {legacy:>13.3f} {legacy / vectorized:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
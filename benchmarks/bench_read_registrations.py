@@ -0,0 +1,87 @@
+# Benchmark du chargement de data.csv : lecture complète historique (pd.read_csv de toutes les
+# colonnes) comparée à la lecture par morceaux de read_registrations (colonnes utilisées
+# seulement, catégories), sur un export d'inscriptions synthétique.
+#
+# Utilisation (depuis la racine du dépôt) :
+#     python benchmarks/bench_read_registrations.py --rows 10000 50000
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roster import MEMBER_FIELDS, read_registrations, transform_data
+
+CYCLES = ["Licence", "Cycle Ingenieur", "Master"]
+LEVELS = ["Niveau 1", "Niveau 2", "Niveau 3", "Niveau 4", "Niveau 5"]
+DEPARTMENTS = ["Informatique", "Mathématiques", "Génie électrique", "Télécommunications"]
+SKILLS = ["Non", "Debutant", "Intermediaire", "Avancé"]
+LANGUAGES = ["Python", "Java", "Javascript", "C", "PHP", "React"]
+
+
+# Fonction pour générer un export d'inscriptions synthétique (mêmes colonnes que data.csv,
+# avec de longs textes libres pour la description et les projets) : un chef d'équipe et
+# team_size - 1 membres par équipe
+def write_registrations(path, n_rows, seed=0, team_size=3):
+    rng = np.random.default_rng(seed)
+    choice = lambda values: rng.choice(values, n_rows)
+    blob = lambda words: [" ".join(rng.choice(LANGUAGES + DEPARTMENTS, words)) for _ in range(n_rows)]
+    columns = {
+        "timestamp": ["16/04/2025 13:09:46"] * n_rows,
+        "team_name": [f"Equipe_{i}" for i in range(n_rows)],
+        "team_description": blob(40),
+    }
+    for prefix in ["leader"] + [f"member{i}" for i in range(1, team_size)]:
+        columns[f"{prefix}_name"] = [f"{prefix} {i}" for i in range(n_rows)]
+        columns[f"{prefix}_email"] = [f"{prefix}.{i}@gmail.com" for i in range(n_rows)]
+        columns[f"{prefix}_phone"] = rng.integers(650000000, 699999999, n_rows)
+        columns[f"{prefix}_cycle"] = choice(CYCLES)
+        columns[f"{prefix}_level"] = choice(LEVELS)
+        columns[f"{prefix}_department"] = choice(DEPARTMENTS)
+        columns[f"{prefix}_github"] = [f"https://github.com/{prefix}{i}" for i in range(n_rows)]
+        columns[f"{prefix}_experience"] = blob(10)
+        for field in ["frontend_skill", "backend_skill", "database_skill", "devops_skill"]:
+            columns[f"{prefix}_{MEMBER_FIELDS[field]}"] = choice(SKILLS)
+        columns[f"{prefix}_languages"] = [", ".join(rng.choice(LANGUAGES, 3)) for _ in range(n_rows)]
+    columns["team_projects"] = blob(120)
+    columns["previous_hackathons"] = choice(["Oui", "Non"])
+    columns["how_heard"] = choice(["Facebook", "WhatsApp", "Affiche"])
+    columns["special_needs"] = [""] * n_rows
+    pd.DataFrame(columns).to_csv(path, index=False)
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du chargement de data.csv")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lignes':>7} {'complet (s)':>12} {'complet (Mo)':>13} {'morceaux (s)':>13} {'morceaux (Mo)':>14} {'roster (s)':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rows in args.rows:
+            path = os.path.join(directory, "data.csv")
+            write_registrations(path, n_rows)
+            full_time, full_df = best_time(lambda: pd.read_csv(path), args.repeat)
+            chunked_time, (chunked_df, _) = best_time(lambda: read_registrations(path), args.repeat)
+            roster_time, _ = best_time(lambda: transform_data(chunked_df), args.repeat)
+            full_mb = full_df.memory_usage(deep=True).sum() / 1e6
+            chunked_mb = chunked_df.memory_usage(deep=True).sum() / 1e6
+            print(f"{n_rows:>7} {full_time:>12.3f} {full_mb:>13.1f} {chunked_time:>13.3f} {chunked_mb:>14.1f} {roster_time:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
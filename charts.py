@@ -0,0 +1,103 @@
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+
+from evaluation_model import RUBRIC
+
+# ------ GRAPHIQUES DU CLASSEMENT ------
+# Les graphiques matplotlib sont rendus en PNG et mis en cache sur les données tracées : tant que
+# le top affiché ne change pas, l'image est réutilisée sans redessiner. Les figures sont fermées
+# après le rendu pour ne pas s'accumuler dans le processus serveur. Les variantes plotly sont
+# dessinées dans le navigateur.
+# matplotlib et plotly ne sont importés qu'au premier graphique dessiné : importer ce module ne
+# coûte rien au démarrage de l'application.
+
+CHART_CACHE_SIZE = 32
+
+# Titres des axes de scores, sur l'échelle de la grille d'évaluation
+SCORE_AXIS = f"Score (/{RUBRIC.scale:g})"
+FINAL_SCORE_AXIS = f"Score Final (/{RUBRIC.scale:g})"
+
+# Fonction pour convertir une figure en PNG puis la fermer
+def _figure_to_png(fig):
+    import matplotlib.pyplot as plt
+
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format="png")
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+# Graphique des scores finaux par équipe (arguments en tuples pour servir de clé de cache)
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def final_scores_png(team_names, final_scores):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+
+    bars = ax.barh(team_names, final_scores, color='forestgreen')
+
+    # Ajouter les valeurs sur les barres
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + 0.1, bar.get_y() + bar.get_height()/2, f'{width:.2f}', ha='left', va='center')
+
+    ax.set_xlabel(FINAL_SCORE_AXIS)
+    ax.set_title(f'Top {len(team_names)} des équipes par score final')
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+
+    return _figure_to_png(fig)
+
+# Graphique comparatif des scores collectifs vs individuels
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def score_comparison_png(team_names, collective_scores, individual_scores):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+
+    x = np.arange(len(team_names))
+    width = 0.35
+
+    ax.bar(x - width/2, collective_scores, width, label='Score Collectif', color='royalblue')
+    ax.bar(x + width/2, individual_scores, width, label='Score Individuel Moyen', color='darkorange')
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(team_names, rotation=45, ha='right')
+    ax.legend()
+    ax.set_ylabel(SCORE_AXIS)
+    ax.set_title('Comparaison des scores collectifs et individuels')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+
+    return _figure_to_png(fig)
+
+# Variante plotly du graphique des scores finaux (rendu côté navigateur)
+def final_scores_plotly(team_names, final_scores):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(
+        x=list(final_scores), y=list(team_names), orientation="h",
+        marker_color="forestgreen", text=[f"{score:.2f}" for score in final_scores], textposition="outside"
+    ))
+    fig.update_layout(
+        title=f"Top {len(team_names)} des équipes par score final",
+        xaxis_title=FINAL_SCORE_AXIS, yaxis={"autorange": "reversed"}, height=600
+    )
+    return fig
+
+# Variante plotly du graphique comparatif
+def score_comparison_plotly(team_names, collective_scores, individual_scores):
+    import plotly.graph_objects as go
+
+    fig = go.Figure([
+        go.Bar(name="Score Collectif", x=list(team_names), y=list(collective_scores), marker_color="royalblue"),
+        go.Bar(name="Score Individuel Moyen", x=list(team_names), y=list(individual_scores), marker_color="darkorange"),
+    ])
+    fig.update_layout(
+        barmode="group", title="Comparaison des scores collectifs et individuels",
+        yaxis_title=SCORE_AXIS, xaxis_tickangle=-45, height=600
+    )
+    return fig
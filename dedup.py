@@ -0,0 +1,324 @@
+import json
+import math
+import os
+import re
+import unicodedata
+import zlib
+from collections import Counter, defaultdict, namedtuple
+from dataclasses import replace
+from itertools import combinations
+
+import numpy as np
+
+from evaluation_journal import write_atomic
+from roster import member_keys
+
+# ------ DÉTECTION DES DOUBLONS ------
+# Repère les personnes et les équipes inscrites plusieurs fois (réinscription, faute de frappe,
+# casse différente...). Deux étapes :
+#   1. blocage : les inscriptions qui partagent un email ou un téléphone sont rapprochées
+#      directement (blocs de petite taille) ;
+#   2. similarité des noms : un index LSH (signatures MinHash des trigrammes) et un blocage par
+#      paire de mots proposent des paires candidates, notées ensuite par cosinus TF-IDF des trigrammes.
+#      Toutes les paires ne sont jamais comparées.
+# Les fusions décidées par les organisateurs sont enregistrées dans MERGES_FILE et appliquées au
+# roster à chaque chargement.
+
+MERGES_FILE = "identity_merges.json"
+
+# Similarité minimale de deux noms (cosinus des trigrammes ou inclusion des mots)
+NAME_THRESHOLD = 0.75
+# Similarité minimale de deux noms d'équipe
+TEAM_NAME_THRESHOLD = 0.9
+# Deux équipes qui ont au moins ce nombre de personnes en commun sont des doublons
+SHARED_MEMBERS_MIN = 2
+
+# Index LSH : signatures MinHash de MINHASH_BANDS x MINHASH_ROWS valeurs. Deux noms sont candidats
+# s'ils ont une bande identique (probabilité > 50 % dès ~0,55 de similarité de Jaccard).
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4
+MINHASH_SEED = 2025
+MERSENNE_PRIME = (1 << 31) - 1
+# Part minimale de valeurs de signature communes pour garder une paire candidate du LSH
+MIN_JACCARD_ESTIMATE = 0.3
+# Taille maximale d'un bloc (seau LSH ou paire de mots) avant de le tronquer
+MAX_BLOCK_SIZE = 50
+
+# Clés de membre invalides (cellule vide relue comme "nan" dans d'anciennes sauvegardes)
+INVALID_MEMBER_KEYS = {"", "nan", "none", "null"}
+
+# Une personne inscrite : équipe, nom tel qu'inscrit, email, téléphone
+PersonRecord = namedtuple("PersonRecord", ["team", "name", "email", "phone"])
+
+# Clé de membre des évaluations absente du roster de l'équipe : identifiant du membre de l'équipe
+# vers lequel déplacer ses notes (None = clé à supprimer) et raison
+OrphanKey = namedtuple("OrphanKey", ["team", "member", "target", "reason"])
+
+# Groupe de doublons : indices des éléments, meilleure similarité, raisons du rapprochement
+DuplicateGroup = namedtuple("DuplicateGroup", ["items", "score", "reasons"])
+
+
+# Fonction pour normaliser un nom : minuscules, accents supprimés, ponctuation -> espace
+def normalize_name(text):
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text.lower()).split())
+
+def normalize_email(text):
+    return str(text).strip().lower()
+
+# Fonction pour normaliser un téléphone : chiffres seulement, sans l'indicatif 237 du Cameroun
+def normalize_phone(text):
+    digits = re.sub(r"\D", "", str(text))
+    if len(digits) == 12 and digits.startswith("237"):
+        digits = digits[3:]
+    return digits if len(digits) >= 8 else ""
+
+def _trigrams(name):
+    padded = f" {name} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+# Part des mots du nom le plus court présents dans l'autre ("Tchoutzine Tchetnkou" est inclus
+# dans "Tchoutzine Tchetnkou Balbino Cabrel"). Les noms d'un seul mot ne comptent pas.
+def token_containment(name_a, name_b):
+    tokens_a, tokens_b = set(name_a.split()), set(name_b.split())
+    shortest = min(len(tokens_a), len(tokens_b))
+    if shortest < 2:
+        return 0.0
+    return len(tokens_a & tokens_b) / shortest
+
+
+class NameIndex:
+    def __init__(self, names):
+        self.names = [normalize_name(name) for name in names]
+        grams = [_trigrams(name) if name else Counter() for name in self.names]
+        frequencies = Counter(gram for name_grams in grams for gram in name_grams)
+        name_count = len(self.names)
+
+        # Vecteurs TF-IDF normalisés (score de similarité des candidats)
+        self._vectors = []
+        for name_grams in grams:
+            vector = {
+                gram: count * (math.log((1 + name_count) / (1 + frequencies[gram])) + 1)
+                for gram, count in name_grams.items()
+            }
+            norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+            self._vectors.append({gram: weight / norm for gram, weight in vector.items()})
+
+        # Signatures MinHash des ensembles de trigrammes, calculées pour tous les noms à la fois
+        owners = [index for index, name_grams in enumerate(grams) for _ in name_grams]
+        hashes = [zlib.crc32(gram.encode("utf-8")) for name_grams in grams for gram in name_grams]
+        self._hashed = np.unique(np.asarray(owners, dtype=np.intp))
+        self._signatures = np.empty((len(self._hashed), MINHASH_BANDS * MINHASH_ROWS), dtype=np.int64)
+        if hashes:
+            hashes = np.asarray(hashes, dtype=np.int64)
+            starts = np.flatnonzero(np.r_[True, np.diff(owners) != 0])
+            rng = np.random.default_rng(MINHASH_SEED)
+            for column in range(self._signatures.shape[1]):
+                a, b = rng.integers(1, MERSENNE_PRIME, 2)
+                self._signatures[:, column] = np.minimum.reduceat((a * hashes + b) % MERSENNE_PRIME, starts)
+
+    def similarity(self, i, j):
+        if not self.names[i] or not self.names[j]:
+            return 0.0
+        vector_i, vector_j = self._vectors[i], self._vectors[j]
+        if len(vector_j) < len(vector_i):
+            vector_i, vector_j = vector_j, vector_i
+        cosine = sum(weight * vector_j.get(gram, 0.0) for gram, weight in vector_i.items())
+        return max(cosine, token_containment(self.names[i], self.names[j]))
+
+    # Paires candidates : noms tombés dans le même seau pour une bande de signature (LSH) et dont
+    # la similarité de Jaccard estimée est suffisante, ou qui partagent deux mots (noms inclus
+    # l'un dans l'autre)
+    def candidate_pairs(self):
+        buckets = []
+        for band in range(MINHASH_BANDS):
+            rows = self._signatures[:, band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+            _, inverse = np.unique(rows, axis=0, return_inverse=True)
+            order = np.argsort(inverse.ravel(), kind="stable")
+            bounds = np.flatnonzero(np.diff(inverse.ravel()[order])) + 1
+            buckets.extend(bucket for bucket in np.split(order, bounds) if len(bucket) > 1)
+        lsh_pairs = {pair for bucket in buckets for pair in combinations(sorted(bucket[:MAX_BLOCK_SIZE].tolist()), 2)}
+
+        candidates = set()
+        if lsh_pairs:
+            pairs = np.array(sorted(lsh_pairs), dtype=np.intp)
+            estimates = (self._signatures[pairs[:, 0]] == self._signatures[pairs[:, 1]]).mean(axis=1)
+            pairs = self._hashed[pairs[estimates >= MIN_JACCARD_ESTIMATE]]
+            candidates.update(zip(pairs[:, 0].tolist(), pairs[:, 1].tolist()))
+
+        word_pairs = defaultdict(list)
+        for index, name in enumerate(self.names):
+            for key in combinations(sorted(set(name.split())), 2):
+                word_pairs[key].append(index)
+        for indices in word_pairs.values():
+            if 1 < len(indices) <= MAX_BLOCK_SIZE:
+                candidates.update(combinations(indices, 2))
+        return candidates
+
+    # Paires (i, j, similarité) avec i < j et similarité >= threshold, parmi les candidats
+    def similar_pairs(self, threshold=NAME_THRESHOLD):
+        pairs = []
+        for i, j in sorted(self.candidate_pairs()):
+            score = self.similarity(i, j)
+            if score >= threshold:
+                pairs.append((i, j, score))
+        return pairs
+
+
+# Regrouper des paires (i, j, score, raison) en groupes connexes (union-find)
+def group_pairs(pairs):
+    parent = {}
+
+    def find(item):
+        parent.setdefault(item, item)
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    for i, j, _, _ in pairs:
+        parent[find(i)] = find(j)
+
+    groups = defaultdict(lambda: ([], [0.0], set()))
+    for item in parent:
+        groups[find(item)][0].append(item)
+    for i, j, score, reason in pairs:
+        items, best, reasons = groups[find(i)]
+        best[0] = max(best[0], score)
+        reasons.add(reason)
+    return sorted(
+        (DuplicateGroup(sorted(items), round(best[0], 3), sorted(reasons)) for items, best, reasons in groups.values()),
+        key=lambda group: (-group.score, group.items)
+    )
+
+
+# Fonction pour lister les personnes inscrites (une entrée par membre de chaque équipe)
+def person_records(teams):
+    return [
+        PersonRecord(team.name, member.name, member.email, member.phone)
+        for team in teams
+        for member in team.members
+        if member.name
+    ]
+
+# Paires rapprochées par blocage : même valeur normalisée d'un champ
+def _blocked_pairs(records, field, normalize, reason):
+    blocks = defaultdict(list)
+    for index, record in enumerate(records):
+        key = normalize(getattr(record, field))
+        if key:
+            blocks[key].append(index)
+    return [(i, j, 1.0, reason) for block in blocks.values() for i, j in combinations(block, 2)]
+
+# Groupes de personnes probablement identiques
+def find_duplicate_people(records, threshold=NAME_THRESHOLD):
+    pairs = _blocked_pairs(records, "email", normalize_email, "email")
+    pairs += _blocked_pairs(records, "phone", normalize_phone, "téléphone")
+    index = NameIndex([record.name for record in records])
+    pairs += [
+        (i, j, score, "nom identique" if index.names[i] == index.names[j] else "nom proche")
+        for i, j, score in index.similar_pairs(threshold)
+    ]
+    # Deux clés identiques dans la même équipe ne sont pas un doublon
+    pairs = [pair for pair in pairs if records[pair[0]][:2] != records[pair[1]][:2]]
+    return group_pairs(pairs)
+
+# Groupes d'équipes probablement identiques : nom proche, ou personnes en commun. Le score des
+# personnes en commun est la part des membres de la plus petite des deux équipes.
+def find_duplicate_teams(teams, records, people_groups, threshold=TEAM_NAME_THRESHOLD):
+    team_positions = {team.name: position for position, team in enumerate(teams)}
+    team_sizes = Counter(record.team for record in records)
+    index = NameIndex([team.name for team in teams])
+    pairs = [(i, j, score, "nom proche") for i, j, score in index.similar_pairs(threshold)]
+
+    shared = Counter()
+    for group in people_groups:
+        positions = sorted({team_positions[records[item].team] for item in group.items if records[item].team in team_positions})
+        for i, j in combinations(positions, 2):
+            shared[i, j] += 1
+    for (i, j), count in shared.items():
+        if count >= SHARED_MEMBERS_MIN:
+            size = min(team_sizes[teams[i].name], team_sizes[teams[j].name])
+            pairs.append((i, j, count / size, f"{count} personnes en commun"))
+    return group_pairs(pairs)
+
+# Clés de notes (équipe, membre) qui ne correspondent à aucun identifiant de membre inscrit dans
+# l'équipe (variante d'orthographe, membre d'une autre équipe, clé invalide). Les variantes sont
+# rapprochées des membres de l'équipe avec le même index de similarité que les doublons.
+def orphan_member_keys(teams, score_keys, threshold=NAME_THRESHOLD):
+    roster_keys = {team.name: member_keys(team) for team in teams}
+    roster_ids = {(team_name, member_id) for team_name, keys in roster_keys.items() for member_id, _ in keys}
+    teams_by_person = defaultdict(list)
+    for team_name, keys in roster_keys.items():
+        for _, name in keys:
+            teams_by_person[normalize_name(name)].append(team_name)
+
+    orphans = [
+        (team_name, member_name)
+        for team_name, member_name in score_keys
+        if team_name in roster_keys and (team_name, member_name) not in roster_ids
+    ]
+    roster_entries = [(team_name, key) for team_name, keys in roster_keys.items() for key in keys]
+    index = NameIndex([member_name for _, member_name in orphans] + [name for _, (_, name) in roster_entries])
+
+    # Meilleur membre de la même équipe pour chaque clé orpheline
+    best = {}
+    for i, j, score in index.similar_pairs(threshold):
+        if i >= len(orphans) or j < len(orphans):
+            continue
+        team_name, key = roster_entries[j - len(orphans)]
+        if team_name == orphans[i][0] and score > best.get(i, (0.0, None))[0]:
+            best[i] = (score, key)
+
+    results = []
+    for i, (team_name, member_name) in enumerate(orphans):
+        normalized = normalize_name(member_name)
+        if i in best:
+            target_id, target_name = best[i][1]
+            results.append(OrphanKey(team_name, member_name, target_id, f"variante de {target_name}"))
+        elif normalized in INVALID_MEMBER_KEYS:
+            results.append(OrphanKey(team_name, member_name, None, "clé invalide"))
+        elif teams_by_person.get(normalized):
+            results.append(OrphanKey(team_name, member_name, None, f"inscrit dans {', '.join(teams_by_person[normalized])}"))
+        else:
+            results.append(OrphanKey(team_name, member_name, None, "membre inconnu"))
+    return results
+
+# Fonction pour lire les fusions enregistrées : {"teams": {alias: équipe}, "members": {alias: nom}}
+def load_merges(filename=MERGES_FILE):
+    merges = {"teams": {}, "members": {}}
+    if os.path.exists(filename):
+        with open(filename, encoding="utf-8") as f:
+            saved = json.load(f)
+        for kind in merges:
+            merges[kind].update(saved.get(kind, {}))
+    return merges
+
+def save_merges(merges, filename=MERGES_FILE):
+    write_atomic(filename, lambda f: json.dump(merges, f, ensure_ascii=False, indent=2))
+
+# Fonction pour suivre une chaîne de fusions (a -> b, b -> c) jusqu'au nom retenu
+def resolve(mapping, name):
+    seen = set()
+    while name in mapping and name not in seen:
+        seen.add(name)
+        name = mapping[name]
+    return name
+
+# Appliquer les fusions au roster : les équipes fusionnées sont retirées, les membres fusionnés
+# prennent le nom retenu (leurs identifiants, donc leurs notes, ne changent pas)
+def apply_merges(teams, merges):
+    if not merges["teams"] and not merges["members"]:
+        return teams
+    merged = []
+    for team in teams:
+        if team.name in merges["teams"]:
+            continue
+        if any(member.name in merges["members"] for member in team.members):
+            team = replace(team, members=tuple(
+                replace(member, name=resolve(merges["members"], member.name)) if member.name in merges["members"] else member
+                for member in team.members
+            ))
+        merged.append(team)
+    return tuple(merged)
@@ -0,0 +1,298 @@
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from evaluation_journal import EvaluationJournal
+from evaluation_model import set_entry
+from evaluation_storage import COLLECTIVE_CRITERIA, EVALUATIONS_FILE, INDIVIDUAL_CRITERIA, TEAM_LEVEL_MEMBER
+
+# ------ BASE PARTAGÉE DES ÉVALUATIONS ------
+# Base SQLite (mode WAL) partagée par tous les jurys : une ligne par (équipe, membre, critère).
+# Chaque écriture porte la version de la note sur laquelle le jury s'est basé (verrouillage
+# optimiste) : si un autre jury l'a modifiée entre-temps, l'écriture est refusée au lieu
+# d'écraser son travail. Chaque modification reçoit un numéro de séquence croissant, ce qui
+# permet à chaque session de récupérer uniquement les changements qu'elle n'a pas encore vus.
+
+DB_FILE = "hackathon_evaluations.db"
+
+# Seuls les critères notés sont stockés ; les totaux sont recalculés par le moteur de scores
+STORED_CRITERIA = set(COLLECTIVE_CRITERIA) | set(INDIVIDUAL_CRITERIA)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    team TEXT NOT NULL,
+    member TEXT NOT NULL,
+    criterion TEXT NOT NULL,
+    score REAL NOT NULL,
+    version INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    judge TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (team, member, criterion)
+);
+CREATE INDEX IF NOT EXISTS scores_seq ON scores (seq);
+CREATE TABLE IF NOT EXISTS sequence (id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL);
+INSERT OR IGNORE INTO sequence (id, value) VALUES (1, 0);
+"""
+
+# Résultat d'une écriture : en cas de conflit, score/version/judge décrivent la note actuelle
+WriteResult = namedtuple("WriteResult", ["ok", "version", "seq", "score", "judge"])
+
+# Ligne de changement : (équipe, membre, critère, score, version, jury)
+ScoreRow = namedtuple("ScoreRow", ["team", "member", "criterion", "score", "version", "judge"])
+
+# Note d'une sauvegarde non importée : la note de la base a été modifiée après la sauvegarde
+ScoreConflict = namedtuple("ScoreConflict", ["team", "member", "criterion", "score", "current_score", "current_judge"])
+
+
+class EvaluationStore:
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        # Une connexion par thread (chaque session Streamlit s'exécute dans son propre thread)
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def is_empty(self):
+        return self._connection().execute("SELECT 1 FROM scores LIMIT 1").fetchone() is None
+
+    # Dernier numéro de séquence attribué (permet de savoir si d'autres jurys ont écrit)
+    def latest_seq(self):
+        return self._connection().execute("SELECT value FROM sequence WHERE id = 1").fetchone()[0]
+
+    # Toutes les notes et le numéro de séquence correspondant, lus dans une même transaction
+    def load(self):
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            rows = conn.execute("SELECT team, member, criterion, score, version, judge FROM scores").fetchall()
+            seq = conn.execute("SELECT value FROM sequence WHERE id = 1").fetchone()[0]
+        finally:
+            conn.execute("COMMIT")
+        return [ScoreRow(*row) for row in rows], seq
+
+    # Notes modifiées après un numéro de séquence, et nouveau numéro de séquence
+    def changes_since(self, seq):
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            rows = conn.execute(
+                "SELECT team, member, criterion, score, version, judge FROM scores WHERE seq > ? ORDER BY seq",
+                (seq,)
+            ).fetchall()
+            latest = conn.execute("SELECT value FROM sequence WHERE id = 1").fetchone()[0]
+        finally:
+            conn.execute("COMMIT")
+        return [ScoreRow(*row) for row in rows], latest
+
+    def _next_seq(self, conn):
+        conn.execute("UPDATE sequence SET value = value + 1 WHERE id = 1")
+        return conn.execute("SELECT value FROM sequence WHERE id = 1").fetchone()[0]
+
+    def _write(self, conn, team, member, criterion, score, judge):
+        seq = self._next_seq(conn)
+        conn.execute(
+            """INSERT INTO scores (team, member, criterion, score, version, seq, judge, updated_at)
+               VALUES (?, ?, ?, ?, 1, ?, ?, ?)
+               ON CONFLICT (team, member, criterion) DO UPDATE SET
+                   score = excluded.score, version = scores.version + 1, seq = excluded.seq,
+                   judge = excluded.judge, updated_at = excluded.updated_at""",
+            (team, member, criterion, float(score), seq, judge, time.time())
+        )
+        version = conn.execute(
+            "SELECT version FROM scores WHERE team = ? AND member = ? AND criterion = ?",
+            (team, member, criterion)
+        ).fetchone()[0]
+        return version, seq
+
+    # Écrire une note si sa version actuelle est expected_version (0 = note encore jamais écrite).
+    # expected_version=None écrit sans vérification.
+    def upsert(self, team, member, criterion, score, expected_version=None, judge=""):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = conn.execute(
+                "SELECT score, version, judge FROM scores WHERE team = ? AND member = ? AND criterion = ?",
+                (team, member, criterion)
+            ).fetchone()
+            current_version = current[1] if current else 0
+            if expected_version is not None and expected_version != current_version:
+                conn.execute("ROLLBACK")
+                return WriteResult(False, current_version, None, current[0] if current else 0.0,
+                                   current[2] if current else "")
+            version, seq = self._write(conn, team, member, criterion, score, judge)
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return WriteResult(True, version, seq, float(score), judge)
+
+    # Écrire un lot de notes (équipe, membre, critère, score) dans une seule transaction.
+    # expected_versions : {(équipe, membre, critère): version connue} ; une note dont la version
+    # actuelle diffère (0 = note encore jamais écrite) n'est pas écrasée et est retournée comme
+    # conflit. expected_versions=None écrit sans vérification. Retourne (nombre de notes écrites,
+    # conflits).
+    def upsert_many(self, entries, judge="", expected_versions=None):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            count = 0
+            conflicts = []
+            for team, member, criterion, score in entries:
+                if expected_versions is not None:
+                    current = conn.execute(
+                        "SELECT score, version, judge FROM scores WHERE team = ? AND member = ? AND criterion = ?",
+                        (team, member, criterion)
+                    ).fetchone()
+                    if (current[1] if current else 0) != expected_versions.get((team, member, criterion), 0):
+                        conflicts.append(ScoreConflict(team, member, criterion, float(score), current[0], current[2]))
+                        continue
+                self._write(conn, team, member, criterion, score, judge)
+                count += 1
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return count, conflicts
+
+    # Importer un lot de notes sauvegardées (équipe, membre, critère, score, date de sauvegarde),
+    # dans une seule transaction. Une note modifiée dans la base après sa propre sauvegarde n'est
+    # pas écrasée : elle est retournée comme conflit. Une note identique n'est pas réécrite.
+    # Retourne (nombre de notes écrites, conflits).
+    def import_saved(self, entries, judge=""):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            written = 0
+            conflicts = []
+            for team, member, criterion, score, saved_at in entries:
+                current = conn.execute(
+                    "SELECT score, judge, updated_at FROM scores WHERE team = ? AND member = ? AND criterion = ?",
+                    (team, member, criterion)
+                ).fetchone()
+                if current is not None and current[0] == float(score):
+                    continue
+                if current is not None and current[2] > saved_at:
+                    conflicts.append(ScoreConflict(team, member, criterion, float(score), current[0], current[1]))
+                    continue
+                self._write(conn, team, member, criterion, score, judge)
+                written += 1
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return written, conflicts
+
+    # Déplacer les notes d'un membre (ou de toute l'équipe si member est None) vers une autre clé,
+    # puis supprimer la source. Les notes déjà présentes à la destination sont gardées. Les
+    # suppressions ne sont pas diffusées aux autres sessions : à faire avant le début de la notation.
+    def move_scores(self, team, member, target_team, target_member=None, judge=""):
+        conn = self._connection()
+        source = "team = ?" + ("" if member is None else " AND member = ?")
+        params = (team,) if member is None else (team, member)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            moved = 0
+            for row_member, criterion, score in conn.execute(
+                f"SELECT member, criterion, score FROM scores WHERE {source}", params
+            ).fetchall():
+                destination = row_member if member is None else target_member
+                exists = conn.execute(
+                    "SELECT 1 FROM scores WHERE team = ? AND member = ? AND criterion = ?",
+                    (target_team, destination, criterion)
+                ).fetchone()
+                if not exists:
+                    self._write(conn, target_team, destination, criterion, score, judge)
+                    moved += 1
+            conn.execute(f"DELETE FROM scores WHERE {source}", params)
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return moved
+
+    # Clés (équipe, membre) ayant des notes individuelles
+    def member_keys(self):
+        return self._connection().execute(
+            "SELECT DISTINCT team, member FROM scores WHERE member != ?", (TEAM_LEVEL_MEMBER,)
+        ).fetchall()
+
+    # Clés (équipe, membre) ayant des notes individuelles, et si l'une de leurs notes est non nulle
+    def scored_member_keys(self):
+        return [
+            (team, member, bool(scored))
+            for team, member, scored in self._connection().execute(
+                "SELECT team, member, MAX(score != 0) FROM scores WHERE member != ? GROUP BY team, member",
+                (TEAM_LEVEL_MEMBER,)
+            )
+        ]
+
+    # Supprimer les notes d'un membre d'une équipe ; retourne le nombre de notes supprimées
+    def delete_scores(self, team, member):
+        return self._connection().execute("DELETE FROM scores WHERE team = ? AND member = ?", (team, member)).rowcount
+
+    # Importer un dictionnaire d'évaluations complet sans vérification (reprise d'un CSV ou d'un
+    # journal dans une base vide)
+    def import_evaluations(self, evaluations, judge=""):
+        return self.upsert_many(evaluation_entries(evaluations), judge)[0]
+
+
+# Notes (équipe, membre, critère, score) d'un dictionnaire d'évaluations, sans les totaux
+def evaluation_entries(evaluations):
+    entries = []
+    for team_name, team_eval in evaluations.items():
+        for criterion, score in team_eval["collective"].items():
+            if criterion in STORED_CRITERIA:
+                entries.append((team_name, TEAM_LEVEL_MEMBER, criterion, score))
+        for member_name, member_eval in team_eval["individual"].items():
+            for criterion, score in member_eval.items():
+                if criterion in STORED_CRITERIA:
+                    entries.append((team_name, member_name, criterion, score))
+    return entries
+
+# Ouvrir la base partagée. À la première utilisation, les évaluations déjà sauvegardées
+# (CSV + journal) y sont reprises ; members (roster.MemberDirectory) sert à migrer un CSV à
+# l'ancien format large.
+def open_store(path=DB_FILE, snapshot_file=EVALUATIONS_FILE, members=None):
+    store = EvaluationStore(path)
+    if store.is_empty():
+        saved_evaluations = EvaluationJournal(snapshot_file, members=members).restore()
+        if saved_evaluations:
+            store.import_evaluations(saved_evaluations)
+    return store
+
+# Convertir les clés de membres par nom (anciennes sauvegardes, journal) en identifiants stables
+# (roster.member_ids). Les clés qui ne correspondent à aucun membre inscrit sont laissées telles
+# quelles. Retourne le nombre de clés converties.
+def migrate_member_keys(store, directory):
+    renamed = 0
+    for team, member in store.member_keys():
+        member_id = directory.resolve(team, member)
+        if member_id is not None and member_id != member:
+            store.move_scores(team, member, team, member_id)
+            renamed += 1
+    return renamed
+
+# Fonction pour reconstruire le dictionnaire d'évaluations à partir des lignes de la base. Avec une
+# table des membres (roster.MemberDirectory), seules les notes des membres inscrits sont chargées :
+# les clés inconnues restent dans la base (onglet Doublons) sans fausser les moyennes.
+def evaluations_from_rows(rows, members=None):
+    evaluations = {}
+    for row in rows:
+        if members is not None and row.member != TEAM_LEVEL_MEMBER and (row.team, row.member) not in members:
+            continue
+        set_entry(evaluations, row.team, row.member, row.criterion, row.score)
+    return evaluations
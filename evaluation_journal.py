@@ -0,0 +1,234 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from evaluation_model import set_entry
+from evaluation_storage import (
+    COLLECTIVE_CRITERIA,
+    EVALUATIONS_FILE,
+    INDIVIDUAL_CRITERIA,
+    evaluations_to_long_dataframe,
+    read_evaluations_from_csv,
+)
+from scoring import calculate_final_score
+
+# ------ JOURNAL DES ÉVALUATIONS ------
+# Chaque sauvegarde ajoute uniquement les notes modifiées à un journal (une ligne JSON par note),
+# puis force l'écriture sur disque (fsync). Au-delà de COMPACT_EVERY lignes, le journal est
+# compacté : l'état complet (instantané + journal) est réécrit dans le CSV via un fichier
+# temporaire renommé atomiquement, puis le journal est vidé. Au démarrage, l'état est restauré
+# depuis l'instantané puis le journal est rejoué.
+# Chaque note garde la date de sa sauvegarde (champ saved_at du journal, colonne saved_at de
+# l'instantané ; vide pour les totaux et les critères jamais notés). Au rechargement dans la base
+# partagée, chaque note est comparée à la date de modification de sa propre ligne.
+
+COMPACT_EVERY = 500
+
+# Critères notés (les totaux sont recalculés)
+STORED_CRITERIA = set(COLLECTIVE_CRITERIA) | set(INDIVIDUAL_CRITERIA)
+
+# Les sessions Streamlit sont des threads d'un même processus : un verrou suffit à sérialiser
+# les écritures dans le journal et les compactions
+_journal_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+# Fonction pour écrire un fichier de façon atomique (fichier temporaire + fsync + renommage)
+def write_atomic(filename, write):
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp_", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    # Rendre le renommage durable (non supporté sous Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+# Fonction pour écrire l'instantané complet des évaluations (format long) de façon atomique.
+# saved : {(équipe, membre, critère): (note, date de sauvegarde)} des notes sauvegardées, dont la
+# date est écrite dans la colonne saved_at.
+def write_snapshot(evaluations, filename=EVALUATIONS_FILE, saved=None):
+    df = evaluations_to_long_dataframe(evaluations)
+    if saved is not None:
+        keys = zip(df["team_name"].tolist(), df["member_name"].tolist(), df["criterion"].tolist())
+        df["saved_at"] = [saved[key][1] if key in saved else None for key in keys]
+    write_atomic(filename, lambda f: df.to_csv(f, index=False))
+    return filename
+
+# Fonction pour lire les notes sauvegardées d'un instantané avec leur date de sauvegarde. Un
+# instantané sans colonne saved_at (ancien format) ne date pas ses notes : seules les notes non
+# nulles sont gardées, avec la date 0 (antérieure à toute modification de la base).
+def read_snapshot_scores(filename=EVALUATIONS_FILE, members=None):
+    try:
+        header = pd.read_csv(filename, nrows=0)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return {}
+    if "saved_at" in header.columns:
+        df = pd.read_csv(
+            filename,
+            dtype={"team_name": str, "member_name": str, "criterion": str, "score": float, "saved_at": float},
+            keep_default_na=False,
+            na_values={"score": [""], "saved_at": [""]},
+        )
+        df = df[df["saved_at"].notna()]
+    else:
+        evaluations = read_evaluations_from_csv(filename, members)
+        if not evaluations:
+            return {}
+        df = evaluations_to_long_dataframe(evaluations)
+        df = df[df["criterion"].isin(STORED_CRITERIA) & (df["score"] != 0)].assign(saved_at=0.0)
+    return {
+        (team, member, criterion): (float(score), float(saved_at))
+        for team, member, criterion, score, saved_at in df[
+            ["team_name", "member_name", "criterion", "score", "saved_at"]
+        ].itertuples(index=False, name=None)
+    }
+
+
+# Nombre de lignes complètes d'un fichier ouvert en binaire
+def _count_lines(f):
+    f.seek(0)
+    return sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b""))
+
+# Fonction pour retirer une dernière ligne sans fin de ligne (écriture interrompue) d'un fichier
+# ouvert en "ab+" ; la ligne retirée n'a pas été comptée par _count_lines
+def _drop_truncated_line(f, filename):
+    end = f.seek(0, os.SEEK_END)
+    if end == 0:
+        return
+    f.seek(end - 1)
+    if f.read(1) == b"\n":
+        return
+    # Début de la ligne tronquée : juste après le dernier saut de ligne
+    position = end
+    while position > 0:
+        start = max(0, position - (1 << 16))
+        f.seek(start)
+        newline = f.read(position - start).rfind(b"\n")
+        if newline >= 0:
+            position = start + newline + 1
+            break
+        position = start
+    logger.warning("%s : dernière ligne tronquée retirée (%d octets)", filename, end - position)
+    f.truncate(position)
+
+
+class EvaluationJournal:
+    def __init__(self, snapshot_file=EVALUATIONS_FILE, journal_file=None, compact_every=COMPACT_EVERY, members=None):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file or f"{os.path.splitext(snapshot_file)[0]}.journal"
+        self.compact_every = compact_every
+        # Table des membres inscrits, pour migrer un instantané à l'ancien format large
+        self.members = members
+        # Nombre de lignes du journal, compté une seule fois au premier ajout puis tenu à jour
+        self._lines = None
+
+    # Lire les notes du journal (équipe, membre, critère, note, date de sauvegarde ; date 0 pour
+    # les lignes écrites avant que la date soit journalisée). Seule une dernière ligne tronquée
+    # (arrêt brutal pendant une écriture) est ignorée : une ligne illisible ailleurs est une
+    # corruption (ValueError).
+    def _read_entries(self):
+        entries = []
+        try:
+            with open(self.journal_file, "rb") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return entries
+        for number, line in enumerate(lines, start=1):
+            try:
+                entry = json.loads(line)
+                entries.append((
+                    entry["team"], entry["member"], entry["criterion"], float(entry["score"]),
+                    float(entry.get("saved_at", 0.0)),
+                ))
+            except (ValueError, KeyError, TypeError):
+                if number == len(lines) and not line.endswith(b"\n"):
+                    logger.warning("%s : dernière ligne tronquée ignorée", self.journal_file)
+                    continue
+                raise ValueError(f"{self.journal_file} : ligne {number} illisible") from None
+        return entries
+
+    def _restore(self):
+        evaluations = read_evaluations_from_csv(self.snapshot_file, self.members)
+        entries = self._read_entries()
+        if evaluations is None and not entries:
+            return None
+        evaluations = evaluations or {}
+        for team, member, criterion, score, _ in entries:
+            set_entry(evaluations, team, member, criterion, score)
+        return evaluations
+
+    def _saved_scores(self):
+        saved = read_snapshot_scores(self.snapshot_file, self.members)
+        for team, member, criterion, score, saved_at in self._read_entries():
+            saved[team, member, criterion] = (score, saved_at)
+        return saved
+
+    # Restaurer les évaluations : instantané + rejeu du journal (None si rien n'a été sauvegardé).
+    # Les totaux ne sont pas journalisés : ils sont recalculés par le moteur de scores.
+    def restore(self):
+        with _journal_lock:
+            return self._restore()
+
+    # Notes sauvegardées (instantané + journal) : {(équipe, membre, critère): (note, date de
+    # sauvegarde)}. Les totaux et les critères jamais notés n'y figurent pas.
+    def saved_scores(self):
+        with _journal_lock:
+            return self._saved_scores()
+
+    # Ajouter un lot de notes (équipe, membre, critère, score) au journal, avec fsync.
+    # Retourne le nombre de notes écrites.
+    def append(self, entries):
+        saved_at = time.time()
+        lines = "".join(
+            json.dumps({"team": team, "member": member, "criterion": criterion, "score": float(score),
+                        "saved_at": saved_at}, ensure_ascii=False) + "\n"
+            for team, member, criterion, score in entries
+        )
+        if not lines:
+            return 0
+        with _journal_lock:
+            with open(self.journal_file, "ab+") as f:
+                if self._lines is None:
+                    self._lines = _count_lines(f)
+                # Après un arrêt brutal, la dernière ligne peut être tronquée : elle est retirée
+                # pour que le journal ne contienne que des lignes complètes
+                _drop_truncated_line(f, self.journal_file)
+                f.write(lines.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            self._lines += len(entries)
+            if self._lines >= self.compact_every:
+                self._compact()
+        return len(entries)
+
+    def _compact(self):
+        evaluations = self._restore()
+        if evaluations is not None:
+            for team_name in evaluations:
+                calculate_final_score(evaluations, team_name)
+            write_snapshot(evaluations, self.snapshot_file, self._saved_scores())
+        write_atomic(self.journal_file, lambda f: None)
+        self._lines = 0
+
+    # Réécrire l'instantané à partir de l'état disque (instantané + journal) puis vider le journal
+    def compact(self):
+        with _journal_lock:
+            self._compact()
@@ -0,0 +1,244 @@
+import logging
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+import pandas as pd
+
+from rubric import load_rubric
+
+# ------ MODÈLE DES ÉVALUATIONS ------
+# Les notes sont rangées dans des tableaux float32 de taille fixe : un vecteur des critères
+# collectifs par équipe et un vecteur des critères individuels par membre. Chaque note est
+# validée (nombre, pas NaN, entre 0 et la note maximale du critère) au moment où elle est
+# écrite : les évaluations ne contiennent jamais de valeur à nettoyer après coup.
+# Les conteneurs gardent l'accès par clé des anciens dictionnaires (team_eval["collective"]
+# ["uiDesign"], team_eval["individual"][membre]["totalScore"], dict(...), .items()) ; les totaux
+# (totalScore, finalScore), recalculés par le moteur de scores, sont des flottants à part.
+# Les notes relues d'une sauvegarde ou de la base ont été validées à leur écriture, mais la note
+# maximale d'un critère peut avoir baissé depuis (rubric.json) : elles sont ramenées dans
+# l'intervalle et signalées au lieu d'empêcher le chargement.
+
+# Grille d'évaluation (rubric.json) : critères, notes maximales et pondérations
+RUBRIC = load_rubric()
+
+COLLECTIVE_CRITERIA = RUBRIC.collective_keys
+INDIVIDUAL_CRITERIA = RUBRIC.individual_keys
+
+# Membre utilisé pour les lignes de niveau équipe (critères collectifs, totaux, score final)
+TEAM_LEVEL_MEMBER = ""
+
+# Totaux recalculés par le moteur de scores (ce ne sont pas des notes saisies)
+TOTAL_KEYS = ["totalScore", "finalScore"]
+
+MIN_SCORE = 0.0
+# Échelle des scores (totaux et score final) ; chaque critère a sa propre note maximale
+MAX_SCORE = RUBRIC.scale
+CRITERION_MAX = RUBRIC.max_scores
+SCORE_DTYPE = np.float32
+
+COLLECTIVE_INDEX = {criterion: i for i, criterion in enumerate(COLLECTIVE_CRITERIA)}
+INDIVIDUAL_INDEX = {criterion: i for i, criterion in enumerate(INDIVIDUAL_CRITERIA)}
+
+logger = logging.getLogger(__name__)
+
+
+# Fonction pour valider une note avant de l'écrire (ValueError si elle n'est pas entre 0 et la note
+# maximale du critère). Retourne la note arrondie en float32.
+def validate_score(criterion, value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Note non numérique pour {criterion} : {value!r}") from None
+    max_score = CRITERION_MAX.get(criterion, MAX_SCORE)
+    # Une note NaN échoue aussi à la comparaison
+    if not MIN_SCORE <= value <= max_score:
+        raise ValueError(f"Note hors de l'intervalle {MIN_SCORE:g}-{max_score:g} pour {criterion} : {value}")
+    # Valeur telle qu'elle sera relue du tableau float32
+    return float(SCORE_DTYPE(value))
+
+# Fonction pour ramener dans l'intervalle une note relue d'une sauvegarde ou de la base (note
+# maximale baissée depuis son écriture). Une note hors de l'intervalle est signalée dans les logs ;
+# une valeur non numérique vaut 0. Retourne la note arrondie en float32.
+def clamp_score(criterion, value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        value = np.nan
+    max_score = CRITERION_MAX.get(criterion, MAX_SCORE)
+    if not MIN_SCORE <= value <= max_score:
+        clamped = 0.0 if np.isnan(value) else min(max(value, MIN_SCORE), max_score)
+        logger.warning("Note hors de l'intervalle %g-%g pour %s : %s, ramenée à %g", MIN_SCORE, max_score, criterion, value, clamped)
+        value = clamped
+    return float(SCORE_DTYPE(value))
+
+# Fonction pour ramener d'un coup dans l'intervalle une colonne de notes lues d'une sauvegarde (les
+# totaux ne sont pas des notes et ne sont pas modifiés). Retourne un tableau des valeurs arrondies
+# en float32.
+def clamp_scores(criteria, scores):
+    scores = np.asarray(scores, dtype=np.float64)
+    criterion_codes, criterion_names = pd.factorize(np.asarray(criteria, dtype=object))
+    max_scores = np.array([CRITERION_MAX.get(name, MAX_SCORE) for name in criterion_names])[criterion_codes]
+    is_total = np.isin(criterion_names, TOTAL_KEYS)[criterion_codes]
+    invalid = ~((scores >= MIN_SCORE) & (scores <= max_scores)) & ~is_total
+    if invalid.any():
+        scores = scores.copy()
+        for position in np.flatnonzero(invalid).tolist():
+            scores[position] = clamp_score(criteria[position], scores[position])
+    return np.where(is_total, scores, scores.astype(SCORE_DTYPE))
+
+
+# Notes d'une équipe (critères collectifs) ou d'un membre (critères individuels) : un vecteur
+# float32 indexé par critère, plus le total "totalScore"
+class ScoreVector(MutableMapping):
+    __slots__ = ("_index", "values", "total")
+
+    def __init__(self, index, scores=None):
+        self._index = index
+        self.values = np.zeros(len(index), dtype=SCORE_DTYPE)
+        self.total = 0.0
+        for criterion, score in (scores or {}).items():
+            self[criterion] = score
+
+    # Vecteur construit sur des notes déjà validées (ligne d'une matrice float32, sans copie)
+    @classmethod
+    def from_values(cls, index, values, total=0.0):
+        vector = cls.__new__(cls)
+        vector._index = index
+        vector.values = values
+        vector.total = float(total)
+        return vector
+
+    def __getitem__(self, criterion):
+        if criterion == "totalScore":
+            return self.total
+        return float(self.values[self._index[criterion]])
+
+    def __setitem__(self, criterion, score):
+        if not self.set(criterion, score):
+            raise KeyError(criterion)
+
+    # Écrire une note ; retourne False si le critère est inconnu
+    def set(self, criterion, score):
+        if criterion == "totalScore":
+            self.total = float(score)
+            return True
+        index = self._index.get(criterion)
+        if index is None:
+            return False
+        self.values[index] = validate_score(criterion, score)
+        return True
+
+    def __delitem__(self, criterion):
+        raise TypeError("Les critères d'une évaluation sont fixes")
+
+    def copy(self):
+        return ScoreVector.from_values(self._index, self.values.copy(), self.total)
+
+    def __iter__(self):
+        yield from self._index
+        yield "totalScore"
+
+    def __len__(self):
+        return len(self._index) + 1
+
+    def __contains__(self, criterion):
+        return criterion == "totalScore" or criterion in self._index
+
+    def __repr__(self):
+        return f"ScoreVector({dict(self)})"
+
+
+def collective_scores(scores=None):
+    return ScoreVector(COLLECTIVE_INDEX, scores)
+
+def member_scores(scores=None):
+    return ScoreVector(INDIVIDUAL_INDEX, scores)
+
+
+# Notes individuelles d'une équipe : identifiant du membre -> ScoreVector. Un dictionnaire de
+# notes affecté à un membre est converti (et validé) à l'écriture.
+class MemberScores(MutableMapping):
+    __slots__ = ("_members",)
+
+    def __init__(self):
+        self._members = {}
+
+    def __getitem__(self, member_id):
+        return self._members[member_id]
+
+    def __setitem__(self, member_id, scores):
+        if not isinstance(scores, ScoreVector):
+            scores = member_scores(scores)
+        self._members[member_id] = scores
+
+    def __delitem__(self, member_id):
+        del self._members[member_id]
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __len__(self):
+        return len(self._members)
+
+    def __repr__(self):
+        return f"MemberScores({self._members})"
+
+
+# Évaluation d'une équipe : team_eval["collective"], team_eval["individual"], team_eval["finalScore"]
+class TeamEvaluation(Mapping):
+    __slots__ = ("collective", "individual", "finalScore")
+    KEYS = ("collective", "individual", "finalScore")
+
+    def __init__(self):
+        self.collective = collective_scores()
+        self.individual = MemberScores()
+        self.finalScore = 0.0
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key != "finalScore":
+            raise KeyError(key)
+        self.finalScore = float(value)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    # Copie indépendante des notes (instantané pour un export)
+    def copy(self):
+        team_eval = TeamEvaluation()
+        team_eval.collective = self.collective.copy()
+        for member_id, scores in self.individual.items():
+            team_eval.individual[member_id] = scores.copy()
+        team_eval.finalScore = self.finalScore
+        return team_eval
+
+    def __repr__(self):
+        return f"TeamEvaluation(collective={self.collective!r}, individual={self.individual!r}, finalScore={self.finalScore})"
+
+
+# Fonction pour écrire une note (ou un total) lue d'une sauvegarde dans les évaluations. Les
+# critères inconnus (anciennes versions de la grille) sont ignorés ; retourne False dans ce cas.
+# Une note hors de l'intervalle de la grille actuelle est ramenée dans l'intervalle (clamp_score).
+def set_entry(evaluations, team_name, member_name, criterion, score):
+    if criterion not in TOTAL_KEYS and (criterion in COLLECTIVE_INDEX or criterion in INDIVIDUAL_INDEX):
+        score = clamp_score(criterion, score)
+    team_eval = evaluations.get(team_name)
+    if team_eval is None:
+        team_eval = evaluations[team_name] = TeamEvaluation()
+    if member_name == TEAM_LEVEL_MEMBER:
+        if criterion == "finalScore":
+            team_eval.finalScore = float(score)
+            return True
+        return team_eval.collective.set(criterion, score)
+    members = team_eval.individual._members
+    scores = members.get(member_name)
+    if scores is None:
+        scores = members[member_name] = member_scores()
+    return scores.set(criterion, score)
@@ -0,0 +1,265 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from evaluation_model import (
+    COLLECTIVE_CRITERIA,
+    COLLECTIVE_INDEX,
+    INDIVIDUAL_CRITERIA,
+    INDIVIDUAL_INDEX,
+    SCORE_DTYPE,
+    TEAM_LEVEL_MEMBER,
+    ScoreVector,
+    TeamEvaluation,
+    clamp_scores,
+    collective_scores,
+    member_scores,
+)
+
+# ------ STOCKAGE DES ÉVALUATIONS ------
+# Format long : une ligne par (équipe, membre, critère). Les critères collectifs et le score
+# final sont rangés avec un membre vide, ce qui garde un fichier linéaire en nombre de notes
+# au lieu d'une colonne par membre de chaque équipe.
+
+EVALUATIONS_FILE = "hackathon_evaluations.csv"
+
+LONG_FORMAT_COLUMNS = ["team_name", "member_name", "criterion", "score"]
+
+
+# Fonction pour convertir les évaluations en DataFrame long (une ligne par note)
+def evaluations_to_long_dataframe(evaluations):
+    team_names = []
+    member_names = []
+    criteria = []
+    scores = []
+
+    team_criteria = COLLECTIVE_CRITERIA + ["totalScore", "finalScore"]
+    member_criteria = INDIVIDUAL_CRITERIA + ["totalScore"]
+
+    # Les notes sont lues directement dans les vecteurs float32 de chaque évaluation
+    def add(team_name, member_name, criteria_list, values):
+        team_names.extend([team_name] * len(criteria_list))
+        member_names.extend([member_name] * len(criteria_list))
+        criteria.extend(criteria_list)
+        scores.extend(values)
+
+    for team_name, team_data in evaluations.items():
+        collective = team_data.collective
+        add(team_name, TEAM_LEVEL_MEMBER, team_criteria,
+            collective.values.tolist() + [collective.total, team_data.finalScore])
+
+        for member_name, member_data in team_data.individual.items():
+            add(team_name, str(member_name), member_criteria, member_data.values.tolist() + [member_data.total])
+
+    return pd.DataFrame({
+        "team_name": team_names,
+        "member_name": member_names,
+        "criterion": criteria,
+        "score": scores,
+    }, columns=LONG_FORMAT_COLUMNS)
+
+
+# Fonction pour reconstruire la structure des évaluations à partir du DataFrame long (notes
+# vides -> 0, notes hors de l'intervalle de la grille ramenées dans l'intervalle, critères
+# inconnus ignorés)
+def long_dataframe_to_evaluations(df):
+    criteria = df["criterion"].to_numpy(dtype=object)
+    scores = clamp_scores(criteria, pd.to_numeric(df["score"], errors="coerce").fillna(0.0))
+
+    # Numérotation des équipes, des membres et des critères (ordre d'apparition conservé)
+    team_codes, team_names = pd.factorize(df["team_name"].to_numpy(dtype=object))
+    member_codes, member_names = pd.factorize(df["member_name"].to_numpy(dtype=object))
+    criterion_codes, criterion_names = pd.factorize(criteria)
+    team_level = member_names == TEAM_LEVEL_MEMBER
+    is_team_row = team_level[member_codes]
+
+    # Les notes sont rangées dans une matrice float32 (une ligne par équipe ou par membre) ; chaque
+    # ligne devient ensuite le vecteur de notes de l'équipe ou du membre, sans copie
+    def fill(rows, row_codes, n_rows, index):
+        columns = np.array([index.get(name, -1) for name in criterion_names], dtype=np.intp)[criterion_codes[rows]]
+        known = columns >= 0
+        matrix = np.zeros((n_rows, len(index)), dtype=SCORE_DTYPE)
+        matrix[row_codes[known], columns[known]] = scores[rows][known]
+        return matrix
+
+    def by_row(rows, row_codes, n_rows, criterion):
+        values = np.zeros(n_rows)
+        selected = criteria[rows] == criterion
+        values[row_codes[selected]] = scores[rows][selected]
+        return values.tolist()
+
+    n_teams = len(team_names)
+    team_row_codes = team_codes[is_team_row]
+    collective = fill(is_team_row, team_row_codes, n_teams, COLLECTIVE_INDEX)
+    collective_totals = by_row(is_team_row, team_row_codes, n_teams, "totalScore")
+    final_scores = by_row(is_team_row, team_row_codes, n_teams, "finalScore")
+
+    # Un membre est identifié par (équipe, nom) : les deux numéros sont combinés puis renumérotés
+    is_member_row = ~is_team_row
+    pair_codes, pairs = pd.factorize(team_codes[is_member_row] * len(member_names) + member_codes[is_member_row])
+    individual = fill(is_member_row, pair_codes, len(pairs), INDIVIDUAL_INDEX)
+    individual_totals = by_row(is_member_row, pair_codes, len(pairs), "totalScore")
+
+    team_names = team_names.tolist()
+    member_names = member_names.tolist()
+    evaluations = {}
+    for row, team_name in enumerate(team_names):
+        team_eval = evaluations[team_name] = TeamEvaluation()
+        team_eval.collective = ScoreVector.from_values(COLLECTIVE_INDEX, collective[row], collective_totals[row])
+        team_eval.finalScore = final_scores[row]
+    for row, pair in enumerate(pairs.tolist()):
+        team_code, member_code = divmod(pair, len(member_names))
+        evaluations[team_names[team_code]].individual[member_names[member_code]] = ScoreVector.from_values(
+            INDIVIDUAL_INDEX, individual[row], individual_totals[row]
+        )
+
+    return evaluations
+
+
+# ------ ANCIEN FORMAT LARGE (une ligne par équipe, trois colonnes par membre) ------
+# Conservé uniquement pour migrer les fichiers existants.
+
+# Fonction pour convertir les évaluations en DataFrame plat pour export CSV
+def evaluations_to_dataframe(evaluations):
+    data = []
+
+    for team_name, team_data in evaluations.items():
+        row = {"team_name": team_name}
+        # Données collectives
+        for criterion in COLLECTIVE_CRITERIA + ["totalScore"]:
+            row[f"collective_{criterion}"] = team_data["collective"][criterion]
+        row["finalScore"] = team_data["finalScore"]
+
+        # Ajouter les données individuelles pour chaque membre
+        for member_name, member_data in team_data["individual"].items():
+            # S'assurer que member_name est bien une chaîne de caractères
+            member_name_str = str(member_name)
+            member_safe_name = member_name_str.replace(" ", "_").replace(".", "").replace(",", "")
+            for criterion in INDIVIDUAL_CRITERIA + ["totalScore"]:
+                row[f"individual_{member_safe_name}_{criterion}"] = member_data.get(criterion, 0.0)
+
+        data.append(row)
+
+    return pd.DataFrame(data)
+
+# Colonnes individuelles de l'ancien format : individual_<membre>_<critère>
+INDIVIDUAL_COLUMN_PATTERN = re.compile(
+    r"^individual_(.+)_(" + "|".join(map(re.escape, INDIVIDUAL_CRITERIA + ["totalScore"])) + r")$"
+)
+
+# Fonction pour convertir un bloc de colonnes en matrice de flottants (valeurs invalides -> NaN)
+def _numeric_matrix(frame):
+    try:
+        return frame.to_numpy(dtype=float, na_value=np.nan)
+    except (ValueError, TypeError):
+        return frame.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+# Fonction pour analyser une seule fois les colonnes individuelles : préfixe membre -> indices des critères
+def parse_individual_columns(columns):
+    criteria = INDIVIDUAL_CRITERIA + ["totalScore"]
+    individual_columns = []
+    member_slots = {}
+    for col in columns:
+        match = INDIVIDUAL_COLUMN_PATTERN.match(col)
+        if match is None:
+            continue
+        member_prefix, criterion = match.groups()
+        slots = member_slots.setdefault(member_prefix, [-1] * len(criteria))
+        slots[criteria.index(criterion)] = len(individual_columns)
+        individual_columns.append(col)
+    return individual_columns, member_slots
+
+# Fonction pour reconstruire la structure des évaluations à partir du DataFrame.
+# Les colonnes sont analysées une seule fois, puis les notes sont remodelées en bloc avec NumPy
+# (équipes x membres x critères). Un membre dont toutes les cellules sont vides pour une équipe
+# n'appartient pas à cette équipe et n'est pas recréé. L'ancien format remplissait aussi de 0 les
+# colonnes des membres des autres équipes : avec la table des membres inscrits (members,
+# roster.MemberDirectory), un membre dont toutes les notes sont nulles et qui n'est pas inscrit
+# dans l'équipe est ignoré.
+def dataframe_to_evaluations(df, members=None):
+    evaluations = {}
+    if df.empty:
+        return evaluations
+
+    team_names = df["team_name"].tolist()
+    collective_keys = COLLECTIVE_CRITERIA + ["totalScore"]
+    # Critères absents du fichier (grille modifiée depuis) : cellules vides
+    collective = _numeric_matrix(df.reindex(columns=[f"collective_{key}" for key in collective_keys]))
+    final_scores = _numeric_matrix(df[["finalScore"]])[:, 0]
+
+    # Les cellules vides ou invalides de l'ancien format valent 0
+    collective = np.nan_to_num(collective, nan=0.0)
+    final_scores = np.nan_to_num(final_scores, nan=0.0)
+    for team_name, collective_row, final_score in zip(team_names, collective.tolist(), final_scores.tolist()):
+        team_eval = evaluations[team_name] = TeamEvaluation()
+        team_eval.collective = collective_scores(dict(zip(collective_keys, collective_row)))
+        team_eval.finalScore = final_score
+
+    individual_columns, member_slots = parse_individual_columns(df.columns)
+    if not member_slots:
+        return evaluations
+
+    # Matrice (équipes, colonnes) complétée d'une colonne vide pour les critères absents
+    values = _numeric_matrix(df[individual_columns])
+    values = np.concatenate([values, np.full((len(df), 1), np.nan)], axis=1)
+    member_prefixes = list(member_slots)
+    scores = values[:, np.array([member_slots[prefix] for prefix in member_prefixes])]
+
+    present = ~np.isnan(scores).all(axis=2)
+    scores = np.nan_to_num(scores, nan=0.0)
+    # Le préfixe ne permet pas de retrouver le nom exact ("_", points et virgules perdus) : ces
+    # clés sont rattachées aux identifiants des membres par roster.MemberDirectory.resolve
+    member_names = [prefix.replace("_", " ") for prefix in member_prefixes]
+    criteria = INDIVIDUAL_CRITERIA + ["totalScore"]
+
+    team_idx, member_idx = np.nonzero(present)
+    for t, m, scores_row in zip(team_idx.tolist(), member_idx.tolist(), scores[team_idx, member_idx].tolist()):
+        if members is not None and not any(scores_row) and members.resolve(team_names[t], member_names[m]) is None:
+            continue
+        evaluations[team_names[t]].individual[member_names[m]] = member_scores(dict(zip(criteria, scores_row)))
+
+    return evaluations
+
+
+# ------ LECTURE / ÉCRITURE ------
+
+# Fonction pour détecter si un fichier est encore à l'ancien format large
+def is_wide_format(columns):
+    return "criterion" not in columns and any(str(column).startswith("collective_") for column in columns)
+
+# Fonction pour sauvegarder les évaluations dans un CSV (format long)
+def save_evaluations_to_csv(evaluations, filename=EVALUATIONS_FILE):
+    df = evaluations_to_long_dataframe(evaluations)
+    df.to_csv(filename, index=False)
+    return filename
+
+# Fonction pour migrer un fichier au format large vers le format long.
+# L'ancien fichier est conservé à côté avec le suffixe ".wide.bak".
+def migrate_wide_csv(filename=EVALUATIONS_FILE, members=None):
+    df = pd.read_csv(filename)
+    evaluations = dataframe_to_evaluations(df, members)
+    os.replace(filename, f"{filename}.wide.bak")
+    save_evaluations_to_csv(evaluations, filename)
+    return evaluations
+
+# Fonction pour lire les évaluations depuis un CSV, en migrant automatiquement l'ancien format.
+# Retourne None si le fichier n'existe pas ou est vide. members : table des membres inscrits,
+# utilisée seulement pour la migration de l'ancien format (voir dataframe_to_evaluations).
+def read_evaluations_from_csv(filename=EVALUATIONS_FILE, members=None):
+    try:
+        header = pd.read_csv(filename, nrows=0)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return None
+
+    if is_wide_format(header.columns):
+        return migrate_wide_csv(filename, members)
+
+    df = pd.read_csv(
+        filename,
+        dtype={"team_name": str, "member_name": str, "criterion": str, "score": float},
+        keep_default_na=False,
+        na_values={"score": [""]},
+    )
+    return long_dataframe_to_evaluations(df)
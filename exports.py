@@ -0,0 +1,172 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import namedtuple
+from itertools import islice
+
+import pandas as pd
+
+from evaluation_storage import LONG_FORMAT_COLUMNS, evaluations_to_long_dataframe
+from leaderboard import detailed_ranking_columns, detailed_ranking_rows
+from roster import roster_slots
+
+# ------ EXPORTS DU CLASSEMENT ET DES ÉVALUATIONS ------
+# Les fichiers d'export (classement détaillé, toutes les notes) ne sont générés que sur demande, par
+# morceaux de CHUNK_ROWS lignes écrits directement dans un fichier temporaire : aucun export complet
+# n'est gardé en mémoire sous forme de DataFrame. Le fichier produit est mis en cache sur la version
+# des évaluations et relu par blocs pour le téléchargement.
+# openpyxl (XLSX) et pyarrow (Parquet) ne sont importés qu'au premier export dans ce format.
+
+CHUNK_ROWS = 5000
+# Taille des blocs lus pour le téléchargement
+READ_CHUNK_BYTES = 1 << 20
+
+ExportKind = namedtuple("ExportKind", ["label", "file_stem"])
+ExportFormat = namedtuple("ExportFormat", ["label", "extension", "mime", "module"])
+
+EXPORT_KINDS = {
+    "classement": ExportKind("Classement détaillé", "classement_hackathon"),
+    "evaluations": ExportKind("Toutes les évaluations (une ligne par note)", "evaluations_hackathon"),
+}
+
+EXPORT_FORMATS = {
+    "csv": ExportFormat("CSV", "csv", "text/csv", None),
+    "xlsx": ExportFormat("Excel (XLSX)", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "openpyxl"),
+    "parquet": ExportFormat("Parquet", "parquet", "application/vnd.apache.parquet", "pyarrow"),
+}
+
+
+# Formats utilisables dans cet environnement (bibliothèque installée)
+def available_formats():
+    return [
+        name for name, export_format in EXPORT_FORMATS.items()
+        if export_format.module is None or importlib.util.find_spec(export_format.module) is not None
+    ]
+
+def file_name(kind, export_format):
+    return f"{EXPORT_KINDS[kind].file_stem}.{EXPORT_FORMATS[export_format].extension}"
+
+
+# Fonction pour découper des lignes en DataFrames de CHUNK_ROWS lignes (au moins un, éventuellement vide)
+def _row_chunks(rows, columns, chunk_rows):
+    rows = iter(rows)
+    first = True
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk and not first:
+            return
+        first = False
+        yield pd.DataFrame(chunk, columns=columns)
+
+# Morceaux du classement détaillé, dans l'ordre du classement (une paire de colonnes par
+# emplacement de membre utilisé dans le roster)
+def ranking_chunks(engine, leaderboard, teams, chunk_rows=CHUNK_ROWS):
+    slots = roster_slots(teams)
+    return ranking_row_chunks(detailed_ranking_rows(engine, leaderboard, teams, slots), slots, chunk_rows)
+
+# Morceaux du classement détaillé à partir de lignes déjà calculées (detailed_ranking_rows)
+def ranking_row_chunks(rows, slots, chunk_rows=CHUNK_ROWS):
+    return _row_chunks(rows, detailed_ranking_columns(slots), chunk_rows)
+
+# Morceaux de l'export de toutes les notes, au format long des sauvegardes (rechargeable tel quel)
+def evaluation_chunks(evaluations, chunk_rows=CHUNK_ROWS):
+    team_names = list(evaluations)
+    # Environ chunk_rows lignes par morceau (une vingtaine de lignes par équipe)
+    teams_per_chunk = max(1, chunk_rows // 20)
+    if not team_names:
+        yield pd.DataFrame(columns=LONG_FORMAT_COLUMNS)
+    for start in range(0, len(team_names), teams_per_chunk):
+        chunk = {team_name: evaluations[team_name] for team_name in team_names[start:start + teams_per_chunk]}
+        yield evaluations_to_long_dataframe(chunk)
+
+
+def write_csv(chunks, f):
+    for i, chunk in enumerate(chunks):
+        f.write(chunk.to_csv(index=False, header=i == 0).encode("utf-8"))
+
+# Classeur en mode écriture seule : les lignes sont écrites au fil de l'eau
+def write_xlsx(chunks, f):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Export")
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            sheet.append(list(chunk.columns))
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(f)
+
+# Un groupe de lignes Parquet par morceau
+def write_parquet(chunks, f):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(f, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx, "parquet": write_parquet}
+
+
+# Fonction pour lire un fichier d'export par blocs (réponse HTTP en streaming)
+def iter_file(path, chunk_size=READ_CHUNK_BYTES):
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                return
+            yield block
+
+
+# Fichiers d'export déjà générés : un fichier par (type, format), valable pour une version des
+# évaluations. Les fichiers sont écrits dans un dossier temporaire supprimé avec le cache.
+class ExportCache:
+    def __init__(self, directory=None):
+        self.directory = tempfile.mkdtemp(prefix="exports_", dir=directory)
+        self._files = {}
+        self._lock = threading.Lock()
+        weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    # Fichier déjà généré pour cette version (None sinon)
+    def cached(self, kind, export_format, version):
+        entry = self._files.get((kind, export_format))
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        return None
+
+    # Générer (si besoin) le fichier d'export ; chunks est appelé seulement si le cache est périmé
+    def get(self, kind, export_format, version, chunks):
+        with self._lock:
+            path = self.cached(kind, export_format, version)
+            if path is not None:
+                return path
+
+            path = os.path.join(self.directory, f"{version}_{file_name(kind, export_format)}")
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    WRITERS[export_format](chunks(), f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+            previous = self._files.get((kind, export_format))
+            self._files[(kind, export_format)] = (version, path)
+            if previous is not None and previous[1] != path:
+                try:
+                    os.unlink(previous[1])
+                except FileNotFoundError:
+                    pass
+            return path
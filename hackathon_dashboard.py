@@ -1,12 +1,54 @@
+import time
+# Début de l'exécution, avant les imports (mesure du temps jusqu'au premier rendu)
+run_started = time.perf_counter()
+
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from io import BytesIO
 import os
 import json
-from datetime import datetime
+import inspect
+
+import charts
+from dedup import (
+    MERGES_FILE,
+    apply_merges,
+    find_duplicate_people,
+    find_duplicate_teams,
+    load_merges,
+    orphan_member_keys,
+    person_records,
+    save_merges,
+)
+from evaluation_db import DB_FILE, evaluations_from_rows, migrate_member_keys, open_store
+from evaluation_journal import EvaluationJournal
+from evaluation_model import RUBRIC
+from evaluation_storage import EVALUATIONS_FILE, TEAM_LEVEL_MEMBER
+from exports import (
+    EXPORT_FORMATS,
+    EXPORT_KINDS,
+    ExportCache,
+    available_formats,
+    evaluation_chunks,
+    file_name,
+    ranking_chunks,
+)
+from instrumentation import (
+    PAGE_RUN,
+    RunHistory,
+    RunProfile,
+    measured_fragment,
+    record_first_run,
+    section,
+)
+from judge_assignment import JUDGES_FILE, assign_teams, load_judges
+from leaderboard import Leaderboard, ranking_frame
+from roster import DATA_FILE, MemberDirectory, load_roster_snapshot, member_ids, member_keys, slot_label, transform_data
+from score_import import load_score_sheet, score_sheet_template
+from scoring import ScoreEngine, empty_member_evaluation, empty_team_evaluation
+from team_search import TeamSearchIndex
+from team_skills import COVERED_LEVEL, LEVEL_LABELS, SKILL_AREA_LABELS, SkillMatrix
 
 # Configuration de la page
 st.set_page_config(
@@ -15,6 +57,28 @@ st.set_page_config(
     layout="wide"
 )
 
+# Instrumentation optionnelle (activée depuis le panneau en bas de la barre latérale) : sections
+# chronométrées, widgets comptés, profil cProfile. None hors mode instrumenté, sinon (profil
+# cProfile activé, historique de la session).
+def instrumentation_options():
+    if not st.session_state.get("instrumentation"):
+        return None
+    return st.session_state.get("instrumentation_cprofile", False), st.session_state.setdefault("run_history", RunHistory())
+
+# Exécution limitée à des fragments (rerun d'un fragment, sans le reste du script)
+def fragment_only_run():
+    ctx = get_script_run_ctx()
+    return ctx is not None and bool(ctx.fragment_ids_this_run)
+
+# Mesurer les exécutions seules d'un fragment (décorateur placé sous @st.fragment)
+def measured(name):
+    return measured_fragment(name, instrumentation_options, fragment_only_run)
+
+run_profile = None
+run_options = instrumentation_options()
+if run_options is not None:
+    run_profile = RunProfile(run_options[0], history=run_options[1]).start()
+
 # Style CSS pour améliorer l'apparence
 st.markdown("""
 <style>
@@ -59,268 +123,186 @@ st.markdown("<div class='title'>Tableau de Bord d'Évaluation HACKVERSE 2025</di
 
 # ------ FONCTIONS DE SAUVEGARDE ET CHARGEMENT CSV ------
 
-# Fonction pour convertir les évaluations en DataFrame plat pour export CSV
-def evaluations_to_dataframe(evaluations):
-    data = []
-    
-    for team_name, team_data in evaluations.items():
-        row = {
-            "team_name": team_name,
-            # Données collectives
-            "collective_uiDesign": team_data["collective"]["uiDesign"],
-            "collective_apiImplementation": team_data["collective"]["apiImplementation"],
-            "collective_database": team_data["collective"]["database"],
-            "collective_authentication": team_data["collective"]["authentication"],
-            "collective_crudOperations": team_data["collective"]["crudOperations"],
-            "collective_requiredFeatures": team_data["collective"]["requiredFeatures"],
-            "collective_bonusFeatures": team_data["collective"]["bonusFeatures"],
-            "collective_documentation": team_data["collective"]["documentation"],
-            "collective_teamCollaboration": team_data["collective"]["teamCollaboration"],
-            "collective_deployment": team_data["collective"]["deployment"],
-            "collective_totalScore": team_data["collective"]["totalScore"],
-            "finalScore": team_data["finalScore"]
-        }
-        
-        # Ajouter les données individuelles pour chaque membre
-        for member_name, member_data in team_data["individual"].items():
-            # S'assurer que member_name est bien une chaîne de caractères
-            member_name_str = str(member_name)
-            member_safe_name = member_name_str.replace(" ", "_").replace(".", "").replace(",", "")
-            
-            try:
-                row[f"individual_{member_safe_name}_webProgramming"] = member_data["webProgramming"]
-                row[f"individual_{member_safe_name}_algorithmic"] = member_data["algorithmic"]
-                row[f"individual_{member_safe_name}_totalScore"] = member_data["totalScore"]
-            except KeyError:
-                # Si certaines clés sont manquantes, utiliser des valeurs par défaut
-                if "webProgramming" not in member_data:
-                    row[f"individual_{member_safe_name}_webProgramming"] = 0.0
-                if "algorithmic" not in member_data:
-                    row[f"individual_{member_safe_name}_algorithmic"] = 0.0
-                if "totalScore" not in member_data:
-                    row[f"individual_{member_safe_name}_totalScore"] = 0.0
-        
-        data.append(row)
-    
+# Données d'exemple minimales, utilisées pour le test si data.csv n'est pas trouvé
+def sample_data():
+    data = {
+        "timestamp": ["16/04/2025 13:09:46", "16/04/2025 14:30:21", "16/04/2025 15:45:33"],
+        "team_name": ["TEK", "CodeMasters", "DevWarriors"],
+        "team_description": [
+            "L'informatique au service du développement", 
+            "Programmation et innovation", 
+            "Développement d'applications mobiles"
+        ],
+        "leader_name": ["DJOMO DE DJOMO Karlyn", "MBARGA Jean", "FOUDA Marie"],
+        "leader_email": ["dedjomokarlyn@gmail.com", "mbarga.jean@gmail.com", "marie.fouda@gmail.com"],
+        "leader_github": ["https://github.com/DeDjomo", "https://github.com/MbargaJ", "https://github.com/FoudaM"],
+        "member1_name": ["MBIAKE Emmanuella Rose", "KAMGA Pierre", "ESSOMBA Paul"],
+        "member1_email": ["emmanuellambiake127@gmail.com", "pierre.kamga@gmail.com", "paul.essomba@gmail.com"],
+        "member1_github": ["https://github.com/EmmanuellaM", "https://github.com/PierreK", "https://github.com/PaulE"],
+        "member2_name": ["DJUSSE TAMENO Christian Tresor", "NANA Claire", "BELINGA Serge"],
+        "member2_email": ["christiandjusse@gmail.com", "claire.nana@gmail.com", "serge.belinga@gmail.com"],
+        "member2_github": ["https://github.com/Djusse", "https://github.com/ClaireN", "https://github.com/SergeB"]
+    }
     return pd.DataFrame(data)
 
-# Fonction pour sauvegarder les évaluations dans un CSV
-def save_evaluations_to_csv(evaluations, filename="hackathon_evaluations.csv"):
-    df = evaluations_to_dataframe(evaluations)
-    df.to_csv(filename, index=False)
-    
-    # Créer également une sauvegarde avec timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_filename = f"hackathon_evaluations_{timestamp}.csv"
-    # df.to_csv(backup_filename, index=False)
-    
-    return filename, backup_filename
+# Roster de data.csv : instantané binaire relu tel quel tant que le fichier ne change pas (pas
+# d'analyse pandas au démarrage), reconstruit seulement si la date ou la taille de data.csv change
+@st.cache_resource
+def load_snapshot(mtime_ns, size):
+    return load_roster_snapshot(DATA_FILE)
 
-# Fonction pour reconstruire la structure des évaluations à partir du DataFrame
-def dataframe_to_evaluations(df):
-    evaluations = {}
-    
-    for _, row in df.iterrows():
-        team_name = row["team_name"]
-        
-        # Initialiser la structure pour cette équipe
-        evaluations[team_name] = {
-            "collective": {
-                "uiDesign": float(row["collective_uiDesign"]),
-                "apiImplementation": float(row["collective_apiImplementation"]),
-                "database": float(row["collective_database"]),
-                "authentication": float(row["collective_authentication"]),
-                "crudOperations": float(row["collective_crudOperations"]),
-                "requiredFeatures": float(row["collective_requiredFeatures"]),
-                "bonusFeatures": float(row["collective_bonusFeatures"]),
-                "documentation": float(row["collective_documentation"]),
-                "teamCollaboration": float(row["collective_teamCollaboration"]),
-                "deployment": float(row["collective_deployment"]),
-                "totalScore": float(row["collective_totalScore"])
-            },
-            "individual": {},
-            "finalScore": float(row["finalScore"])
-        }
-        
-        # Extraire les données individuelles
-        individual_columns = [col for col in row.index if col.startswith("individual_")]
-        
-        # Grouper par membre
-        member_prefixes = set()
-        for col in individual_columns:
-            parts = col.split('_')
-            if len(parts) >= 3:
-                # Prendre tout sauf "individual" et le critère (dernier élément)
-                member_prefix = '_'.join(parts[1:-1])
-                member_prefixes.add(member_prefix)
-        
-        # Traiter chaque membre séparément
-        for member_prefix in member_prefixes:
-            # Convertir le préfixe en nom en remplaçant les underscores par des espaces
-            member_name = member_prefix.replace('_', ' ')
-            
-            # Créer un dictionnaire pour ce membre
-            member_data = {}
-            
-            # Remplir les données pour ce membre
-            for criterion in ['webProgramming', 'algorithmic', 'totalScore']:
-                col_name = f'individual_{member_prefix}_{criterion}'
-                if col_name in row:
-                    try:
-                        member_data[criterion] = float(row[col_name])
-                    except (ValueError, TypeError):
-                        # En cas d'erreur, utiliser 0
-                        member_data[criterion] = 0.0
-                else:
-                    member_data[criterion] = 0.0
-            
-            # Ajouter le membre à la structure d'évaluation
-            evaluations[team_name]["individual"][member_name] = member_data
-    
-    return evaluations
-
-# Fonction pour charger les évaluations depuis un CSV
-def load_evaluations_from_csv(filename="hackathon_evaluations.csv", silent=False):
-    try:
-        df = pd.read_csv(filename)
-        return dataframe_to_evaluations(df)
-    except (FileNotFoundError, pd.errors.EmptyDataError):
-        if not silent:
-            st.warning(f"Le fichier {filename} n'a pas été trouvé ou est vide.")
+# Roster des équipes (fusions de doublons appliquées) et problèmes de lecture : construits une
+# seule fois par contenu de data.csv et des fusions, et partagés entre les sessions
+@st.cache_resource
+def load_registrations(fingerprint, _snapshot):
+    if _snapshot is None:
+        teams, problems = transform_data(sample_data()), (f"Fichier {DATA_FILE} non trouvé : données d'exemple utilisées.",)
+    else:
+        teams, problems = _snapshot.teams, _snapshot.problems
+    return apply_merges(teams, load_merges()), problems
+
+def load_roster(fingerprint):
+    return load_registrations(fingerprint, roster_snapshot)[0]
+
+# Table des membres (identifiants stables, noms affichés), construite une seule fois par roster
+@st.cache_resource
+def load_member_directory(fingerprint):
+    return MemberDirectory(load_roster(fingerprint))
+
+# Index de recherche des équipes, construit une seule fois par roster
+@st.cache_resource
+def load_search_index(fingerprint):
+    return TeamSearchIndex(load_roster(fingerprint))
+
+try:
+    with section("roster (instantané de data.csv)"):
+        try:
+            data_stat = os.stat(DATA_FILE)
+            roster_snapshot = load_snapshot(data_stat.st_mtime_ns, data_stat.st_size)
+        except FileNotFoundError:
+            roster_snapshot = None
+        try:
+            merges_mtime = os.stat(MERGES_FILE).st_mtime_ns
+        except FileNotFoundError:
+            merges_mtime = None
+        roster_key = (roster_snapshot.fingerprint if roster_snapshot is not None else None, merges_mtime)
+        teams_data, data_problems = load_registrations(roster_key, roster_snapshot)
+except (pd.errors.ParserError, ValueError, UnicodeDecodeError) as e:
+    st.error(f"Impossible de lire {DATA_FILE} : {e}")
+    st.stop()
+
+# Signaler les lignes de data.csv ignorées ou incomplètes
+if data_problems:
+    with st.sidebar.expander(f"⚠️ {len(data_problems)} problème(s) dans {DATA_FILE}"):
+        st.markdown("\n".join(f"- {problem}" for problem in data_problems))
+
+# Journal des sauvegardes : seules les notes modifiées sont ajoutées, l'instantané CSV est
+# réécrit atomiquement lors des compactions. Un seul journal par processus (il tient le compte de
+# ses lignes). La table des membres sert à migrer un instantané à l'ancien format large.
+@st.cache_resource
+def get_journal(_members):
+    return EvaluationJournal(EVALUATIONS_FILE, members=_members)
+
+# Base partagée entre les jurys, ouverte une seule fois pour toutes les sessions
+@st.cache_resource
+def get_evaluation_store(_members):
+    return open_store(DB_FILE, EVALUATIONS_FILE, _members)
+
+with section("base partagée (ouverture)"):
+    members = load_member_directory(roster_key)
+    journal = get_journal(members)
+    store = get_evaluation_store(members)
+
+# Notes des anciennes sauvegardes (clés par nom de membre) converties en identifiants stables,
+# une seule fois par roster
+@st.cache_resource
+def migrate_store_member_keys(fingerprint):
+    return migrate_member_keys(store, load_member_directory(fingerprint))
+
+with section("base partagée (ouverture)"):
+    migrate_store_member_keys(roster_key)
+
+# Fonction pour charger toutes les évaluations depuis la base partagée (None si elle est vide).
+# Les versions des notes et le numéro de séquence lus servent ensuite à la synchronisation.
+def load_evaluations_from_store():
+    rows, seq = store.load()
+    st.session_state.score_versions = {(row.team, row.member, row.criterion): row.version for row in rows}
+    st.session_state.store_seq = seq
+    if not rows:
         return None
+    return evaluations_from_rows(rows, members)
 
-# Fonction pour convertir récursivement toutes les valeurs numériques en flottants et remplacer les NaN par 0
-def convert_values_to_float(data):
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if isinstance(value, (int, float)):
-                # Convertir en float et remplacer NaN par 0
-                data[key] = 0.0 if pd.isna(float(value)) else float(value)
-            elif isinstance(value, dict):
-                convert_values_to_float(value)
-            elif isinstance(value, list):
-                for i, item in enumerate(value):
-                    if isinstance(item, (int, float)):
-                        # Convertir en float et remplacer NaN par 0
-                        value[i] = 0.0 if pd.isna(float(item)) else float(item)
-                    elif isinstance(item, (dict, list)):
-                        convert_values_to_float(item)
-    return data
-
-# Fonction pour charger les données CSV
-@st.cache_data
-def load_data():
-    try:
-        # Chargement depuis le dossier de l'application si disponible
-        file_path = "data.csv"
-        df = pd.read_csv(file_path)
-        return df
-    except:
-        # Si le fichier n'est pas trouvé, utiliser un exemple minimal pour le test
-        st.warning("Fichier CSV non trouvé. Utilisation de données d'exemple.")
-        # Création de données d'exemple minimales
-        data = {
-            "timestamp": ["16/04/2025 13:09:46", "16/04/2025 14:30:21", "16/04/2025 15:45:33"],
-            "team_name": ["TEK", "CodeMasters", "DevWarriors"],
-            "team_description": [
-                "L'informatique au service du développement", 
-                "Programmation et innovation", 
-                "Développement d'applications mobiles"
-            ],
-            "leader_name": ["DJOMO DE DJOMO Karlyn", "MBARGA Jean", "FOUDA Marie"],
-            "leader_email": ["dedjomokarlyn@gmail.com", "mbarga.jean@gmail.com", "marie.fouda@gmail.com"],
-            "leader_github": ["https://github.com/DeDjomo", "https://github.com/MbargaJ", "https://github.com/FoudaM"],
-            "member1_name": ["MBIAKE Emmanuella Rose", "KAMGA Pierre", "ESSOMBA Paul"],
-            "member1_email": ["emmanuellambiake127@gmail.com", "pierre.kamga@gmail.com", "paul.essomba@gmail.com"],
-            "member1_github": ["https://github.com/EmmanuellaM", "https://github.com/PierreK", "https://github.com/PaulE"],
-            "member2_name": ["DJUSSE TAMENO Christian Tresor", "NANA Claire", "BELINGA Serge"],
-            "member2_email": ["christiandjusse@gmail.com", "claire.nana@gmail.com", "serge.belinga@gmail.com"],
-            "member2_github": ["https://github.com/Djusse", "https://github.com/ClaireN", "https://github.com/SergeB"]
-        }
-        return pd.DataFrame(data)
-
-# Chargement des données
-data = load_data()
-
-# Transformation des données en format plus facile à utiliser
-def transform_data(df):
-    teams = []
-    for i, row in df.iterrows():
-        # Assurer que le nom de l'équipe est valide et unique
-        team_name = row.get("team_name", "")
-        if pd.isna(team_name) or team_name == "":
-            team_name = f"Équipe_{i}"  # Utiliser un index si le nom est manquant
-            
-        team = {
-            "timestamp": row.get("timestamp", ""),
-            "teamName": team_name,
-            "teamDescription": row.get("team_description", ""),
-            "leader": {
-                "name": row.get("leader_name", ""),
-                "email": row.get("leader_email", ""),
-                "phone": row.get("leader_phone", ""),
-                "cycle": row.get("leader_cycle", ""),
-                "level": row.get("leader_level", ""),
-                "department": row.get("leader_department", ""),
-                "github": row.get("leader_github", ""),
-                "frontendSkill": row.get("leader_frontend", ""),
-                "backendSkill": row.get("leader_backend", ""),
-                "databaseSkill": row.get("leader_database", ""),
-                "devopsSkill": row.get("leader_devops", ""),
-                "languages": row.get("leader_languages", "")
-            },
-            "member1": {
-                "name": row.get("member1_name", ""),
-                "phone": row.get("member1_phone", ""),
-                "cycle": row.get("member1_cycle", ""),
-                "level": row.get("member1_level", ""),
-                "department": row.get("member1_department", ""),
-                "email": row.get("member1_email", ""),
-                "github": row.get("member1_github", ""),
-                "experience": row.get("member1_experience", ""),
-                "frontendSkill": row.get("member1_frontend", ""),
-                "backendSkill": row.get("member1_backend", ""),
-                "databaseSkill": row.get("member1_database", ""),
-                "languages": row.get("member1_languages", "")
-            },
-            "member2": {
-                "name": row.get("member2_name", ""),
-                "phone": row.get("member2_phone", ""),
-                "cycle": row.get("member2_cycle", ""),
-                "level": row.get("member2_level", ""),
-                "department": row.get("member2_department", ""),
-                "email": row.get("member2_email", ""),
-                "github": row.get("member2_github", ""),
-                "experience": row.get("member2_experience", ""),
-                "frontendSkill": row.get("member2_frontend", ""),
-                "backendSkill": row.get("member2_backend", ""),
-                "databaseSkill": row.get("member2_database", ""),
-                "languages": row.get("member2_languages", "")
-            },
-            "projects": row.get("team_projects", ""),
-            "previousHackathons": row.get("previous_hackathons", ""),
-            "howHeard": row.get("how_heard", ""),
-            "specialNeeds": row.get("special_needs", "")
-        }
-        teams.append(team)
-    return teams
+# Remplacer les évaluations de la session par celles de la base. L'état des champs de saisie des
+# notes (clés "score|...") est effacé pour qu'ils repartent des notes rechargées.
+def reload_evaluations():
+    st.session_state.evaluations = load_evaluations_from_store() or {}
+    for key in [key for key in st.session_state if str(key).startswith("score|")]:
+        del st.session_state[key]
 
-teams_data = transform_data(data)
+# Identité du jury, enregistrée avec chaque note
+judge_name = st.sidebar.text_input("👤 Nom du jury", key="judge_name")
+
+# Répartition des équipes entre les jurys (JUDGES_FILE), calculée une seule fois par roster et
+# par version du fichier des jurys ; None sans fichier des jurys
+@st.cache_resource
+def load_schedule(fingerprint, judges_mtime):
+    judges = load_judges()
+    if judges is None:
+        return None
+    return assign_teams(load_roster(fingerprint), *judges)
+
+# Résumé de la répartition pour les organisateurs : équipes par jury, équipes sans assez de jurys
+def render_schedule_summary(schedule):
+    with st.sidebar.expander(f"📋 Répartition des équipes ({schedule.overlap} jury(s) par équipe)"):
+        st.dataframe(
+            pd.DataFrame({
+                "Jury": [judge.name for judge in schedule.judges],
+                "Département": [judge.department for judge in schedule.judges],
+                "Équipes": schedule.loads(),
+            }),
+            use_container_width=True, hide_index=True
+        )
+        for team_name, missing in schedule.shortfalls():
+            st.warning(f"{team_name} : {missing} jury(s) manquant(s) (conflits d'intérêts)")
+        st.download_button(
+            "Exporter la répartition (CSV)", schedule.to_frame().to_csv(index=False).encode("utf-8"),
+            file_name="repartition_jurys.csv", mime="text/csv"
+        )
+
+# Équipes attribuées au jury connecté (None : toutes les équipes sont affichées)
+assigned_teams = None
+try:
+    judges_mtime = os.stat(JUDGES_FILE).st_mtime_ns
+except FileNotFoundError:
+    judges_mtime = None
+try:
+    schedule = load_schedule(roster_key, judges_mtime)
+except (ValueError, KeyError, TypeError, json.JSONDecodeError) as e:
+    st.sidebar.error(f"Impossible de lire {JUDGES_FILE} : {e}")
+    schedule = None
+if schedule is not None:
+    judge = schedule.judge(judge_name)
+    if judge is not None:
+        if st.sidebar.toggle("Afficher seulement mes équipes", value=True, key="assigned_only"):
+            assigned_teams = schedule.teams_for(judge.name)
+        st.sidebar.caption(f"{len(schedule.teams_for(judge.name))} équipe(s) attribuée(s) à {judge.name}")
+    elif judge_name:
+        st.sidebar.caption(f"{judge_name} n'est pas dans {JUDGES_FILE} : toutes les équipes sont affichées")
+    render_schedule_summary(schedule)
 
 # Ajout d'un bouton de rechargement dans la barre latérale
 if st.sidebar.button("🔄 Recharger les données sauvegardées"):
-    loaded_evaluations = load_evaluations_from_csv(silent=False)
-    if loaded_evaluations:
-        st.session_state.evaluations = loaded_evaluations
-        st.success("Évaluations rechargées avec succès!")
-        st.rerun()
-    else:
+    if store.is_empty():
         st.error("Aucune sauvegarde trouvée à charger.")
+    else:
+        reload_evaluations()
+        st.toast("Évaluations rechargées avec succès!")
+        st.rerun()
 
 # Initialisation de l'état des évaluations si c'est la première visite
 if 'evaluations' not in st.session_state:
-    # Essayer d'abord de charger depuis le CSV
-    loaded_evaluations = load_evaluations_from_csv(silent=True)
+    # Essayer d'abord de charger depuis la base partagée
+    loaded_evaluations = load_evaluations_from_store()
     
     if loaded_evaluations:
         evaluations = loaded_evaluations
@@ -329,407 +311,489 @@ if 'evaluations' not in st.session_state:
         # Si pas de CSV, initialiser avec des valeurs par défaut
         evaluations = {}
         for team in teams_data:
-            # Assurer que les noms des membres sont valides et présents
-            leader_name = team["leader"]["name"] if team["leader"]["name"] else "Chef d'équipe"
-            member1_name = team["member1"]["name"] if team["member1"]["name"] else "Membre 1"
-            member2_name = team["member2"]["name"] if team["member2"]["name"] else "Membre 2"
-            
-            evaluations[team["teamName"]] = {
-                "collective": {
-                    "uiDesign": 0.0,
-                    "apiImplementation": 0.0,
-                    "database": 0.0,
-                    "authentication": 0.0,
-                    "crudOperations": 0.0,
-                    "requiredFeatures": 0.0,
-                    "bonusFeatures": 0.0,
-                    "documentation": 0.0,
-                    "teamCollaboration": 0.0,
-                    "deployment": 0.0,
-                    "totalScore": 0.0
-                },
-                "individual": {
-                    leader_name: {
-                        "webProgramming": 0.0,
-                        "algorithmic": 0.0,
-                        "totalScore": 0.0
-                    },
-                    member1_name: {
-                        "webProgramming": 0.0,
-                        "algorithmic": 0.0,
-                        "totalScore": 0.0
-                    },
-                    member2_name: {
-                        "webProgramming": 0.0,
-                        "algorithmic": 0.0,
-                        "totalScore": 0.0
-                    }
-                },
-                "finalScore": 0.0
-            }
+            evaluations[team.name] = empty_team_evaluation()
+            for member_id in member_ids(team):
+                evaluations[team.name]["individual"][member_id] = empty_member_evaluation()
     st.session_state.evaluations = evaluations
 else:
     evaluations = st.session_state.evaluations
 
-# Convertir toutes les valeurs numériques en flottants pour éviter les erreurs de type
-evaluations = convert_values_to_float(evaluations)
+# Intervalle de vérification des notes des autres jurys
+SYNC_INTERVAL_SECONDS = 5
 
-# Fonction pour calculer les scores finaux
-def calculate_final_score(evaluations, team_name):
-    team_eval = evaluations[team_name]
-    
-    # Calculer le score collectif (moyenne des critères)
-    collective_values = [float(value) for key, value in team_eval["collective"].items() if key != "totalScore"]
-    if len(collective_values) > 0:
-        team_eval["collective"]["totalScore"] = round(sum(collective_values) / len(collective_values), 2)
+# Moteur de scores de la session, reconstruit quand les évaluations sont remplacées (chargement)
+def get_score_engine():
+    engine = st.session_state.get("score_engine")
+    if engine is None or engine.evaluations is not st.session_state.evaluations:
+        engine = st.session_state.score_engine = ScoreEngine(st.session_state.evaluations)
+    return engine
+
+# Clé du widget d'une note : stable, pour pouvoir y répercuter les notes des autres jurys
+def score_widget_key(team_name, member_name, criterion):
+    return f"score|{team_name}|{member_name}|{criterion}"
+
+# Appliquer au moteur de scores les notes écrites par les autres jurys depuis la dernière
+# synchronisation. Les champs concernés sont notés par équipe : la carte de l'équipe efface leur
+# état au début de sa prochaine exécution, pour qu'ils repartent de la nouvelle valeur.
+def sync_from_store():
+    engine = get_score_engine()
+    versions = st.session_state.score_versions
+    stale_widgets = st.session_state.setdefault("stale_score_widgets", {})
+    rows, seq = store.changes_since(st.session_state.store_seq)
+    for row in rows:
+        key = (row.team, row.member, row.criterion)
+        if versions.get(key) == row.version:
+            continue
+        # Notes d'un membre non inscrit : laissées dans la base (onglet Doublons)
+        if row.member != TEAM_LEVEL_MEMBER and (row.team, row.member) not in members:
+            continue
+        versions[key] = row.version
+        engine.set_score(row.team, row.member, row.criterion, row.score, record=False)
+        stale_widgets.setdefault(row.team, set()).add(score_widget_key(*key))
+    st.session_state.store_seq = seq
+
+# Effacer l'état des champs d'une équipe modifiés par un autre jury ; retourne leur nombre
+def reset_stale_widgets(team_name):
+    keys = st.session_state.get("stale_score_widgets", {}).pop(team_name, ())
+    for key in keys:
+        st.session_state.pop(key, None)
+    return len(keys)
+
+# Enregistrer une note saisie : moteur de scores local puis base partagée (si la note a changé).
+# En cas de conflit (note modifiée entre-temps par un autre jury), la page est rechargée avec
+# la note de l'autre jury.
+def record_score(team_name, member_name, criterion, value):
+    engine = get_score_engine()
+    if not engine.set_score(team_name, member_name, criterion, value):
+        return
+    key = (team_name, member_name, criterion)
+    versions = st.session_state.score_versions
+    result = store.upsert(team_name, member_name, criterion, value,
+                          expected_version=versions.get(key, 0), judge=judge_name)
+    if result.ok:
+        versions[key] = result.version
+        if result.seq == st.session_state.store_seq + 1:
+            st.session_state.store_seq = result.seq
     else:
-        team_eval["collective"]["totalScore"] = 0.0
-    
-    # Calculer les scores individuels
-    for member, scores in team_eval["individual"].items():
-        individual_values = [float(value) for key, value in scores.items() if key != "totalScore"]
-        if len(individual_values) > 0:
-            scores["totalScore"] = round(sum(individual_values) / len(individual_values), 2)
-        else:
-            scores["totalScore"] = 0.0
-    
-    # Calculer le score final de l'équipe selon la formule:
-    # Note équipe = (Note sur l'exercice collectif / 2) + (Somme des notes individuelles / 3) / 2
-    collective_score = float(team_eval["collective"]["totalScore"])
-    individual_scores = [float(member_scores["totalScore"]) for member_scores in team_eval["individual"].values()]
-    
-    # Vérifier si la liste des scores individuels n'est pas vide
-    if individual_scores:
-        individual_avg = sum(individual_scores) / len(individual_scores)
+        st.toast(f"⚠️ Cette note a été modifiée entre-temps par {result.judge or 'un autre jury'} ({result.score}/{SCALE})")
+        st.rerun()
+
+# Les versions récentes de Streamlit permettent de nommer un fragment et de réexécuter seulement
+# les fragments nommés depuis un callback ; sinon, toute la page est réexécutée
+FRAGMENT_KEYS = "key" in inspect.signature(st.fragment).parameters
+
+# Clé de fragment de la carte affichée à une position de la page
+def card_fragment_key(i):
+    return f"team_card_{i}"
+
+# Réexécuter seulement les cartes dont les notes ont changé (callback)
+def rerun_cards(keys):
+    st.rerun(keys if FRAGMENT_KEYS else "app")
+
+# Récupérer les notes des autres jurys sans relancer la page. Seul ce fragment interroge la base
+# à intervalle régulier : il met à jour le moteur de scores, puis propose de réafficher les cartes
+# affichées dont les notes ont changé (Streamlit ne réexécute des fragments nommés que depuis un
+# callback). Une carte affiche aussi les nouvelles notes à sa prochaine exécution.
+@st.fragment(run_every=SYNC_INTERVAL_SECONDS)
+@measured("fragment : synchronisation")
+def live_sync_status():
+    if store.latest_seq() > st.session_state.store_seq:
+        sync_from_store()
+    stale = st.session_state.get("stale_score_widgets", {})
+    keys = [key for team_name, key in st.session_state.get("visible_cards", {}).items() if stale.get(team_name)]
+    if keys:
+        st.button(
+            f"🔄 Afficher les notes des autres jurys ({len(keys)} équipe(s))",
+            key="show_synced_scores", on_click=rerun_cards, args=(keys,)
+        )
+    st.caption(f"🟢 Notes synchronisées entre les jurys ({store.path})")
+
+with section("synchronisation des notes"):
+    sync_from_store()
+with st.sidebar:
+    live_sync_status()
+
+# Nombre d'équipes affichées par page dans l'onglet d'évaluation
+PAGE_SIZE_OPTIONS = [4, 10, 20, 50]
+DEFAULT_PAGE_SIZE = 10
+
+# Échelle affichée des scores (grille d'évaluation)
+SCALE = f"{RUBRIC.scale:g}"
+
+# Champs de saisie d'une liste de critères de la grille pour une équipe (membre vide) ou un membre
+def render_score_inputs(team_name, member_id, scores, criteria):
+    for criterion in criteria:
+        record_score(team_name, member_id, criterion.key, st.number_input(
+            criterion.label,
+            min_value=0.0, max_value=criterion.max_score, step=criterion.step,
+            value=float(scores[criterion.key]),
+            key=score_widget_key(team_name, member_id, criterion.key)
+        ))
+
+# Carte d'évaluation d'une équipe. Chaque carte est un fragment : modifier une note ne
+# réexécute que cette carte (et donc uniquement le calcul du score de cette équipe). Chaque
+# position de la page a sa clé de fragment (card_fragment_key) pour que la synchronisation puisse
+# réexécuter seulement les cartes modifiées par d'autres jurys.
+def render_team_card(team, i):
+    if FRAGMENT_KEYS:
+        st.fragment(key=card_fragment_key(i))(team_card)(team, i)
     else:
-        individual_avg = 0.0
-    
-    # Calculer le score final
-    team_eval["finalScore"] = round((collective_score / 2) + (individual_avg / 2), 2)
-    
-    # Vérifier si le score final est NaN et le remplacer par 0
-    if pd.isna(team_eval["finalScore"]):
-        team_eval["finalScore"] = 0.0
-    
-    return team_eval
+        st.fragment(team_card)(team, i)
+
+@measured("fragment : carte d'équipe")
+def team_card(team, i):
+    engine = get_score_engine()
+    team_eval = engine.ensure_team(team.name)
+    if reset_stale_widgets(team.name):
+        st.toast(f"🔄 {team.name} : notes mises à jour par un autre jury")
+
+    # Card-like container with shadow. L'en-tête est rempli après les saisies pour afficher
+    # le score à jour.
+    header = st.empty()
+
+    st.markdown(f"**Description:** {team.description}")
+
+    # Informations sur l'équipe
+    st.markdown("<div class='subtitle'>Membres de l'équipe</div>", unsafe_allow_html=True)
+    for member in team.members:
+        st.markdown(f"**{slot_label(member.slot)}:** {member.name} ({member.email})")
+        st.markdown(f"**GitHub:** [{member.github}]({member.github})")
+
+    # Évaluation collective : un champ par critère de la grille, répartis sur deux colonnes
+    st.markdown(f"<div class='subtitle'>{RUBRIC.collective.title}</div>", unsafe_allow_html=True)
+
+    criteria = RUBRIC.collective.criteria
+    half = (len(criteria) + 1) // 2
+    for column, column_criteria in zip(st.columns(2), (criteria[:half], criteria[half:])):
+        with column:
+            render_score_inputs(team.name, TEAM_LEVEL_MEMBER, team_eval["collective"], column_criteria)
+
+    # Score collectif (tenu à jour par le moteur de scores)
+    collective_score = team_eval['collective']['totalScore']
+
+    st.markdown(f"<div style='display: flex; justify-content: space-between; align-items: center; background-color: #2A3942; padding: 10px; border-radius: 5px; margin-top: 10px;'><span style='font-weight: bold;'>Score collectif:</span><span class='score-badge'>{collective_score}/{SCALE}</span></div>", unsafe_allow_html=True)
+
+    # Évaluation individuelle
+    st.markdown(f"<div class='subtitle'>{RUBRIC.individual.title}</div>", unsafe_allow_html=True)
+
+    # Membres identifiés par leur identifiant stable (clé des notes) et affichés par leur nom
+    for member, (member_id, member_name) in zip(team.members, member_keys(team)):
+        title = f"{member_name} (Chef d'équipe)" if member.slot == "leader" else member_name
+        st.markdown(f"<div style='background-color: #2A3942; padding: 10px; border-radius: 5px; margin-bottom: 10px;'><strong>{title}</strong></div>", unsafe_allow_html=True)
+
+        # Créer l'évaluation du membre si elle n'existe pas encore
+        member_eval = engine.ensure_member(team.name, member_id)
+        render_score_inputs(team.name, member_id, member_eval, RUBRIC.individual.criteria)
+
+        # Score individuel (tenu à jour par le moteur de scores)
+        st.markdown(f"<div style='display: flex; justify-content: space-between; align-items: center; background-color: #2A3942; padding: 10px; border-radius: 5px; margin-top: 10px; margin-bottom: 15px;'><span style='font-weight: bold;'>Score individuel:</span><span class='score-badge' style='background-color: #2A3942;'>{member_eval['totalScore']}/{SCALE}</span></div>", unsafe_allow_html=True)
+
+    # Score final de l'équipe
+    st.markdown(f"<div style='display: flex; justify-content: space-between; align-items: center; background-color: #2A3654; padding: 15px; border-radius: 5px; margin-top: 20px;'><span style='font-weight: bold; font-size: 1.1rem;'>Score Final:</span><span class='score-badge' style='background-color: #28a745; font-size: 1.1rem;'>{team_eval['finalScore']}/{SCALE}</span></div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    header.markdown(f"<div style='border: 1px solid #ddd; border-radius: 8px; padding: 15px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'><h3>{team.name} - {team_eval['finalScore']}/{SCALE}</h3>", unsafe_allow_html=True)
 
-# Interface utilisateur avec onglets
-tab1, tab2 = st.tabs(["Évaluation des équipes", "Classement général"])
 
-with tab1:
+# Interface utilisateur avec onglets. Si la version de Streamlit suit l'onglet ouvert, changer
+# d'onglet relance le script et les graphiques de l'onglet 2 (matplotlib, plotly) ne sont
+# dessinés, et leurs bibliothèques importées, que lorsque l'onglet est affiché.
+TAB_LABELS = ["Évaluation des équipes", "Classement général", "Doublons"]
+try:
+    tab1, tab2, tab3 = st.tabs(TAB_LABELS, key="active_tab", on_change="rerun")
+except TypeError:
+    tab1, tab2, tab3 = st.tabs(TAB_LABELS)
+
+# Onglet affiché (toujours vrai si la version de Streamlit ne le suit pas)
+def tab_open(tab):
+    return getattr(tab, "open", None) is not False
+
+# Matrice des compétences des équipes, construite une seule fois par roster
+@st.cache_resource
+def load_skill_matrix(fingerprint):
+    return SkillMatrix(load_roster(fingerprint))
+
+# Options de tri par compétences (libellé -> clé de SkillMatrix.sort_keys)
+SKILL_SORT_OPTIONS = {
+    "Ordre de recherche / d'inscription": None,
+    "Couverture des compétences": "coverage",
+    **{f"Niveau {label}": area for area, label in SKILL_AREA_LABELS.items()},
+    "Nombre de langages": "languages",
+}
+
+# Filtres et tri des équipes par profil de compétences (calculés sur la matrice des compétences)
+def render_skill_filters(team_indices):
+    skills = load_skill_matrix(roster_key)
+    with st.expander("🧠 Filtrer et trier par compétences"):
+        level_cols = st.columns(len(SKILL_AREA_LABELS))
+        min_levels = {}
+        for level_col, (area, label) in zip(level_cols, SKILL_AREA_LABELS.items()):
+            with level_col:
+                min_levels[area] = LEVEL_LABELS.index(st.select_slider(
+                    f"{label} (meilleur membre)", LEVEL_LABELS, value=LEVEL_LABELS[0], key=f"skill_min_{area}"
+                ))
+        language_col, coverage_col, sort_col = st.columns(3)
+        with language_col:
+            languages = st.multiselect("Langages (tous requis)", skills.languages, key="skill_languages")
+        with coverage_col:
+            min_coverage = st.slider("Couverture minimale", 0.0, 1.0, 0.0, step=0.25, key="skill_min_coverage",
+                                     help=f"Part des domaines où un membre a au moins le niveau {LEVEL_LABELS[COVERED_LEVEL]}")
+        with sort_col:
+            sort_label = st.selectbox("Trier par", list(SKILL_SORT_OPTIONS), key="skill_sort")
+        team_indices = skills.select(team_indices, min_levels, languages, min_coverage, SKILL_SORT_OPTIONS[sort_label])
+        if st.toggle("Afficher le tableau des compétences", key="skill_table"):
+            st.dataframe(skills.summary_frame(team_indices), use_container_width=True, hide_index=True)
+    return team_indices
+
+# Modèles de feuille de notes (CSV, XLSX), générés une seule fois par roster
+@st.cache_data
+def load_score_sheet_templates(fingerprint):
+    template = score_sheet_template(load_roster(fingerprint))
+    template_xlsx = BytesIO()
+    template.to_excel(template_xlsx, index=False)
+    return template.to_csv(index=False), template_xlsx.getvalue()
+
+# Import d'une feuille de notes (CSV/XLSX) : validée en une passe, puis écrite dans la base
+# partagée en une seule transaction. Les notes importées sont appliquées aux cartes par la
+# synchronisation au rechargement de la page.
+def render_score_import():
+    with st.expander("📥 Importer une feuille de notes (CSV/XLSX)"):
+        template_csv, template_xlsx = load_score_sheet_templates(roster_key)
+        template_col1, template_col2 = st.columns(2)
+        with template_col1:
+            st.download_button("Modèle de feuille (CSV)", template_csv, file_name="notes_jury.csv", mime="text/csv")
+        with template_col2:
+            st.download_button(
+                "Modèle de feuille (XLSX)", template_xlsx, file_name="notes_jury.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+
+        # Notes du dernier import non écrites parce qu'un autre jury les a modifiées entre-temps
+        conflicts = st.session_state.get("import_conflicts")
+        if conflicts:
+            st.warning(f"{len(conflicts)} note(s) de la feuille n'ont pas été importées : elles ont été modifiées entre-temps par un autre jury.")
+            st.dataframe(
+                pd.DataFrame(
+                    [(c.team, members.name(c.team, c.member), c.criterion, c.score, c.current_score, c.current_judge) for c in conflicts],
+                    columns=["Équipe", "Membre", "Critère", "Note de la feuille", "Note actuelle", "Modifiée par"]
+                ),
+                use_container_width=True, hide_index=True
+            )
+
+        uploaded_file = st.file_uploader("Feuille de notes", type=["csv", "xlsx"], key="score_sheet")
+        if uploaded_file is None:
+            return
+        try:
+            valid_scores, errors = load_score_sheet(uploaded_file, teams_data, uploaded_file.name)
+        except Exception as e:
+            st.error(f"Impossible de lire la feuille : {e}")
+            return
+
+        st.caption(f"{len(valid_scores)} note(s) valide(s), {len(errors)} note(s) en erreur")
+        if len(errors):
+            st.warning("Les notes suivantes seront ignorées :")
+            st.dataframe(errors, use_container_width=True, hide_index=True)
+        if len(valid_scores) and st.button(f"Importer {len(valid_scores)} note(s)", key="import_scores"):
+            # Une note modifiée par un autre jury depuis son dernier chargement n'est pas écrasée
+            imported, conflicts = store.upsert_many(
+                valid_scores.itertuples(index=False, name=None), judge=judge_name,
+                expected_versions=st.session_state.score_versions
+            )
+            st.toast(f"✅ {imported} note(s) importée(s)")
+            if conflicts:
+                st.toast(f"⚠️ {len(conflicts)} note(s) non importée(s) : modifiée(s) entre-temps par un autre jury")
+            st.session_state.import_conflicts = conflicts
+            st.rerun()
+
+with tab1, section("onglet 1 (cartes des équipes)"):
+    render_score_import()
+
     # Barre de recherche
-    search_term = st.text_input("🔍 Rechercher une équipe ou un membre", "")
+    search_term = st.text_input(
+        "🔍 Rechercher une équipe ou un membre", "",
+        help="Nom, email ou GitHub. Filtres possibles : language:python, level:3, cycle:licence, department:info, backend:avance"
+    )
     
-    # Filtrer les équipes en fonction du terme de recherche
-    filtered_teams = teams_data
+    # Filtrer les équipes en fonction du terme de recherche (résultats classés par pertinence)
+    team_indices = range(len(teams_data))
     if search_term:
-        filtered_teams = [
-            team for team in teams_data if 
-            search_term.lower() in team["teamName"].lower() or
-            search_term.lower() in team["leader"]["name"].lower() or
-            search_term.lower() in team["member1"]["name"].lower() or
-            search_term.lower() in team["member2"]["name"].lower()
-        ]
+        team_indices = load_search_index(roster_key).search(search_term)
+    # Seulement les équipes attribuées au jury (les cartes des autres équipes ne sont pas créées)
+    if assigned_teams is not None:
+        assigned = set(assigned_teams)
+        team_indices = [index for index in team_indices if index in assigned]
+    team_indices = render_skill_filters(team_indices)
+    filtered_teams = [teams_data[index] for index in team_indices]
     
     if not filtered_teams:
         st.warning("Aucune équipe ne correspond à votre recherche.")
     else:
+        # Pagination : seules les équipes de la page courante créent des widgets.
+        # Les notes des autres pages restent dans st.session_state.evaluations.
+        page_col, size_col, info_col = st.columns([1, 1, 2])
+        with size_col:
+            page_size = st.selectbox("Équipes par page", PAGE_SIZE_OPTIONS, index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE), key="team_page_size")
+        page_count = max(1, -(-len(filtered_teams) // page_size))
+        if st.session_state.get("team_page", 1) > page_count:
+            st.session_state.team_page = page_count
+        with page_col:
+            page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="team_page")
+        page_start = (page - 1) * page_size
+        page_teams = filtered_teams[page_start:page_start + page_size]
+        with info_col:
+            st.caption(f"Équipes {page_start + 1} à {page_start + len(page_teams)} sur {len(filtered_teams)}")
+
         # Afficher les équipes sous forme de grille
         col1, col2 = st.columns(2)
-        
-        for i, team in enumerate(filtered_teams):
+        st.session_state.visible_cards = {
+            team.name: card_fragment_key(i) for i, team in enumerate(page_teams, start=page_start)
+        }
+
+        for i, team in enumerate(page_teams, start=page_start):
             # Alterner entre les colonnes
             col = col1 if i % 2 == 0 else col2
             
             with col:
-                # Card-like container with shadow
-                final_score = calculate_final_score(evaluations, team['teamName'])['finalScore']
-                # Vérifier et remplacer NaN par 0
-                if pd.isna(final_score):
-                    final_score = 0.0
-                st.markdown(f"<div style='border: 1px solid #ddd; border-radius: 8px; padding: 15px; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'><h3>{team['teamName']} - {final_score}/20</h3>", unsafe_allow_html=True)
-                
-                st.markdown(f"**Description:** {team['teamDescription']}")
-                
-                # Informations sur l'équipe
-                st.markdown("<div class='subtitle'>Membres de l'équipe</div>", unsafe_allow_html=True)
-                st.markdown(f"**Chef d'équipe:** {team['leader']['name']} ({team['leader']['email']})")
-                st.markdown(f"**GitHub:** [{team['leader']['github']}]({team['leader']['github']})")
-                st.markdown(f"**Membre 1:** {team['member1']['name']} ({team['member1']['email']})")
-                st.markdown(f"**GitHub:** [{team['member1']['github']}]({team['member1']['github']})")
-                st.markdown(f"**Membre 2:** {team['member2']['name']} ({team['member2']['email']})")
-                st.markdown(f"**GitHub:** [{team['member2']['github']}]({team['member2']['github']})")
-                
-                # Évaluation collective
-                st.markdown("<div class='subtitle'>Évaluation Collective (Todo App)</div>", unsafe_allow_html=True)
-                
-                col_a, col_b = st.columns(2)
-                
-                with col_a:
-                    # Générer des clés uniques pour les widgets
-                    ui_key = f"ui_{team['teamName']}_{i}"  # Ajouter l'indice i pour garantir l'unicité
-                    evaluations[team["teamName"]]["collective"]["uiDesign"] = st.number_input(
-                        "Interface utilisateur (UI)",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["uiDesign"]),
-                        key=ui_key
-                    )
-                    
-                    api_key = f"api_{team['teamName']}_{i}"
-                    evaluations[team["teamName"]]["collective"]["apiImplementation"] = st.number_input(
-                        "API RESTful",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["apiImplementation"]),
-                        key=api_key
-                    )
-                    
-                    db_key = f"db_{team['teamName']}_{i}"
-                    evaluations[team["teamName"]]["collective"]["database"] = st.number_input(
-                        "Base de données",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["database"]),
-                        key=db_key
-                    )
-                    
-                    auth_key = f"auth_{team['teamName']}_{i}"
-                    evaluations[team["teamName"]]["collective"]["authentication"] = st.number_input(
-                        "Authentification",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["authentication"]),
-                        key=auth_key
-                    )
-                    
-                    crud_key = f"crud_{team['teamName']}_{i}"
-                    evaluations[team["teamName"]]["collective"]["crudOperations"] = st.number_input(
-                        "Opérations CRUD",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["crudOperations"]),
-                        key=crud_key
-                    )
-                
-                with col_b:
-                    req_key = f"req_{team['teamName']}_{i}"
-                    evaluations[team["teamName"]]["collective"]["requiredFeatures"] = st.number_input(
-                        "Fonctionnalités requises",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["requiredFeatures"]),
-                        key=req_key
-                    )
-                    
-                    bonus_key = f"bonus_{team['teamName']}_{i}"
-                    evaluations[team["teamName"]]["collective"]["bonusFeatures"] = st.number_input(
-                        "Fonctionnalités bonus",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["bonusFeatures"]),
-                        key=bonus_key
-                    )
-                    
-                    doc_key = f"doc_{team['teamName']}_{i}"
-                    evaluations[team["teamName"]]["collective"]["documentation"] = st.number_input(
-                        "Documentation",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["documentation"]),
-                        key=doc_key
-                    )
-                    
-                    collab_key = f"collab_{team['teamName']}_{i}"
-                    evaluations[team["teamName"]]["collective"]["teamCollaboration"] = st.number_input(
-                        "Collaboration d'équipe",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["teamCollaboration"]),
-                        key=collab_key
-                    )
-                    
-                    deploy_key = f"deploy_{team['teamName']}_{i}"
-                    evaluations[team["teamName"]]["collective"]["deployment"] = st.number_input(
-                        "Déploiement",
-                        min_value=0.0, max_value=20.0, step=1.0,
-                        value=float(evaluations[team["teamName"]]["collective"]["deployment"]),
-                        key=deploy_key
-                    )
-                
-                # Mettre à jour le score collectif
-                evaluate = calculate_final_score(evaluations, team["teamName"])
-                collective_score = evaluate['collective']['totalScore']
-                if pd.isna(collective_score):
-                    collective_score = 0.0
-                    
-                st.markdown(f"<div style='display: flex; justify-content: space-between; align-items: center; background-color: #2A3942; padding: 10px; border-radius: 5px; margin-top: 10px;'><span style='font-weight: bold;'>Score collectif:</span><span class='score-badge'>{collective_score}/20</span></div>", unsafe_allow_html=True)
-                
-                # Évaluation individuelle
-                st.markdown("<div class='subtitle'>Évaluation Individuelle</div>", unsafe_allow_html=True)
-                
-                # Chef d'équipe - affichage sans expander
-                leader_name = team["leader"]["name"] if team["leader"]["name"] else "Chef d'équipe"
-                st.markdown(f"<div style='background-color: #2A3942; padding: 10px; border-radius: 5px; margin-bottom: 10px;'><strong>{leader_name} (Chef d'équipe)</strong></div>", unsafe_allow_html=True)
-                
-                # Vérifier si la clé existe dans les évaluations
-                if leader_name not in evaluations[team["teamName"]]["individual"]:
-                    evaluations[team["teamName"]]["individual"][leader_name] = {
-                        "webProgramming": 0.0,
-                        "algorithmic": 0.0,
-                        "totalScore": 0.0
-                    }
-                
-                web_leader_key = f"web_{team['teamName']}_{leader_name}_{i}"
-                evaluations[team["teamName"]]["individual"][leader_name]["webProgramming"] = st.number_input(
-                    "Exercice de programmation web (PDF)",
-                    min_value=0.0, max_value=20.0, step=1.0,
-                    value=float(evaluations[team["teamName"]]["individual"][leader_name]["webProgramming"]),
-                    key=web_leader_key
-                )
-                
-                algo_leader_key = f"algo_{team['teamName']}_{leader_name}_{i}"
-                evaluations[team["teamName"]]["individual"][leader_name]["algorithmic"] = st.number_input(
-                    "Exercice d'algorithmique (Kattis)",
-                    min_value=0.0, max_value=20.0, step=1.0,
-                    value=float(evaluations[team["teamName"]]["individual"][leader_name]["algorithmic"]),
-                    key=algo_leader_key
-                )
-                
-                # Calculer le score individuel
-                calculate_final_score(evaluations, team["teamName"])
-                leader_score = evaluations[team['teamName']]['individual'][leader_name]['totalScore']
-                if pd.isna(leader_score):
-                    leader_score = 0.0
-                st.markdown(f"<div style='display: flex; justify-content: space-between; align-items: center; background-color: #2A3942; padding: 10px; border-radius: 5px; margin-top: 10px; margin-bottom: 15px;'><span style='font-weight: bold;'>Score individuel:</span><span class='score-badge' style='background-color: #2A3942;'>{leader_score}/20</span></div>", unsafe_allow_html=True)
-                
-                # Membre 1 - affichage sans expander
-                member1_name = team["member1"]["name"] if team["member1"]["name"] else "Membre 1"
-                st.markdown(f"<div style='background-color: #2A3942; padding: 10px; border-radius: 5px; margin-bottom: 10px;'><strong>{member1_name}</strong></div>", unsafe_allow_html=True)
-                
-                # Vérifier si la clé existe dans les évaluations
-                if member1_name not in evaluations[team["teamName"]]["individual"]:
-                    evaluations[team["teamName"]]["individual"][member1_name] = {
-                        "webProgramming": 0.0,
-                        "algorithmic": 0.0,
-                        "totalScore": 0.0
-                    }
-                
-                web_member1_key = f"web_{team['teamName']}_{member1_name}_{i}"
-                evaluations[team["teamName"]]["individual"][member1_name]["webProgramming"] = st.number_input(
-                    "Exercice de programmation web (PDF)",
-                    min_value=0.0, max_value=20.0, step=1.0,
-                    value=float(evaluations[team["teamName"]]["individual"][member1_name]["webProgramming"]),
-                    key=web_member1_key
-                )
-                
-                algo_member1_key = f"algo_{team['teamName']}_{member1_name}_{i}"
-                evaluations[team["teamName"]]["individual"][member1_name]["algorithmic"] = st.number_input(
-                    "Exercice d'algorithmique (Kattis)",
-                    min_value=0.0, max_value=20.0, step=1.0,
-                    value=float(evaluations[team["teamName"]]["individual"][member1_name]["algorithmic"]),
-                    key=algo_member1_key
-                )
-                
-                # Calculer le score individuel
-                calculate_final_score(evaluations, team["teamName"])
-                member1_score = evaluations[team['teamName']]['individual'][member1_name]['totalScore']
-                if pd.isna(member1_score):
-                    member1_score = 0.0
-                st.markdown(f"<div style='display: flex; justify-content: space-between; align-items: center; background-color: #2A3942; padding: 10px; border-radius: 5px; margin-top: 10px; margin-bottom: 15px;'><span style='font-weight: bold;'>Score individuel:</span><span class='score-badge' style='background-color: #2A3942;'>{member1_score}/20</span></div>", unsafe_allow_html=True)
-                
-                # Membre 2 - affichage sans expander
-                member2_name = team["member2"]["name"] if team["member2"]["name"] else "Membre 2"
-                st.markdown(f"<div style='background-color: #2A3933; padding: 10px; border-radius: 5px; margin-bottom: 10px;'><strong>{member2_name}</strong></div>", unsafe_allow_html=True)
-                
-                # Vérifier si la clé existe dans les évaluations
-                if member2_name not in evaluations[team["teamName"]]["individual"]:
-                    evaluations[team["teamName"]]["individual"][member2_name] = {
-                        "webProgramming": 0.0,
-                        "algorithmic": 0.0,
-                        "totalScore": 0.0
-                    }
-                
-                web_member2_key = f"web_{team['teamName']}_{member2_name}_{i}"
-                evaluations[team["teamName"]]["individual"][member2_name]["webProgramming"] = st.number_input(
-                    "Exercice de programmation web (PDF)",
-                    min_value=0.0, max_value=20.0, step=1.0,
-                    value=float(evaluations[team["teamName"]]["individual"][member2_name]["webProgramming"]),
-                    key=web_member2_key
-                )
-                
-                algo_member2_key = f"algo_{team['teamName']}_{member2_name}_{i}"
-                evaluations[team["teamName"]]["individual"][member2_name]["algorithmic"] = st.number_input(
-                    "Exercice d'algorithmique (Kattis)",
-                    min_value=0.0, max_value=20.0, step=1.0,
-                    value=float(evaluations[team["teamName"]]["individual"][member2_name]["algorithmic"]),
-                    key=algo_member2_key
-                )
-                
-                # Calculer le score individuel
-                calculate_final_score(evaluations, team["teamName"])
-                st.markdown(f"<div style='display: flex; justify-content: space-between; align-items: center; background-color: #2A3942; padding: 10px; border-radius: 5px; margin-top: 10px;'><span style='font-weight: bold;'>Score individuel:</span><span class='score-badge' style='background-color: #2A3942;'>{evaluations[team['teamName']]['individual'][member2_name]['totalScore']}/20</span></div>", unsafe_allow_html=True)
-                
-                # Score final de l'équipe
-                st.markdown(f"<div style='display: flex; justify-content: space-between; align-items: center; background-color: #2A3654; padding: 15px; border-radius: 5px; margin-top: 20px;'><span style='font-weight: bold; font-size: 1.1rem;'>Score Final:</span><span class='score-badge' style='background-color: #28a745; font-size: 1.1rem;'>{evaluations[team['teamName']]['finalScore']}/20</span></div>", unsafe_allow_html=True)
-                st.markdown("</div>", unsafe_allow_html=True)
-
-with tab2:
-    # Créer un classement basé sur les scores finaux
-    ranking_data = []
-    for team in teams_data:
-        team_name = team["teamName"]
-        collective_score = evaluations[team_name]["collective"]["totalScore"]
-        
-        # S'assurer que les noms sont cohérents
-        leader_name = team["leader"]["name"] if team["leader"]["name"] else "Chef d'équipe"
-        member1_name = team["member1"]["name"] if team["member1"]["name"] else "Membre 1"
-        member2_name = team["member2"]["name"] if team["member2"]["name"] else "Membre 2"
-        
-        # Vérifier si les clés existent
-        if leader_name not in evaluations[team_name]["individual"]:
-            evaluations[team_name]["individual"][leader_name] = {"totalScore": 0.0}
-        if member1_name not in evaluations[team_name]["individual"]:
-            evaluations[team_name]["individual"][member1_name] = {"totalScore": 0.0}
-        if member2_name not in evaluations[team_name]["individual"]:
-            evaluations[team_name]["individual"][member2_name] = {"totalScore": 0.0}
-            
-        # Calculer la moyenne des scores individuels
-        individual_scores = [
-            float(evaluations[team_name]["individual"][leader_name]["totalScore"]),
-            float(evaluations[team_name]["individual"][member1_name]["totalScore"]),
-            float(evaluations[team_name]["individual"][member2_name]["totalScore"])
-        ]
-        individual_avg = sum(individual_scores) / len(individual_scores)
-        
-        ranking_data.append({
-            "Équipe": team_name,
-            "Score Collectif": collective_score,
-            "Score Individuel Moyen": individual_avg,
-            "Score Final": evaluations[team_name]["finalScore"],
-            "Détail Individuel": {
-                leader_name: evaluations[team_name]["individual"][leader_name]["totalScore"],
-                member1_name: evaluations[team_name]["individual"][member1_name]["totalScore"],
-                member2_name: evaluations[team_name]["individual"][member2_name]["totalScore"]
-            }
-        })
-    
-    # Trier par score final décroissant
-    ranking_data = sorted(ranking_data, key=lambda x: x["Score Final"], reverse=True)
+                render_team_card(team, i)
+
+# Notes d'une sauvegarde avec les clés de membres par nom (anciennes sauvegardes) converties en
+# identifiants stables ; les clés inconnues sont gardées telles quelles (onglet Doublons)
+def resolve_member_entries(entries):
+    return [
+        (team, member if member == TEAM_LEVEL_MEMBER else members.resolve(team, member) or member, *rest)
+        for team, member, *rest in entries
+    ]
+
+# Notes de la sauvegarde non chargées parce qu'un jury les a modifiées après la sauvegarde : elles
+# ne remplacent les notes de la base qu'après confirmation explicite
+def render_load_conflicts():
+    conflicts = st.session_state.get("load_conflicts")
+    if not conflicts:
+        return
+    st.warning(f"{len(conflicts)} note(s) de la sauvegarde n'ont pas été chargées : elles ont été modifiées depuis par un jury.")
+    st.dataframe(
+        pd.DataFrame(
+            [(c.team, members.name(c.team, c.member), c.criterion, c.score, c.current_score, c.current_judge) for c in conflicts],
+            columns=["Équipe", "Membre", "Critère", "Note sauvegardée", "Note actuelle", "Modifiée par"]
+        ),
+        use_container_width=True, hide_index=True
+    )
+    confirmed = st.checkbox(f"Je confirme remplacer ces {len(conflicts)} note(s) par celles de la sauvegarde", key="confirm_load_conflicts")
+    overwrite_col, dismiss_col = st.columns(2)
+    with overwrite_col:
+        if st.button("Remplacer les notes en conflit", key="overwrite_conflicts", disabled=not confirmed):
+            store.upsert_many([(c.team, c.member, c.criterion, c.score) for c in conflicts], judge=judge_name)
+            st.session_state.load_conflicts = None
+            reload_evaluations()
+            st.rerun()
+    with dismiss_col:
+        if st.button("Garder les notes actuelles", key="dismiss_conflicts"):
+            st.session_state.load_conflicts = None
+            st.rerun()
+
+# Nombre d'équipes qualifiées et nombre d'équipes affichées dans les graphiques
+QUALIFIED_TEAMS = 10
+PLOTTED_TEAMS = 15
+
+# Moteurs de rendu des graphiques : images matplotlib (serveur) ou plotly (navigateur)
+CHART_BACKENDS = ["matplotlib", "plotly"]
+
+# Classement de la session, abonné au moteur de scores (mis à jour à chaque score final modifié)
+def get_leaderboard():
+    engine = get_score_engine()
+    leaderboard = st.session_state.get("leaderboard")
+    if leaderboard is None or st.session_state.get("leaderboard_engine") is not engine:
+        # Vérifier si les clés existent pour chaque membre avant de figer le classement
+        for team in teams_data:
+            for member_id in member_ids(team):
+                engine.ensure_member(team.name, member_id)
+        leaderboard = Leaderboard(
+            [team.name for team in teams_data],
+            {team.name: engine.evaluations[team.name]["finalScore"] for team in teams_data}
+        )
+        engine.subscribe(lambda team_name, score: team_name in leaderboard and leaderboard.update(team_name, score))
+        st.session_state.leaderboard = leaderboard
+        st.session_state.leaderboard_engine = engine
+    return leaderboard
+
+# Tableau du classement, mémorisé sur la version des évaluations
+def ranking_table(engine, leaderboard):
+    cached = st.session_state.get("ranking_table")
+    if cached is not None and cached["version"] == engine.version and cached["leaderboard"] is leaderboard:
+        return cached["ranking_df"]
+
+    ranking_df = ranking_frame(engine, leaderboard)
+    st.session_state.ranking_table = {
+        "version": engine.version,
+        "leaderboard": leaderboard,
+        "ranking_df": ranking_df,
+    }
+    return ranking_df
+
+# Fichiers d'export de la session, valables pour le moteur de scores courant
+def get_export_cache(engine):
+    if st.session_state.get("export_engine") is not engine:
+        st.session_state.export_cache = ExportCache()
+        st.session_state.export_engine = engine
+    return st.session_state.export_cache
+
+# Export du classement détaillé ou de toutes les notes, généré seulement à la demande
+def render_exports(engine, leaderboard):
+    export_cache = get_export_cache(engine)
+    kind_col, format_col = st.columns(2)
+    with kind_col:
+        kind = st.selectbox(
+            "Données à exporter", list(EXPORT_KINDS), format_func=lambda name: EXPORT_KINDS[name].label,
+            key="export_kind"
+        )
+    with format_col:
+        export_format = st.selectbox(
+            "Format", available_formats(), format_func=lambda name: EXPORT_FORMATS[name].label,
+            key="export_format"
+        )
+
+    path = export_cache.cached(kind, export_format, engine.version)
+    if path is None and st.button("Préparer l'export", key="prepare_export"):
+        if kind == "classement":
+            chunks = lambda: ranking_chunks(engine, leaderboard, teams_data)
+        else:
+            chunks = lambda: evaluation_chunks(engine.evaluations)
+        with section("onglet 2 : export"), st.spinner("Génération de l'export..."):
+            path = export_cache.get(kind, export_format, engine.version, chunks)
+
+    if path is not None:
+        with open(path, "rb") as f:
+            st.download_button(
+                label=f"Télécharger : {EXPORT_KINDS[kind].label} ({EXPORT_FORMATS[export_format].label})",
+                data=f,
+                file_name=file_name(kind, export_format),
+                mime=EXPORT_FORMATS[export_format].mime,
+                key="download_export"
+            )
+
+# Classement général. Le fragment n'est pas réexécuté quand une carte d'équipe change :
+# il est recalculé lors d'une réexécution complète ou via le bouton d'actualisation.
+@st.fragment
+@measured("fragment : classement")
+def render_ranking():
+    st.button("🔄 Actualiser le classement", key="refresh_ranking")
     
-    # Créer un DataFrame pour l'affichage
-    ranking_df = pd.DataFrame([
-        {
-            "Rang": i+1,
-            "Équipe": team["Équipe"],
-            "Score Collectif": team["Score Collectif"],
-            "Score Individuel Moyen": team["Score Individuel Moyen"],
-            "Score Final": team["Score Final"]
-        }
-        for i, team in enumerate(ranking_data)
-    ])
+    # Classement tenu à jour par le moteur de scores ; les tableaux ne sont reconstruits que
+    # si une note a changé depuis le dernier affichage
+    engine = get_score_engine()
+    leaderboard = get_leaderboard()
+    ranking_df = ranking_table(engine, leaderboard)
     
     # Afficher le tableau de classement
     st.markdown("<div class='subtitle'>Classement des équipes</div>", unsafe_allow_html=True)
     
     # Appliquer un style conditionnel pour mettre en évidence les 10 meilleures équipes
     def highlight_top_teams(val):
-        color = 'rgba(40, 167, 69, 0.2)' if val <= 10 else ''
+        color = 'rgba(40, 167, 69, 0.2)' if val <= QUALIFIED_TEAMS else ''
         return f'background-color: {color}'
     
     st.dataframe(
-        ranking_df.style.applymap(highlight_top_teams, subset=['Rang']).format({
+        ranking_df.style.map(highlight_top_teams, subset=['Rang']).format({
             "Score Collectif": "{:.2f}",
             "Score Individuel Moyen": "{:.2f}",
             "Score Final": "{:.2f}"
@@ -741,97 +805,40 @@ with tab2:
     # Visualisation graphique des scores
     st.markdown("<div class='subtitle'>Visualisation des scores</div>", unsafe_allow_html=True)
     
-    col_viz1, col_viz2 = st.columns(2)
+    chart_backend = st.radio(
+        "Rendu des graphiques", CHART_BACKENDS, horizontal=True, key="chart_backend",
+        help="plotly dessine les graphiques dans le navigateur et allège le serveur"
+    )
     
-    with col_viz1:
-        # Graphique des scores finaux par équipe
-        fig, ax = plt.subplots(figsize=(10, 8))
-        
+    # Graphiques dessinés seulement si l'onglet est affiché
+    if tab_open(tab2):
         # Limiter aux 15 premières équipes pour la lisibilité
-        plot_data = ranking_df.head(15).copy()
-        bars = ax.barh(plot_data["Équipe"], plot_data["Score Final"], color='forestgreen')
-        
-        # Ajouter les valeurs sur les barres
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(width + 0.1, bar.get_y() + bar.get_height()/2, f'{width:.2f}', ha='left', va='center')
-        
-        ax.set_xlabel('Score Final (/20)')
-        ax.set_title('Top 15 des équipes par score final')
-        ax.grid(axis='x', linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        
-        st.pyplot(fig)
+        plot_data = ranking_df.head(PLOTTED_TEAMS)
+        team_names = tuple(plot_data["Équipe"])
+        final_scores = tuple(plot_data["Score Final"])
+        collective_scores = tuple(plot_data["Score Collectif"])
+        individual_scores = tuple(plot_data["Score Individuel Moyen"])
     
-    with col_viz2:
-        # Graphique comparatif des scores collectifs vs individuels
-        fig, ax = plt.subplots(figsize=(10, 8))
-        
-        plot_data = ranking_df.head(15).copy()
-        x = np.arange(len(plot_data["Équipe"]))
-        width = 0.35
-        
-        bar1 = ax.bar(x - width/2, plot_data["Score Collectif"], width, label='Score Collectif', color='royalblue')
-        bar2 = ax.bar(x + width/2, plot_data["Score Individuel Moyen"], width, label='Score Individuel Moyen', color='darkorange')
-        
-        ax.set_xticks(x)
-        ax.set_xticklabels(plot_data["Équipe"], rotation=45, ha='right')
-        ax.legend()
-        ax.set_ylabel('Score (/20)')
-        ax.set_title('Comparaison des scores collectifs et individuels')
-        ax.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        
-        st.pyplot(fig)
+        col_viz1, col_viz2 = st.columns(2)
     
-    # Export des données
-    st.markdown("<div class='subtitle'>Exporter les données</div>", unsafe_allow_html=True)
+        with col_viz1, section("onglet 2 : graphiques"):
+            # Graphique des scores finaux par équipe
+            if chart_backend == "plotly":
+                st.plotly_chart(charts.final_scores_plotly(team_names, final_scores), use_container_width=True)
+            else:
+                st.image(charts.final_scores_png(team_names, final_scores))
     
-    # Fonction pour créer un fichier CSV téléchargeable
-    def get_csv_download_link(df):
-        csv = df.to_csv(index=False)
-        b64 = BytesIO()
-        df.to_csv(b64, index=False)
-        b64.seek(0)
-        return b64.getvalue()
+        with col_viz2, section("onglet 2 : graphiques"):
+            # Graphique comparatif des scores collectifs vs individuels
+            if chart_backend == "plotly":
+                st.plotly_chart(charts.score_comparison_plotly(team_names, collective_scores, individual_scores), use_container_width=True)
+            else:
+                st.image(charts.score_comparison_png(team_names, collective_scores, individual_scores))
     
-    # Création d'un dataframe détaillé contenant les scores individuels
-    detailed_data = []
-    for i, team in enumerate(ranking_data):
-        # Créer une liste des noms et scores pour rester robuste face aux changements
-        individual_names = list(team['Détail Individuel'].keys())
-        individual_values = list(team['Détail Individuel'].values())
-        
-        # Utiliser une approche sécurisée pour accéder aux données
-        member0_name = individual_names[0] if len(individual_names) > 0 else "Membre"
-        member0_score = individual_values[0] if len(individual_values) > 0 else 0
-        
-        member1_name = individual_names[1] if len(individual_names) > 1 else "Membre"
-        member1_score = individual_values[1] if len(individual_values) > 1 else 0
-        
-        member2_name = individual_names[2] if len(individual_names) > 2 else "Membre"
-        member2_score = individual_values[2] if len(individual_values) > 2 else 0
-        
-        row_data = {
-            "Rang": i+1,
-            "Équipe": team["Équipe"],
-            "Score Collectif": team["Score Collectif"],
-            f"{member0_name} (Score)": member0_score,
-            f"{member1_name} (Score)": member1_score,
-            f"{member2_name} (Score)": member2_score,
-            "Score Individuel Moyen": team["Score Individuel Moyen"],
-            "Score Final": team["Score Final"]
-        }
-        detailed_data.append(row_data)
+    # Export des données
+    st.markdown("<div class='subtitle'>Exporter les données</div>", unsafe_allow_html=True)
     
-    detailed_df = pd.DataFrame(detailed_data)
-    export_data = get_csv_download_link(detailed_df)
-    st.download_button(
-        label="Télécharger le classement complet (CSV)",
-        data=export_data,
-        file_name="classement_hackathon.csv",
-        mime="text/csv"
-    )
+    render_exports(engine, leaderboard)
 
     # Gestion des évaluations (Sauvegarde/Chargement)
     st.markdown("<div class='subtitle'>Gestion des données d'évaluation</div>", unsafe_allow_html=True)
@@ -840,46 +847,240 @@ with tab2:
 
     with save_col1:
         if st.button("💾 Sauvegarder toutes les évaluations", key="save_button"):
+            engine = get_score_engine()
+            changes = sorted(engine.pop_changes())
             try:
-                filename, backup_filename = save_evaluations_to_csv(st.session_state.evaluations)
-                st.success(f"Évaluations sauvegardées dans {filename} et {backup_filename} !")
+                saved = journal.append([
+                    (team_name, member_name, criterion, engine.score(team_name, member_name, criterion))
+                    for team_name, member_name, criterion in changes
+                ])
+                st.success(f"{saved} note(s) modifiée(s) enregistrée(s) dans {journal.journal_file} !")
             except Exception as e:
+                # Garder les modifications pour la prochaine tentative
+                engine.changes.update(changes)
                 st.error(f"Erreur lors de la sauvegarde: {e}")
 
     with save_col2:
         if st.button("📂 Charger les évaluations sauvegardées", key="load_button"):
             try:
-                # Ne pas utiliser silent ici car l'utilisateur a explicitement demandé le chargement
-                loaded_evaluations = load_evaluations_from_csv(silent=False)
-                if loaded_evaluations:
-                    st.session_state.evaluations = loaded_evaluations
-                    st.success("Évaluations chargées avec succès !")
+                saved = journal.saved_scores()
+                if not saved:
+                    st.warning(f"Le fichier {journal.snapshot_file} n'a pas été trouvé ou est vide.")
+                else:
+                    # Chaque note sauvegardée ne remplace la note de la base que si celle-ci n'a pas
+                    # été modifiée depuis sa sauvegarde ; les autres sont présentées comme conflits.
+                    # Les critères jamais notés ne sont pas dans la sauvegarde.
+                    written, conflicts = store.import_saved(
+                        resolve_member_entries([(*key, *value) for key, value in saved.items()]), judge=judge_name
+                    )
+                    st.session_state.load_conflicts = conflicts
+                    reload_evaluations()
+                    st.toast(f"✅ {written} note(s) chargée(s) depuis la sauvegarde")
                     st.rerun()  # Recharger la page pour mettre à jour les widgets
             except Exception as e:
                 st.error(f"Erreur lors du chargement: {e}")
 
-    st.info("Les évaluations sont sauvegardées dans un fichier CSV qui peut être ouvert avec Excel ou tout autre tableur. Une copie de sauvegarde datée est également créée à chaque sauvegarde.")
+    render_load_conflicts()
+
+    st.info(f"Chaque note saisie est enregistrée immédiatement dans la base partagée {store.path} et visible par les autres jurys. Chaque sauvegarde ajoute uniquement les notes modifiées au journal {journal.journal_file}. Toutes les {journal.compact_every} notes, le journal est intégré au fichier {journal.snapshot_file} (une ligne par note, lisible avec Excel ou tout autre tableur).")
 
     # Messages d'information
     st.info("Les 10 équipes avec le meilleur score final seront qualifiées pour le hackathon HACKVERSE 2025.")
     
-    # Explication de la formule de calcul
+    # Explication de la formule de calcul, tirée de la grille d'évaluation
     with st.expander("Comment le score final est-il calculé ?"):
-        st.markdown("""
+        st.markdown(f"""
         La note finale de l'équipe est calculée selon la formule suivante :
         
         ```
-        Note équipe = (Note sur l'exercice collectif / 2) + (Somme des notes individuelles / 3) / 2
+        {RUBRIC.formula_text()}
         ```
         
-        **Exemple de calcul :**
-        - Note sur l'exercice collectif : 16/20
-        - Notes individuelles : 14/20, 18/20, 16/20
-        
-        ```
-        Note équipe = 16/2 + (14+18+16)/3/2 = 8 + 48/3/2 = 8 + 16/2 = 8 + 8 = 16/20
-        ```
+        - **{RUBRIC.collective.label}** : moyenne pondérée des critères collectifs, sur {SCALE}
+        - **{RUBRIC.individual.label}** : moyenne des scores individuels des membres (moyenne pondérée des critères individuels), sur {SCALE}
         """)
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    (group.title, criterion.label, criterion.weight, criterion.max_score)
+                    for group in (RUBRIC.collective, RUBRIC.individual)
+                    for criterion in group.criteria
+                ],
+                columns=["Groupe", "Critère", "Poids", "Note maximale"]
+            ),
+            hide_index=True
+        )
+
+with tab2, section("onglet 2 (classement)"):
+    render_ranking()
+
+# Doublons de personnes et d'équipes, recherchés une seule fois par roster
+@st.cache_resource
+def load_duplicates(fingerprint):
+    teams = load_roster(fingerprint)
+    records = person_records(teams)
+    people_groups = find_duplicate_people(records)
+    return records, people_groups, find_duplicate_teams(teams, records, people_groups)
+
+# Après une fusion : roster relu (nouvelle clé de cache) et évaluations rechargées depuis la base
+def reload_after_merge(message):
+    reload_evaluations()
+    # Les suppressions n'avancent pas la séquence de la base : relire les clés orphelines
+    st.session_state.pop("orphan_keys", None)
+    st.toast(message)
+    st.rerun()
+
+# Clés de notes orphelines (membres non inscrits, jamais chargés dans les évaluations) et, pour
+# chacune, si elle porte une note non nulle. Lues dans la base (une ligne par clé de membre)
+# seulement quand elle a changé.
+def get_orphan_keys():
+    seq = store.latest_seq()
+    cached = st.session_state.get("orphan_keys")
+    if cached is None or cached["seq"] != seq or cached["roster"] != roster_key:
+        scored = {
+            (team, member): nonzero
+            for team, member, nonzero in store.scored_member_keys()
+            if (team, member) not in members
+        }
+        cached = {
+            "seq": seq,
+            "roster": roster_key,
+            "orphans": orphan_member_keys(teams_data, scored),
+            "scored": scored,
+        }
+        st.session_state.orphan_keys = cached
+    return cached["orphans"], cached["scored"]
+
+# Doublons : fusion des équipes et personnes inscrites plusieurs fois, nettoyage des clés de notes
+# orphelines. Les fusions sont à faire avant le début de la notation (les autres jurys doivent
+# recharger la page pour les voir).
+@st.fragment
+@measured("fragment : doublons")
+def render_duplicates():
+    records, people_groups, team_groups = load_duplicates(roster_key)
+    merges = load_merges()
+
+    st.markdown("<div class='subtitle'>Équipes en double</div>", unsafe_allow_html=True)
+    if not team_groups:
+        st.success("Aucune équipe en double détectée.")
+    for group_index, group in enumerate(team_groups):
+        names = [teams_data[item].name for item in group.items]
+        with st.container(border=True):
+            st.markdown(f"**{' / '.join(names)}** — {', '.join(group.reasons)}")
+            kept = st.selectbox("Équipe à conserver", names, key=f"dedup_team_{group_index}")
+            if st.button("Fusionner les équipes", key=f"dedup_team_merge_{group_index}"):
+                for name in names:
+                    if name != kept:
+                        store.move_scores(name, None, kept, judge=judge_name)
+                        merges["teams"][name] = kept
+                save_merges(merges)
+                reload_after_merge(f"✅ Équipes fusionnées dans {kept}")
+
+    st.markdown("<div class='subtitle'>Personnes en double</div>", unsafe_allow_html=True)
+    if not people_groups:
+        st.success("Aucune personne en double détectée.")
+    for group_index, group in enumerate(people_groups):
+        people = [records[item] for item in group.items]
+        with st.container(border=True):
+            st.markdown(f"{', '.join(group.reasons)} (similarité {group.score:.2f})")
+            st.dataframe(
+                pd.DataFrame(people, columns=["Équipe", "Nom", "Email", "Téléphone"]),
+                use_container_width=True, hide_index=True
+            )
+            names = list(dict.fromkeys(person.name for person in people))
+            if len(names) == 1:
+                st.caption("Même nom dans plusieurs équipes : fusionner les équipes si c'est une réinscription.")
+                continue
+            kept = st.selectbox("Nom à conserver", names, key=f"dedup_person_{group_index}")
+            # Les notes sont rangées sous l'identifiant du membre : seul le nom affiché change
+            if st.button("Unifier le nom", key=f"dedup_person_merge_{group_index}"):
+                for name in names:
+                    if name != kept:
+                        merges["members"][name] = kept
+                save_merges(merges)
+                reload_after_merge(f"✅ Nom unifié : {kept}")
+
+    st.markdown("<div class='subtitle'>Notes sous des clés de membres inconnues</div>", unsafe_allow_html=True)
+    orphans, scored = get_orphan_keys()
+    if not orphans:
+        st.success("Toutes les notes correspondent à des membres inscrits.")
+        return
+    # Les clés sans note non nulle peuvent être supprimées sans risque ; les autres sont à vérifier
+    cleanable = [orphan for orphan in orphans if orphan.target or not scored[orphan.team, orphan.member]]
+    st.dataframe(
+        pd.DataFrame([
+            {
+                "Équipe": orphan.team,
+                "Clé": orphan.member,
+                "Raison": orphan.reason,
+                "Action": f"déplacer vers {members.name(orphan.team, orphan.target)}" if orphan.target else ("à vérifier (notes non nulles)" if scored[orphan.team, orphan.member] else "supprimer"),
+            }
+            for orphan in orphans
+        ]),
+        use_container_width=True, hide_index=True
+    )
+    if cleanable and st.button(f"🧹 Nettoyer {len(cleanable)} clé(s)", key="dedup_orphans"):
+        for orphan in cleanable:
+            if orphan.target:
+                store.move_scores(orphan.team, orphan.member, orphan.team, orphan.target, judge=judge_name)
+            else:
+                store.delete_scores(orphan.team, orphan.member)
+        reload_after_merge(f"✅ {len(cleanable)} clé(s) nettoyée(s)")
+
+# Doublons et clés orphelines lus seulement si l'onglet est affiché
+with tab3, section("onglet 3 (doublons)"):
+    if tab_open(tab3):
+        render_duplicates()
 
 # Sauvegarder les évaluations dans la session
-st.session_state.evaluations = evaluations
\ No newline at end of file
+st.session_state.evaluations = evaluations
+
+# Panneau d'instrumentation : temps du premier rendu du processus, durées des sections de cette
+# exécution, historique des dernières exécutions de la session (complètes et de fragments, ces
+# dernières affichées à l'exécution complète suivante), exports JSON et cProfile
+def render_instrumentation_panel(run_profile, first_run):
+    with st.sidebar.expander("⏱️ Instrumentation"):
+        st.caption(f"Premier rendu (démarrage à froid) : {first_run['total_ms']:.0f} ms")
+        st.toggle("Mesurer les exécutions", key="instrumentation")
+        st.checkbox("Profil cProfile (ralentit l'exécution)", key="instrumentation_cprofile")
+        if run_profile is None:
+            st.caption("Activez la mesure : elle commence à l'exécution suivante.")
+            return
+        run_profile.stop()
+        history = run_profile.history
+        last_run = run_profile.summary()
+
+        st.metric("Dernière exécution", f"{last_run['total_ms']:.0f} ms")
+        st.caption(f"{last_run['widgets']} widget(s) créé(s)")
+        st.dataframe(
+            pd.DataFrame(list(last_run["sections_ms"].items()), columns=["Section", "ms"]),
+            use_container_width=True, hide_index=True
+        )
+        page_runs = history.runs_named(PAGE_RUN)
+        st.line_chart(pd.DataFrame({"Durée (ms)": [run["total_ms"] for run in page_runs]}), height=150)
+        fragment_runs = [run for run in history.runs if run["run"] != PAGE_RUN]
+        if fragment_runs:
+            st.caption("Exécutions seules des fragments")
+            st.dataframe(
+                pd.DataFrame([
+                    {"Fragment": run["run"], "ms": run["total_ms"], "Widgets": run["widgets"]}
+                    for run in fragment_runs[-10:]
+                ]),
+                use_container_width=True, hide_index=True
+            )
+        st.download_button(
+            "Exporter l'historique (JSON)", history.to_json(),
+            file_name="instrumentation.json", mime="application/json"
+        )
+        cprofile_dump = run_profile.cprofile_dump()
+        if cprofile_dump is not None:
+            st.download_button(
+                "Exporter le profil (cProfile)", cprofile_dump,
+                file_name="execution.prof", mime="application/octet-stream",
+                help="À ouvrir avec pstats ou snakeviz"
+            )
+            with st.popover("Fonctions les plus coûteuses"):
+                st.code(run_profile.cprofile_text())
+
+# Fin de la première exécution du processus : temps jusqu'au premier rendu
+render_instrumentation_panel(run_profile, record_first_run(run_started))
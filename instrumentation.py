@@ -0,0 +1,249 @@
+import cProfile
+import functools
+import io
+import json
+import logging
+import marshal
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# ------ INSTRUMENTATION DES EXÉCUTIONS ------
+# Mode optionnel pour comprendre où passe le temps d'une exécution du script Streamlit : chaque
+# section nommée est chronométrée, les widgets créés sont comptés, et les durées des dernières
+# exécutions sont gardées dans un historique glissant. Le profil cProfile d'une exécution peut
+# être exporté pour une analyse hors ligne (snakeviz, pstats).
+# Les exécutions seules d'un fragment sont mesurées à part (measured_fragment). Une exécution
+# interrompue (st.rerun, st.stop, exception) est terminée avant la suivante, et jamais laissée
+# avec le profileur actif.
+# Hors mode instrumenté, section() se réduit à une lecture de variable locale au thread, et aucune
+# fonction de Streamlit n'est modifiée : les fonctions de widgets, st.rerun et st.stop ne sont
+# enveloppées que tant qu'au moins une exécution est mesurée, puis remises en place.
+
+# Nombre d'exécutions gardées dans l'historique
+HISTORY_SIZE = 50
+
+# Fonctions de widgets Streamlit comptées
+WIDGET_FUNCTIONS = [
+    "button", "checkbox", "data_editor", "date_input", "download_button", "file_uploader",
+    "multiselect", "number_input", "radio", "select_slider", "selectbox", "slider",
+    "text_area", "text_input", "time_input", "toggle",
+]
+
+# Nom des exécutions complètes du script dans l'historique
+PAGE_RUN = "page"
+
+# Profileur de l'exécution en cours dans ce thread (chaque session Streamlit a son propre thread)
+_current = threading.local()
+
+logger = logging.getLogger(__name__)
+
+# Première exécution du script dans ce processus (démarrage à froid : imports des modules de
+# l'application, lecture du roster, premier rendu), mesurée qu'elle soit instrumentée ou non
+_first_run = {}
+_first_run_lock = threading.Lock()
+
+# Fonctions de Streamlit enveloppées pendant les exécutions mesurées : (propriétaire, nom) ->
+# fonction d'origine, et nombre d'exécutions mesurées en cours (toutes sessions confondues)
+_patched = {}
+_patch_users = 0
+_patch_lock = threading.Lock()
+
+
+# Mesure d'une exécution (complète ou d'un fragment), ajoutée à l'historique quand elle se termine
+class RunProfile:
+    def __init__(self, profile=False, name=PAGE_RUN, history=None):
+        self.name = name
+        self.history = history
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        # Durées cumulées par section, dans l'ordre de première apparition
+        self.sections = {}
+        self.widgets = 0
+        self.total = None
+        self.interrupted = False
+        self._profiler = cProfile.Profile() if profile else None
+        self._profiled = False
+        self._patching = False
+
+    def start(self):
+        # Une exécution précédente interrompue sans être terminée (exception, rerun demandé par
+        # Streamlit) : la terminer, un seul profileur pouvant être actif par thread
+        stale = current_profile()
+        if stale is not None:
+            stale.stop(interrupted=True)
+        _current.profile = self
+        _install_patches()
+        self._patching = True
+        if self._profiler is not None:
+            self._profiler.enable()
+        return self
+
+    # Terminer la mesure (une seule fois) ; retourne le résumé de l'exécution
+    def stop(self, interrupted=False):
+        if self._profiler is not None and not self._profiled:
+            self._profiler.disable()
+            self._profiler.create_stats()
+            self._profiled = True
+        if getattr(_current, "profile", None) is self:
+            _current.profile = None
+        if self._patching:
+            self._patching = False
+            _remove_patches()
+        if self.total is None:
+            self.total = time.perf_counter() - self._start
+            self.interrupted = interrupted
+            if self.history is not None:
+                self.history.record(self)
+        return self.summary()
+
+    def add(self, name, seconds):
+        self.sections[name] = self.sections.get(name, 0.0) + seconds
+
+    def summary(self):
+        return {
+            "run": self.name,
+            "interrupted": self.interrupted,
+            "started_at": self.started_at,
+            "total_ms": round(self.total * 1000, 2) if self.total is not None else None,
+            "widgets": self.widgets,
+            "sections_ms": {name: round(seconds * 1000, 2) for name, seconds in self.sections.items()},
+        }
+
+    # Profil cProfile au format de pstats.dump_stats (None si le profilage n'était pas activé)
+    def cprofile_dump(self):
+        if not self._profiled:
+            return None
+        return marshal.dumps(self._profiler.stats)
+
+    # Fonctions les plus coûteuses (temps cumulé), en texte
+    def cprofile_text(self, limit=25):
+        if not self._profiled:
+            return ""
+        output = io.StringIO()
+        pstats.Stats(self._profiler, stream=output).sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+
+# Historique glissant des exécutions mesurées d'une session
+class RunHistory:
+    def __init__(self, size=HISTORY_SIZE):
+        self.runs = deque(maxlen=size)
+        self.last_profile = None
+
+    # Ajouter une exécution terminée (appelé par RunProfile.stop)
+    def record(self, profile):
+        self.runs.append(profile.summary())
+        self.last_profile = profile
+
+    # Dernières exécutions d'un nom donné (PAGE_RUN ou nom d'un fragment), de la plus ancienne à la
+    # plus récente
+    def runs_named(self, name):
+        return [run for run in self.runs if run["run"] == name]
+
+    def to_json(self):
+        return json.dumps(list(self.runs), ensure_ascii=False, indent=2)
+
+
+# Enregistrer la durée de la première exécution du processus (started : time.perf_counter() au
+# début du script) ; les exécutions suivantes ne la modifient pas. Retourne la mesure.
+def record_first_run(started):
+    with _first_run_lock:
+        if not _first_run:
+            _first_run.update(total_ms=round((time.perf_counter() - started) * 1000, 2), finished_at=time.time())
+            logger.info("Premier rendu en %.0f ms", _first_run["total_ms"])
+        return dict(_first_run)
+
+def current_profile():
+    return getattr(_current, "profile", None)
+
+# Chronométrer une section nommée de l'exécution en cours (sans effet hors mode instrumenté)
+@contextmanager
+def section(name):
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - start)
+
+# Mesurer chaque exécution d'un fragment (décorateur placé sous @st.fragment). Pendant une
+# exécution complète du script, le fragment est une section de cette exécution ; exécuté seul, il
+# a sa propre mesure, terminée même si le fragment est interrompu. options() retourne None hors
+# mode instrumenté, sinon (profil cProfile activé, historique) ; fragment_only() indique si
+# l'exécution en cours ne concerne que des fragments.
+def measured_fragment(name, options, fragment_only):
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            settings = options() if fragment_only() else None
+            if settings is None:
+                with section(name):
+                    return function(*args, **kwargs)
+            profile = RunProfile(settings[0], name=name, history=settings[1]).start()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile.stop()
+        return wrapper
+    return decorate
+
+# Terminer la mesure de l'exécution en cours avant qu'elle soit interrompue
+def stop_current_run():
+    profile = current_profile()
+    if profile is not None:
+        profile.stop(interrupted=True)
+
+# Envelopper une fonction (before est appelé avant chaque appel) ; l'originale est gardée dans
+# _patched pour être remise en place
+def _wrap(owner, name, before):
+    function = getattr(owner, name, None)
+    if function is None or (owner, name) in _patched:
+        return
+
+    def wrapped(*args, _function=function, **kwargs):
+        before()
+        return _function(*args, **kwargs)
+
+    _patched[owner, name] = function
+    setattr(owner, name, functools.wraps(function)(wrapped))
+
+def _count_widget():
+    profile = current_profile()
+    if profile is not None:
+        profile.widgets += 1
+
+# Compter les widgets créés, quel que soit le conteneur (st.x, st.sidebar.x, colonnes, onglets) :
+# les méthodes de DeltaGenerator sont enveloppées, ainsi que les raccourcis du module streamlit
+# (liés au conteneur principal à l'import). Les fonctions st.rerun et st.stop terminent la mesure
+# de l'exécution avant de l'interrompre. Appelé au début de chaque exécution mesurée.
+def _install_patches():
+    global _patch_users
+    import streamlit as st
+    from streamlit.delta_generator import DeltaGenerator
+
+    with _patch_lock:
+        _patch_users += 1
+        if _patch_users > 1:
+            return
+        for name in WIDGET_FUNCTIONS:
+            _wrap(DeltaGenerator, name, _count_widget)
+            _wrap(st, name, _count_widget)
+        for name in ["rerun", "stop"]:
+            _wrap(st, name, stop_current_run)
+
+# Remettre les fonctions d'origine quand plus aucune exécution n'est mesurée
+def _remove_patches():
+    global _patch_users
+    with _patch_lock:
+        _patch_users -= 1
+        if _patch_users > 0:
+            return
+        for (owner, name), function in _patched.items():
+            setattr(owner, name, function)
+        _patched.clear()
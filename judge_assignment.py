@@ -0,0 +1,142 @@
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from team_search import normalize
+
+# ------ RÉPARTITION DES ÉQUIPES ENTRE LES JURYS ------
+# Chaque équipe est attribuée à "overlap" jurys différents (overlap = 2 pour une double correction),
+# en équilibrant le nombre d'équipes par jury et en évitant les conflits d'intérêts : un jury ne
+# note pas une équipe dont le chef d'équipe est de son département (et de son niveau, si le jury
+# en déclare un). Les équipes ayant le moins de jurys possibles sont placées en premier, chacune
+# chez les jurys les moins chargés. La répartition est déterministe : elle ne change pas tant que
+# le roster et la liste des jurys ne changent pas.
+#
+# Les jurys sont décrits dans JUDGES_FILE (sans ce fichier, chaque jury voit toutes les équipes) :
+#   {"overlap": 2,
+#    "judges": [{"name": "Dr Ngono", "department": "Informatique", "level": "Niveau 3"},
+#               {"name": "M. Fotso"}]}
+
+JUDGES_FILE = "judges.json"
+
+Judge = namedtuple("Judge", ["name", "department", "level"])
+
+
+# Fonction pour lire la liste des jurys (ValueError si la description est invalide)
+def parse_judges(data):
+    judges = [
+        Judge(
+            name=str(item["name"]).strip(),
+            department=str(item.get("department") or "").strip(),
+            level=str(item.get("level") or "").strip(),
+        )
+        for item in data.get("judges", [])
+    ]
+    if not judges:
+        raise ValueError("Jurys : aucun jury")
+    names = [normalize(judge.name) for judge in judges]
+    if "" in names:
+        raise ValueError("Jurys : nom de jury vide")
+    duplicated = sorted({judge.name for judge, name in zip(judges, names) if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Jurys : jurys en double : {', '.join(duplicated)}")
+    overlap = data.get("overlap", 1)
+    if not isinstance(overlap, int) or not 1 <= overlap <= len(judges):
+        raise ValueError(f"Jurys : overlap doit être un entier entre 1 et {len(judges)}")
+    return judges, overlap
+
+# Jurys et nombre de jurys par équipe ; None si le fichier n'existe pas
+def load_judges(filename=JUDGES_FILE):
+    if not os.path.exists(filename):
+        return None
+    with open(filename, encoding="utf-8") as f:
+        return parse_judges(json.load(f))
+
+
+# Chef d'équipe (None si l'emplacement leader n'est pas rempli)
+def team_leader(team):
+    if team.members and team.members[0].slot == "leader":
+        return team.members[0]
+    return None
+
+# Matrice (équipes, jurys) des conflits d'intérêts : même département que le chef d'équipe, et
+# même niveau si le jury en a déclaré un
+def conflict_matrix(teams, judges):
+    leaders = [team_leader(team) for team in teams]
+    departments = np.array([normalize(leader.department) if leader else "" for leader in leaders], dtype=object)
+    levels = np.array([normalize(leader.level) if leader else "" for leader in leaders], dtype=object)
+    conflicts = np.zeros((len(teams), len(judges)), dtype=bool)
+    for j, judge in enumerate(judges):
+        department = normalize(judge.department)
+        if not department:
+            continue
+        same = departments == department
+        level = normalize(judge.level)
+        if level:
+            same &= levels == level
+        conflicts[:, j] = same
+    return conflicts
+
+
+# Répartition calculée : équipes (indices dans le roster) de chaque jury et jurys de chaque équipe
+class JudgeSchedule:
+    def __init__(self, judges, team_names, team_judges, overlap):
+        self.judges = judges
+        self.team_names = team_names
+        self.overlap = overlap
+        # Jurys de chaque équipe (indices), équipes de chaque jury dans l'ordre du roster
+        self.team_judges = team_judges
+        self.judge_teams = [[] for _ in judges]
+        for team_index, judge_indices in enumerate(team_judges):
+            for judge_index in judge_indices:
+                self.judge_teams[judge_index].append(team_index)
+        self._by_name = {normalize(judge.name): j for j, judge in enumerate(judges)}
+
+    # Jury correspondant à un nom saisi (casse et accents ignorés) ; None s'il n'est pas listé
+    def judge(self, name):
+        index = self._by_name.get(normalize(name))
+        return None if index is None else self.judges[index]
+
+    # Indices des équipes attribuées à un jury (None si le jury n'est pas listé)
+    def teams_for(self, name):
+        index = self._by_name.get(normalize(name))
+        return None if index is None else self.judge_teams[index]
+
+    def loads(self):
+        return [len(teams) for teams in self.judge_teams]
+
+    # Équipes ayant moins de jurys que prévu (conflits d'intérêts) : (équipe, jurys manquants)
+    def shortfalls(self):
+        return [
+            (self.team_names[team_index], self.overlap - len(judge_indices))
+            for team_index, judge_indices in enumerate(self.team_judges)
+            if len(judge_indices) < self.overlap
+        ]
+
+    # Tableau (jury, équipe) de la répartition, pour l'export
+    def to_frame(self):
+        rows = [
+            (judge.name, self.team_names[team_index])
+            for judge, team_indices in zip(self.judges, self.judge_teams)
+            for team_index in team_indices
+        ]
+        return pd.DataFrame(rows, columns=["Jury", "Équipe"])
+
+
+# Fonction pour répartir les équipes entre les jurys : chaque équipe reçoit overlap jurys sans
+# conflit d'intérêts, choisis parmi les moins chargés (le premier jury listé en cas d'égalité)
+def assign_teams(teams, judges, overlap=1):
+    conflicts = conflict_matrix(teams, judges)
+    loads = np.zeros(len(judges), dtype=np.int64)
+    team_judges = [()] * len(teams)
+    # Équipes les plus contraintes d'abord (moins de jurys possibles), puis ordre du roster
+    order = np.argsort((~conflicts).sum(axis=1), kind="stable")
+    for team_index in order.tolist():
+        eligible = np.flatnonzero(~conflicts[team_index])
+        chosen = eligible[np.argsort(loads[eligible], kind="stable")[:overlap]]
+        loads[chosen] += 1
+        team_judges[team_index] = tuple(sorted(chosen.tolist()))
+    return JudgeSchedule(judges, [team.name for team in teams], team_judges, overlap)
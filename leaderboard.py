@@ -0,0 +1,109 @@
+from bisect import bisect_left, insort
+
+import pandas as pd
+
+from evaluation_model import RUBRIC
+from roster import member_keys, slot_label
+
+# ------ CLASSEMENT ------
+# Classement maintenu trié en permanence : une liste d'entrées (-score, ordre d'inscription, équipe)
+# mise à jour par recherche dichotomique à chaque changement de score. Le top-k, le rang d'une
+# équipe et le rang avec ex æquo s'obtiennent sans retrier toutes les équipes.
+
+
+class Leaderboard:
+    def __init__(self, team_names=(), scores=None):
+        scores = scores or {}
+        self._order = {}
+        self._scores = {}
+        self._entries = []
+        for team_name in team_names:
+            self._order[team_name] = len(self._order)
+            self._scores[team_name] = float(scores.get(team_name, 0.0))
+        self._entries = sorted(
+            (-score, self._order[team_name], team_name) for team_name, score in self._scores.items()
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, team_name):
+        return team_name in self._scores
+
+    # Mettre à jour le score d'une équipe (les équipes inconnues sont ajoutées en fin d'ordre)
+    def update(self, team_name, score):
+        score = float(score)
+        if team_name in self._scores:
+            old_score = self._scores[team_name]
+            if old_score == score:
+                return
+            entry = (-old_score, self._order[team_name], team_name)
+            del self._entries[bisect_left(self._entries, entry)]
+        else:
+            self._order[team_name] = len(self._order)
+        self._scores[team_name] = score
+        insort(self._entries, (-score, self._order[team_name], team_name))
+
+    def score_of(self, team_name):
+        return self._scores[team_name]
+
+    # Position de l'équipe (1 = premier), ex æquo départagés par l'ordre d'inscription
+    def position_of(self, team_name):
+        entry = (-self._scores[team_name], self._order[team_name], team_name)
+        return bisect_left(self._entries, entry) + 1
+
+    # Rang avec ex æquo (classement "1, 2, 2, 4") : nombre d'équipes strictement devant + 1
+    def rank_of(self, team_name):
+        return bisect_left(self._entries, (-self._scores[team_name],)) + 1
+
+    # Les k premières équipes : liste de (rang avec ex æquo, équipe, score)
+    def top(self, k=None):
+        entries = self._entries if k is None else self._entries[:k]
+        ranked = []
+        for position, (negative_score, _, team_name) in enumerate(entries, start=1):
+            if ranked and ranked[-1][2] == -negative_score:
+                rank = ranked[-1][0]
+            else:
+                rank = position
+            ranked.append((rank, team_name, -negative_score))
+        return ranked
+
+
+RANKING_COLUMNS = ["Rang", "Équipe", "Score Collectif", "Score Individuel Moyen", "Score Final"]
+
+# Colonnes de l'export détaillé : les critères collectifs de la grille, puis le nom et le score de
+# chaque emplacement de membre utilisé par le roster (chef d'équipe, membre 1, membre 2...), et non
+# une colonne par membre inscrit
+def detailed_ranking_columns(slots):
+    return (
+        ["Rang", "Équipe"]
+        + [criterion.label for criterion in RUBRIC.collective.criteria]
+        + ["Score Collectif"]
+        + [column for slot in slots for column in (slot_label(slot), f"{slot_label(slot)} (Score)")]
+        + ["Score Individuel Moyen", "Score Final"]
+    )
+
+# Tableau du classement général affiché (une ligne par équipe)
+def ranking_frame(engine, leaderboard):
+    rows = []
+    for rank, team_name, final_score in leaderboard.top():
+        summary = engine.team_summary(team_name)
+        rows.append((rank, team_name, summary["collective"], summary["individual_average"], final_score))
+    return pd.DataFrame(rows, columns=RANKING_COLUMNS)
+
+# Lignes de l'export détaillé, dans l'ordre du classement (générées à la demande). Les emplacements
+# sans membre dans une équipe restent vides ; la moyenne individuelle porte sur les seuls membres inscrits.
+def detailed_ranking_rows(engine, leaderboard, teams, slots):
+    teams_by_name = {team.name: team for team in teams}
+    positions = {slot: i for i, slot in enumerate(slots)}
+    for rank, team_name, final_score in leaderboard.top():
+        summary = engine.team_summary(team_name)
+        team = teams_by_name[team_name]
+        members = ["", float("nan")] * len(slots)
+        for member, (member_id, member_name) in zip(team.members, member_keys(team)):
+            position = 2 * positions[member.slot]
+            members[position:position + 2] = [member_name, summary["individual"].get(member_id, 0.0)]
+        yield [
+            rank, team_name, *engine.evaluations[team_name]["collective"].values.tolist(), summary["collective"],
+            *members, summary["individual_average"], final_score,
+        ]
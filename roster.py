@@ -0,0 +1,360 @@
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import warnings
+from collections import defaultdict, namedtuple
+from dataclasses import dataclass
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# ------ MODÈLE DES INSCRIPTIONS ------
+# Représentation compacte et immuable des équipes inscrites (data.csv). Elle est construite une
+# seule fois par contenu de fichier et peut donc être partagée entre toutes les sessions.
+
+DATA_FILE = "data.csv"
+
+# Nombre de lignes de data.csv lues à la fois
+CHUNK_SIZE = 5000
+
+
+@dataclass(frozen=True, slots=True)
+class Member:
+    # Groupe de colonnes de data.csv d'où vient le membre (leader, member1, member2...)
+    slot: str = ""
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    cycle: str = ""
+    level: str = ""
+    department: str = ""
+    github: str = ""
+    experience: str = ""
+    frontend_skill: str = ""
+    backend_skill: str = ""
+    database_skill: str = ""
+    devops_skill: str = ""
+    languages: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class Team:
+    name: str
+    description: str = ""
+    timestamp: str = ""
+    # Membres inscrits, chef d'équipe en premier (les emplacements vides ne sont pas gardés)
+    members: tuple = ()
+    projects: str = ""
+    previous_hackathons: str = ""
+    how_heard: str = ""
+    special_needs: str = ""
+
+
+# Colonnes de data.csv pour chaque champ d'un membre (le préfixe leader_/member1_/member2_... est ajouté)
+MEMBER_FIELDS = {
+    "name": "name",
+    "email": "email",
+    "phone": "phone",
+    "cycle": "cycle",
+    "level": "level",
+    "department": "department",
+    "github": "github",
+    "experience": "experience",
+    "frontend_skill": "frontend",
+    "backend_skill": "backend",
+    "database_skill": "database",
+    "devops_skill": "devops",
+    "languages": "languages",
+}
+
+TEAM_FIELDS = {
+    "description": "team_description",
+    "timestamp": "timestamp",
+    "projects": "team_projects",
+    "previous_hackathons": "previous_hackathons",
+    "how_heard": "how_heard",
+    "special_needs": "special_needs",
+}
+
+# Groupes de colonnes d'un membre : leader_* pour le chef d'équipe, memberN_* pour les autres. Les
+# groupes présents dans data.csv sont découverts à la lecture : une équipe peut avoir 1 à N membres.
+MEMBER_PREFIX_PATTERN = re.compile(r"^(leader|member(\d+))_(?:" + "|".join(MEMBER_FIELDS.values()) + r")$")
+
+# Champs réellement utilisés par le tableau de bord (cartes, recherche, filtres, détection des
+# doublons). Les autres colonnes (projets, textes libres...) ne sont pas gardées en mémoire.
+LOADED_TEAM_FIELDS = ["description"]
+LOADED_MEMBER_FIELDS = ["name", "email", "phone", "github", "languages"]
+# Champs à peu de valeurs distinctes, stockés en catégories
+CATEGORY_MEMBER_FIELDS = ["cycle", "level", "department", "frontend_skill", "backend_skill", "database_skill", "devops_skill"]
+
+# Fonction pour découvrir les groupes de colonnes des membres, chef d'équipe puis member1, member2...
+def member_prefixes(columns):
+    prefixes = {}
+    for column in columns:
+        match = MEMBER_PREFIX_PATTERN.match(str(column))
+        if match:
+            prefix, number = match.groups()
+            prefixes[prefix] = -1 if number is None else int(number)
+    return sorted(prefixes, key=prefixes.get)
+
+# Types des colonnes gardées pour les groupes de membres présents (les colonnes non listées sont
+# lues en texte puis écartées)
+def loaded_columns(prefixes):
+    columns = {"team_name": "string"}
+    columns.update({TEAM_FIELDS[field]: "string" for field in LOADED_TEAM_FIELDS})
+    for prefix in prefixes:
+        columns.update({f"{prefix}_{MEMBER_FIELDS[field]}": "string" for field in LOADED_MEMBER_FIELDS})
+        columns.update({f"{prefix}_{MEMBER_FIELDS[field]}": "category" for field in CATEGORY_MEMBER_FIELDS})
+    return columns
+
+BAD_LINE_PATTERN = re.compile(r"Skipping line (\d+): expected (\d+) fields, saw (\d+)")
+
+
+# Fonction pour calculer l'empreinte du contenu d'un fichier (clé de cache du roster)
+def file_fingerprint(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Fonction pour convertir une cellule en texte (cellule vide -> "", 690065308.0 -> "690065308")
+def _clean(value):
+    if value is None or value is pd.NA or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+# Fonction pour extraire une colonne sous forme de liste de textes (colonne absente -> "")
+def _column(df, column):
+    if column not in df.columns:
+        return [""] * len(df)
+    return [_clean(value) for value in df[column].tolist()]
+
+# Fonction pour assembler les morceaux lus (les catégories de chaque morceau sont réunies ; une
+# colonne vide dans tout un morceau a des catégories sans type, ramenées au texte)
+def _concat_chunks(chunks, columns):
+    if not chunks:
+        return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in columns.items()})
+    data = {}
+    for column, dtype in columns.items():
+        if column not in chunks[0].columns:
+            continue
+        if dtype == "category":
+            data[column] = pd.Series(union_categoricals([
+                chunk[column].cat.set_categories(chunk[column].cat.categories.astype(str)) for chunk in chunks
+            ]))
+        else:
+            data[column] = pd.concat([chunk[column] for chunk in chunks], ignore_index=True)
+    return pd.DataFrame(data)
+
+# Lecture de data.csv par morceaux : seules les colonnes utilisées sont gardées, avec des types
+# explicites. Retourne (données, problèmes) : les lignes mal formées (nombre de champs incorrect)
+# et les inscriptions sans nom d'équipe sont signalées dans les problèmes au lieu d'être masquées.
+def read_registrations(path=DATA_FILE, chunksize=CHUNK_SIZE):
+    problems = []
+    chunks = []
+    row_count = 0
+    # Groupes de colonnes des membres, découverts une fois dans l'en-tête
+    columns = loaded_columns(member_prefixes(pd.read_csv(path, nrows=0).columns))
+    # Toutes les colonnes sont lues (usecols accepterait sans rien dire une ligne avec trop de
+    # champs), puis chaque morceau est réduit aux colonnes utilisées
+    dtypes = defaultdict(lambda: "string", columns)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", pd.errors.ParserWarning)
+        for chunk in pd.read_csv(path, dtype=dtypes, chunksize=chunksize, on_bad_lines="warn"):
+            if "team_name" not in chunk.columns:
+                raise ValueError(f"Colonne team_name absente de {path}")
+            chunk = chunk[[column for column in columns if column in chunk.columns]]
+            for position in chunk.index[chunk["team_name"].fillna("").str.strip() == ""]:
+                problems.append(f"Inscription n°{position + 1} : nom d'équipe manquant (affichée comme Équipe_{position})")
+            row_count += len(chunk)
+            chunks.append(chunk)
+    for warning in caught:
+        for line in str(warning.message).splitlines():
+            match = BAD_LINE_PATTERN.match(line.strip())
+            if match:
+                line_number, expected, found = match.groups()
+                problems.append(f"Ligne {line_number} ignorée : {expected} champs attendus, {found} trouvés")
+            elif line.strip():
+                problems.append(line.strip())
+    return _concat_chunks(chunks, columns), problems
+
+def _members(df, prefix):
+    columns = [_column(df, f"{prefix}_{column}") for column in MEMBER_FIELDS.values()]
+    fields = list(MEMBER_FIELDS)
+    return [Member(prefix, **dict(zip(fields, values))) for values in zip(*columns)]
+
+# Un emplacement est occupé si le nom ou l'email du membre est renseigné
+def _is_registered(member):
+    return bool(member.name.strip() or member.email.strip())
+
+# Rôle affiché d'un emplacement : "Chef d'équipe" (leader), "Membre N" (memberN)
+def slot_label(slot):
+    if slot == "leader":
+        return "Chef d'équipe"
+    match = re.fullmatch(r"member(\d+)", slot)
+    return f"Membre {match.group(1)}" if match else slot
+
+# Noms affichés des membres d'une équipe (rôle si la case du nom est vide)
+def member_names(team):
+    return [member.name if member.name else slot_label(member.slot) for member in team.members]
+
+# Identifiants des membres d'une équipe, clés de leurs évaluations. Un membre est identifié par
+# l'empreinte de son email : ses notes le suivent si son nom est corrigé ou si les inscriptions
+# sont réordonnées. Sans email (ou avec l'email d'un coéquipier), son emplacement sert d'identifiant.
+def member_ids(team):
+    ids = []
+    for member in team.members:
+        email = member.email.strip().lower()
+        member_id = f"email:{hashlib.blake2b(email.encode('utf-8'), digest_size=6).hexdigest()}" if email else ""
+        ids.append(member_id if member_id and member_id not in ids else f"slot:{member.slot}")
+    return ids
+
+# Paires (identifiant, nom affiché) des membres d'une équipe
+def member_keys(team):
+    return list(zip(member_ids(team), member_names(team)))
+
+# Forme d'un nom après l'aller-retour par l'ancien format large (espaces -> "_", points et virgules
+# supprimés, puis "_" -> espace), sans les espaces de début et de fin (cellules de tableur rognées)
+def legacy_member_key(name):
+    return name.replace(".", "").replace(",", "").replace("_", " ").strip()
+
+
+# Table des membres inscrits, construite une fois par roster : (équipe, identifiant) -> nom affiché,
+# et (équipe, nom) -> identifiant pour reprendre les notes des anciennes sauvegardes (clés par nom).
+class MemberDirectory:
+    def __init__(self, teams):
+        self._names = {}
+        self._ids_by_name = {}
+        self._team_ids = {}
+        for team in teams:
+            keys = member_keys(team)
+            self._team_ids[team.name] = [member_id for member_id, _ in keys]
+            for member_id, name in keys:
+                self._names[team.name, member_id] = name
+                self._ids_by_name.setdefault((team.name, name), member_id)
+            for member_id, name in keys:
+                self._ids_by_name.setdefault((team.name, legacy_member_key(name)), member_id)
+
+    def __contains__(self, key):
+        return key in self._names
+
+    # Identifiants des membres d'une équipe (liste vide pour une équipe inconnue)
+    def ids(self, team_name):
+        return self._team_ids.get(team_name, [])
+
+    # Nom affiché d'un membre (la clé elle-même si elle ne correspond à aucun membre inscrit)
+    def name(self, team_name, member_id):
+        return self._names.get((team_name, member_id), member_id)
+
+    # Identifiant correspondant à une clé de membre : identifiant, nom affiché ou nom issu de
+    # l'ancien format large. None si la clé ne correspond à aucun membre de l'équipe.
+    def resolve(self, team_name, key):
+        if (team_name, key) in self._names:
+            return key
+        member_id = self._ids_by_name.get((team_name, key))
+        if member_id is None:
+            member_id = self._ids_by_name.get((team_name, legacy_member_key(key)))
+        return member_id
+
+# Transformation des données en liste d'équipes, colonne par colonne (sans iterrows)
+def transform_data(df):
+    names = _column(df, "team_name")
+    # Assurer que le nom de l'équipe est valide (utiliser l'index si le nom est manquant)
+    names = [name if name else f"Équipe_{i}" for i, name in enumerate(names)]
+    # Le nom sert de clé aux évaluations : deux inscriptions homonymes sont distinguées
+    seen = {}
+    for i, name in enumerate(names):
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            names[i] = f"{name} ({seen[name]})"
+    team_columns = {field: _column(df, column) for field, column in TEAM_FIELDS.items()}
+    slots = [_members(df, prefix) for prefix in member_prefixes(df.columns)]
+
+    teams = []
+    for i, name in enumerate(names):
+        teams.append(Team(
+            name=name,
+            members=tuple(member for member in (slot[i] for slot in slots) if _is_registered(member)),
+            **{field: values[i] for field, values in team_columns.items()},
+        ))
+    return tuple(teams)
+
+# Emplacements utilisés par au moins une équipe, dans l'ordre des colonnes de data.csv
+def roster_slots(teams):
+    slots = {}
+    for team in teams:
+        for member in team.members:
+            slots.setdefault(member.slot, None)
+    return member_prefixes(f"{slot}_name" for slot in slots)
+
+
+# ------ INSTANTANÉ BINAIRE DU ROSTER ------
+# Le roster construit (équipes et problèmes de lecture) est enregistré en pickle à côté de
+# data.csv : un démarrage à froid le relit au lieu d'analyser le CSV avec pandas. L'instantané
+# porte la date et la taille de data.csv (vérifiées sans lire le fichier) et l'empreinte de son
+# contenu (vérifiée seulement si la date ou la taille a changé) ; il est reconstruit quand le
+# contenu change. Le fichier est écrit par l'application elle-même, dans son propre dossier.
+
+# Version du format de l'instantané (à incrémenter si Team ou Member changent)
+SNAPSHOT_VERSION = 1
+
+RosterSnapshot = namedtuple("RosterSnapshot", ["fingerprint", "teams", "problems"])
+
+def snapshot_file(path):
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.roster.pkl")
+
+# Fonction pour lire l'en-tête d'un instantané, puis le roster si check(en-tête) l'accepte. Un
+# instantané absent, illisible ou d'une autre version retourne (None, None).
+def _read_snapshot(filename, check):
+    try:
+        with open(filename, "rb") as f:
+            header = pickle.load(f)
+            if header.get("version") != SNAPSHOT_VERSION or not check(header):
+                return header, None
+            return header, pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, TypeError, ValueError):
+        return None, None
+
+# Écriture atomique de l'instantané ; un dossier en lecture seule n'empêche pas le chargement
+def _write_snapshot(filename, header, snapshot):
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filename) or ".", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, filename)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+# Roster de data.csv, relu de l'instantané s'il correspond au fichier, sinon construit avec
+# read_registrations + transform_data puis enregistré (FileNotFoundError si data.csv est absent)
+def load_roster_snapshot(path=DATA_FILE):
+    stat = os.stat(path)
+    filename = snapshot_file(path)
+    unchanged = lambda header: (header.get("mtime_ns"), header.get("size")) == (stat.st_mtime_ns, stat.st_size)
+    header, snapshot = _read_snapshot(filename, unchanged)
+    if snapshot is not None:
+        return snapshot
+
+    # Date ou taille différente : le contenu est comparé à l'empreinte enregistrée
+    fingerprint = file_fingerprint(path)
+    if header is not None and header.get("fingerprint") == fingerprint:
+        _, snapshot = _read_snapshot(filename, lambda header: True)
+    if snapshot is None:
+        df, problems = read_registrations(path)
+        snapshot = RosterSnapshot(fingerprint, transform_data(df), tuple(problems))
+    header = {"version": SNAPSHOT_VERSION, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "fingerprint": fingerprint}
+    _write_snapshot(filename, header, snapshot)
+    return snapshot
@@ -0,0 +1,177 @@
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+# ------ GRILLE D'ÉVALUATION ------
+# La grille (critères collectifs et individuels, poids, notes maximales, pondération du score
+# final) est décrite dans rubric.json et compilée une fois en un évaluateur NumPy. Les widgets de
+# saisie, les colonnes des sauvegardes, la validation des notes et le classement en sont dérivés.
+#
+# Formule appliquée :
+#   score d'un groupe = somme(poids * note / max) / somme(poids) * échelle
+#   score final = (poids collectif * score collectif + poids individuel * moyenne des membres)
+#                 / (poids collectif + poids individuel)
+# Tous les scores sont arrondis à "decimals" décimales.
+
+RUBRIC_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rubric.json")
+
+# Clés réservées aux totaux recalculés
+RESERVED_KEYS = {"totalScore", "finalScore"}
+
+Criterion = namedtuple("Criterion", ["key", "label", "weight", "max_score", "step"])
+ScoreGroup = namedtuple("ScoreGroup", ["title", "label", "weight", "criteria"])
+
+
+class Rubric:
+    def __init__(self, name, scale, decimals, collective, individual):
+        self.name = name
+        self.scale = float(scale)
+        self.decimals = int(decimals)
+        self.collective = collective
+        self.individual = individual
+
+    @property
+    def collective_keys(self):
+        return [criterion.key for criterion in self.collective.criteria]
+
+    @property
+    def individual_keys(self):
+        return [criterion.key for criterion in self.individual.criteria]
+
+    # Note maximale de chaque critère
+    @property
+    def max_scores(self):
+        return {criterion.key: criterion.max_score for criterion in self.collective.criteria + self.individual.criteria}
+
+    def evaluator(self):
+        return RubricEvaluator(self)
+
+    # Formule du score final en texte (explication affichée aux jurys)
+    def formula_text(self):
+        total_weight = self.collective.weight + self.individual.weight
+        return (
+            f"Note équipe = {self.collective.weight / total_weight:g} × {self.collective.label}"
+            f" + {self.individual.weight / total_weight:g} × {self.individual.label}"
+        )
+
+
+# Fonction pour lire un groupe de critères de la grille (ValueError si la description est invalide)
+def _parse_group(name, data, scale):
+    criteria = []
+    for item in data.get("criteria", []):
+        criterion = Criterion(
+            key=str(item["key"]),
+            label=str(item.get("label", item["key"])),
+            weight=float(item.get("weight", 1.0)),
+            max_score=float(item.get("max", scale)),
+            step=float(item.get("step", 1.0)),
+        )
+        if criterion.weight <= 0 or criterion.max_score <= 0:
+            raise ValueError(f"Grille : poids et note maximale de {criterion.key} doivent être positifs")
+        criteria.append(criterion)
+    if not criteria:
+        raise ValueError(f"Grille : aucun critère {name}")
+    weight = float(data.get("weight", 1.0))
+    if weight < 0:
+        raise ValueError(f"Grille : le poids du groupe {name} doit être positif ou nul")
+    return ScoreGroup(
+        title=str(data.get("title", name)),
+        label=str(data.get("label", name)),
+        weight=weight,
+        criteria=criteria,
+    )
+
+# Fonction pour construire une grille à partir de sa description (dictionnaire lu du JSON)
+def parse_rubric(data):
+    scale = float(data.get("scale", 20))
+    rubric = Rubric(
+        name=str(data.get("name", "")),
+        scale=scale,
+        decimals=data.get("decimals", 2),
+        collective=_parse_group("collective", data["collective"], scale),
+        individual=_parse_group("individual", data["individual"], scale),
+    )
+    keys = rubric.collective_keys + rubric.individual_keys
+    duplicated = sorted({key for key in keys if keys.count(key) > 1})
+    if duplicated:
+        raise ValueError(f"Grille : critères en double : {', '.join(duplicated)}")
+    reserved = sorted(RESERVED_KEYS & set(keys))
+    if reserved:
+        raise ValueError(f"Grille : noms de critère réservés : {', '.join(reserved)}")
+    if rubric.collective.weight + rubric.individual.weight <= 0:
+        raise ValueError("Grille : les poids du score final sont tous nuls")
+    return rubric
+
+def load_rubric(filename=RUBRIC_FILE):
+    with open(filename, encoding="utf-8") as f:
+        return parse_rubric(json.load(f))
+
+
+# Arrondi d'un vecteur identique à round() (utilisé pour une seule équipe) : np.round arrondit
+# valeur * 10**decimals, ce qui peut donner l'autre résultat sur une valeur à mi-chemin (10.525).
+# Seules ces valeurs sont réarrondies une à une.
+def round_scores(values, decimals):
+    rounded = np.round(values, decimals)
+    scaled = values * 10.0 ** decimals
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6).tolist():
+        rounded[i] = round(float(values[i]), decimals)
+    return rounded
+
+
+# Grille compilée : coefficients des critères (poids * échelle / max) et du score final. Un score
+# de groupe est un produit scalaire ; score_teams calcule toutes les équipes en une opération.
+class RubricEvaluator:
+    def __init__(self, rubric):
+        self.rubric = rubric
+        self.decimals = rubric.decimals
+        self.collective_weights = np.array(
+            [c.weight * rubric.scale / c.max_score for c in rubric.collective.criteria]
+        )
+        self.individual_weights = np.array(
+            [c.weight * rubric.scale / c.max_score for c in rubric.individual.criteria]
+        )
+        self.collective_weight_sum = sum(c.weight for c in rubric.collective.criteria)
+        self.individual_weight_sum = sum(c.weight for c in rubric.individual.criteria)
+        total_weight = rubric.collective.weight + rubric.individual.weight
+        self.collective_share = rubric.collective.weight / total_weight
+        self.individual_share = rubric.individual.weight / total_weight
+        # Versions en listes Python pour le calcul d'une seule équipe (plus rapide sur quelques valeurs)
+        self._collective_weights = self.collective_weights.tolist()
+        self._individual_weights = self.individual_weights.tolist()
+        # Coefficient de chaque critère (mise à jour incrémentale d'une somme pondérée)
+        self.weights = dict(zip(rubric.collective_keys, self._collective_weights))
+        self.weights.update(zip(rubric.individual_keys, self._individual_weights))
+
+    # Somme pondérée des notes collectives (avant division par la somme des poids)
+    def collective_sum(self, values):
+        return sum(weight * value for weight, value in zip(self._collective_weights, values))
+
+    def collective_total(self, weighted_sum):
+        return round(weighted_sum / self.collective_weight_sum, self.decimals)
+
+    def member_total(self, values):
+        weighted_sum = sum(weight * value for weight, value in zip(self._individual_weights, values))
+        return round(weighted_sum / self.individual_weight_sum, self.decimals)
+
+    def final_score(self, collective_total, individual_average):
+        return round(self.collective_share * collective_total + self.individual_share * individual_average, self.decimals)
+
+    # Scores de toutes les équipes en une opération matricielle :
+    #   collective : matrice (équipes, critères collectifs)
+    #   individual : matrice (membres, critères individuels), member_teams : équipe de chaque membre
+    # Retourne (scores collectifs, scores des membres, moyennes individuelles, scores finaux).
+    def score_teams(self, collective, individual, member_teams):
+        n_teams = len(collective)
+        collective_totals = round_scores(collective @ self.collective_weights / self.collective_weight_sum, self.decimals)
+        member_totals = round_scores(individual @ self.individual_weights / self.individual_weight_sum, self.decimals)
+        member_counts = np.bincount(member_teams, minlength=n_teams)
+        member_sums = np.bincount(member_teams, weights=member_totals, minlength=n_teams)
+        individual_averages = np.divide(
+            member_sums, member_counts, out=np.zeros(n_teams), where=member_counts > 0
+        )
+        final_scores = round_scores(
+            self.collective_share * collective_totals + self.individual_share * individual_averages, self.decimals
+        )
+        return collective_totals, member_totals, individual_averages, final_scores
@@ -0,0 +1,118 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from evaluation_model import CRITERION_MAX, MIN_SCORE
+from evaluation_storage import COLLECTIVE_CRITERIA, INDIVIDUAL_CRITERIA, LONG_FORMAT_COLUMNS, TEAM_LEVEL_MEMBER
+from roster import MemberDirectory, member_names
+
+# ------ IMPORT DE FEUILLES DE NOTES ------
+# Un jury peut saisir ses notes dans un tableur puis importer la feuille d'un coup. Deux formes
+# sont acceptées :
+#   - feuille de saisie : colonnes team_name, member_name puis une colonne par critère (une ligne
+#     par équipe pour les critères collectifs, une ligne par membre pour les critères individuels,
+#     cases vides ignorées) ;
+#   - format long des sauvegardes : team_name, member_name, criterion, score.
+# Toute la feuille est validée en une passe vectorisée ; les lignes en erreur sont signalées et
+# écartées, les autres sont importées.
+
+SCORE_CRITERIA = COLLECTIVE_CRITERIA + INDIVIDUAL_CRITERIA
+SHEET_COLUMNS = ["team_name", "member_name"] + SCORE_CRITERIA
+ERROR_COLUMNS = ["ligne", "team_name", "member_name", "criterion", "score", "erreur"]
+
+# Première ligne de données dans le tableur (ligne 1 = en-têtes)
+FIRST_DATA_ROW = 2
+
+
+# Fonction pour lire une feuille de notes CSV ou XLSX (toutes les cellules en texte)
+def read_score_sheet(file, filename=None):
+    filename = filename or getattr(file, "name", "")
+    if os.path.splitext(filename)[1].lower() in (".xlsx", ".xlsm"):
+        return pd.read_excel(file, dtype=str, engine="openpyxl")
+    return pd.read_csv(file, dtype=str, skipinitialspace=True)
+
+# Fonction pour ramener une feuille au format long (une note par ligne, numéro de ligne conservé)
+def sheet_to_long(df):
+    df = df.rename(columns=lambda column: str(column).strip())
+    if "team_name" not in df.columns:
+        raise ValueError("La feuille doit contenir une colonne team_name")
+    if "member_name" not in df.columns:
+        df = df.assign(member_name=TEAM_LEVEL_MEMBER)
+    df = df.assign(ligne=np.arange(len(df)) + FIRST_DATA_ROW)
+
+    if {"criterion", "score"} <= set(df.columns):
+        long_df = df[["ligne"] + LONG_FORMAT_COLUMNS]
+    else:
+        criteria = [column for column in df.columns if column in SCORE_CRITERIA]
+        if not criteria:
+            raise ValueError("Aucune colonne de critère reconnue dans la feuille")
+        long_df = df.melt(
+            id_vars=["ligne", "team_name", "member_name"], value_vars=criteria,
+            var_name="criterion", value_name="score"
+        )
+
+    long_df = long_df.copy()
+    for column in ["team_name", "member_name", "criterion"]:
+        long_df[column] = long_df[column].fillna("").astype(str).str.strip()
+    # Une case vide n'est pas une note
+    score_text = long_df["score"].astype(str).str.strip()
+    blank = long_df["score"].isna() | (score_text == "")
+    return long_df[~blank].sort_values(["ligne", "criterion"], kind="stable").reset_index(drop=True)
+
+# Valider toutes les notes d'une feuille en une passe. Retourne (notes valides, erreurs) :
+# les notes valides au format long (score en float, membre remplacé par son identifiant), les
+# erreurs avec la ligne du tableur. Un membre peut être désigné par son nom ou son identifiant.
+def validate_scores(long_df, teams):
+    scores = pd.to_numeric(long_df["score"].astype(str).str.replace(",", ".", regex=False).str.strip(), errors="coerce")
+    team_names = {team.name for team in teams}
+    directory = MemberDirectory(teams)
+    member_ids = pd.Series([
+        directory.resolve(team_name, member_name) if member_name != TEAM_LEVEL_MEMBER else TEAM_LEVEL_MEMBER
+        for team_name, member_name in zip(long_df["team_name"].tolist(), long_df["member_name"].tolist())
+    ], index=long_df.index, dtype=object)
+    # Un même membre peut apparaître sous son nom et sous son identifiant
+    resolved = long_df.assign(member_name=member_ids.fillna(long_df["member_name"]))
+    is_collective = long_df["criterion"].isin(COLLECTIVE_CRITERIA)
+    is_individual = long_df["criterion"].isin(INDIVIDUAL_CRITERIA)
+    is_team_level = long_df["member_name"] == TEAM_LEVEL_MEMBER
+    known_team = long_df["team_name"].isin(team_names)
+    # Note maximale du critère de chaque ligne (critères inconnus : pas de contrôle d'intervalle)
+    max_scores = long_df["criterion"].map(CRITERION_MAX).fillna(np.inf)
+
+    # Chaque règle : (lignes en erreur, message). L'ordre fixe l'ordre des messages.
+    rules = [
+        (~known_team, "équipe inconnue"),
+        (~(is_collective | is_individual), "critère inconnu"),
+        (scores.isna(), "note non numérique"),
+        (scores.notna() & ((scores < MIN_SCORE) | (scores > max_scores)), "note hors de l'intervalle autorisé"),
+        (is_collective & ~is_team_level, "critère collectif noté pour un membre"),
+        (is_individual & is_team_level, "critère individuel sans membre"),
+        (known_team & is_individual & ~is_team_level & member_ids.isna(), "membre inconnu dans cette équipe"),
+        (resolved.duplicated(["team_name", "member_name", "criterion"], keep=False), "note en double dans la feuille"),
+    ]
+    messages = pd.Series("", index=long_df.index)
+    for mask, message in rules:
+        mask = np.asarray(mask)
+        messages[mask] = messages[mask] + "; " + message
+    messages = messages.str.removeprefix("; ")
+    invalid = messages != ""
+
+    valid = long_df.loc[~invalid, LONG_FORMAT_COLUMNS].assign(
+        member_name=member_ids[~invalid], score=scores[~invalid].astype(float)
+    )
+    errors = long_df.loc[invalid].assign(erreur=messages[invalid])[ERROR_COLUMNS]
+    return valid.reset_index(drop=True), errors.reset_index(drop=True)
+
+# Fonction pour lire et valider une feuille de notes en une étape
+def load_score_sheet(file, teams, filename=None):
+    return validate_scores(sheet_to_long(read_score_sheet(file, filename)), teams)
+
+# Modèle de feuille de saisie : une ligne par équipe puis une ligne par membre
+def score_sheet_template(teams):
+    rows = []
+    for team in teams:
+        rows.append({"team_name": team.name, "member_name": TEAM_LEVEL_MEMBER})
+        for member_name in member_names(team):
+            rows.append({"team_name": team.name, "member_name": member_name})
+    return pd.DataFrame(rows, columns=SHEET_COLUMNS)
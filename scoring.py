@@ -0,0 +1,202 @@
+import numpy as np
+
+from evaluation_model import RUBRIC, TeamEvaluation, clamp_score, member_scores, validate_score
+
+# ------ CALCUL DES SCORES ------
+# Les scores suivent la grille d'évaluation (rubric.json), compilée une fois en évaluateur NumPy.
+
+EVALUATOR = RUBRIC.evaluator()
+
+# Fonction pour créer une évaluation vide pour une équipe
+def empty_team_evaluation():
+    return TeamEvaluation()
+
+# Fonction pour créer une évaluation vide pour un membre
+def empty_member_evaluation():
+    return member_scores()
+
+# Fonction pour calculer les scores finaux (recalcul complet d'une équipe)
+def calculate_final_score(evaluations, team_name):
+    team_eval = evaluations[team_name]
+
+    # Calculer le score collectif (moyenne pondérée des critères)
+    collective = team_eval["collective"]
+    collective["totalScore"] = EVALUATOR.collective_total(EVALUATOR.collective_sum(collective.values.tolist()))
+
+    # Calculer les scores individuels
+    for member, scores in team_eval["individual"].items():
+        scores["totalScore"] = EVALUATOR.member_total(scores.values.tolist())
+
+    # Calculer le score final de l'équipe selon la formule de la grille (par défaut :
+    # Note équipe = (Note sur l'exercice collectif / 2) + (Somme des notes individuelles / 3) / 2)
+    individual_scores = [member_scores["totalScore"] for member_scores in team_eval["individual"].values()]
+
+    # Vérifier si la liste des scores individuels n'est pas vide
+    if individual_scores:
+        individual_avg = sum(individual_scores) / len(individual_scores)
+    else:
+        individual_avg = 0.0
+
+    # Calculer le score final (les notes sont validées à l'écriture : jamais de NaN)
+    team_eval["finalScore"] = EVALUATOR.final_score(collective["totalScore"], individual_avg)
+
+    return team_eval
+
+
+# Moteur de scores incrémental. Il modifie le dictionnaire d'évaluations en place (les champs
+# totalScore/finalScore restent donc valides pour la sauvegarde) et garde, par équipe, la somme
+# des critères collectifs et la somme des scores individuels : une note modifiée met à jour les
+# totaux en O(1) au lieu de tout recalculer.
+class ScoreEngine:
+    def __init__(self, evaluations):
+        self.evaluations = evaluations
+        # Incrémenté à chaque note modifiée ; sert de clé de cache pour les affichages dérivés
+        self.version = 0
+        # Notes modifiées depuis le dernier appel à pop_changes() : (équipe, membre, critère)
+        self.changes = set()
+        self._collective_sums = {}
+        self._individual_sums = {}
+        # Fonctions appelées avec (équipe, score final) quand un score final est recalculé
+        self._listeners = []
+        self.recompute_all()
+
+    # Recalcul de toutes les équipes en une opération matricielle (chargement)
+    def recompute_all(self):
+        team_names = list(self.evaluations)
+        if not team_names:
+            return
+        team_evals = [self.evaluations[team_name] for team_name in team_names]
+        collective = np.array([team_eval.collective.values for team_eval in team_evals], dtype=np.float64)
+        members = [scores for team_eval in team_evals for scores in team_eval.individual.values()]
+        member_teams = np.repeat(np.arange(len(team_evals)), [len(team_eval.individual) for team_eval in team_evals])
+        individual = np.array([scores.values for scores in members], dtype=np.float64).reshape(
+            len(members), len(EVALUATOR.individual_weights)
+        )
+        collective_totals, member_totals, _, final_scores = EVALUATOR.score_teams(collective, individual, member_teams)
+
+        collective_sums = (collective @ EVALUATOR.collective_weights).tolist()
+        individual_sums = np.bincount(member_teams, weights=member_totals, minlength=len(team_evals)).tolist()
+        for scores, total in zip(members, member_totals.tolist()):
+            scores.total = total
+        rows = zip(team_names, team_evals, collective_totals.tolist(), final_scores.tolist(), collective_sums, individual_sums)
+        for team_name, team_eval, collective_total, final_score, collective_sum, individual_sum in rows:
+            team_eval.collective.total = collective_total
+            team_eval.finalScore = final_score
+            self._collective_sums[team_name] = collective_sum
+            self._individual_sums[team_name] = individual_sum
+        for team_name in team_names:
+            self._notify(team_name)
+
+    # Recalcul complet d'une équipe (ajout de membre)
+    def recompute_team(self, team_name):
+        team_eval = calculate_final_score(self.evaluations, team_name)
+        self._collective_sums[team_name] = EVALUATOR.collective_sum(team_eval["collective"].values.tolist())
+        self._individual_sums[team_name] = sum(
+            float(scores["totalScore"]) for scores in team_eval["individual"].values()
+        )
+        self._notify(team_name)
+        return team_eval
+
+    def ensure_team(self, team_name):
+        if team_name not in self.evaluations:
+            self.evaluations[team_name] = empty_team_evaluation()
+            self.recompute_team(team_name)
+        return self.evaluations[team_name]
+
+    def ensure_member(self, team_name, member_name):
+        team_eval = self.ensure_team(team_name)
+        if member_name not in team_eval["individual"]:
+            team_eval["individual"][member_name] = empty_member_evaluation()
+            self.recompute_team(team_name)
+            self.version += 1
+        return team_eval["individual"][member_name]
+
+    # Modifier une note collective ; retourne True si la valeur a changé.
+    # record=False pour une note déjà sauvegardée ailleurs (autre jury) : elle n'est pas ajoutée
+    # aux modifications à sauvegarder, et elle est ramenée dans l'intervalle de la grille au lieu
+    # d'être refusée (evaluation_model.clamp_score).
+    def set_collective(self, team_name, criterion, value, record=True):
+        team_eval = self.ensure_team(team_name)
+        value = validate_score(criterion, value) if record else clamp_score(criterion, value)
+        old_value = float(team_eval["collective"][criterion])
+        if value == old_value:
+            return False
+
+        team_eval["collective"][criterion] = value
+        self._collective_sums[team_name] = round(
+            self._collective_sums[team_name] + EVALUATOR.weights[criterion] * (value - old_value), 6
+        )
+        team_eval["collective"]["totalScore"] = EVALUATOR.collective_total(self._collective_sums[team_name])
+        self._update_final_score(team_name)
+        self._record_change(team_name, "", criterion, record)
+        return True
+
+    # Modifier une note individuelle ; retourne True si la valeur a changé
+    def set_individual(self, team_name, member_name, criterion, value, record=True):
+        member_eval = self.ensure_member(team_name, member_name)
+        value = validate_score(criterion, value) if record else clamp_score(criterion, value)
+        old_value = float(member_eval[criterion])
+        if value == old_value:
+            return False
+
+        member_eval[criterion] = value
+        old_total = float(member_eval["totalScore"])
+        member_eval["totalScore"] = EVALUATOR.member_total(member_eval.values.tolist())
+        self._individual_sums[team_name] = round(self._individual_sums[team_name] + member_eval["totalScore"] - old_total, 6)
+        self._update_final_score(team_name)
+        self._record_change(team_name, member_name, criterion, record)
+        return True
+
+    # Modifier une note, collective (membre vide) ou individuelle
+    def set_score(self, team_name, member_name, criterion, value, record=True):
+        if member_name == "":
+            return self.set_collective(team_name, criterion, value, record)
+        return self.set_individual(team_name, member_name, criterion, value, record)
+
+    # Valeur actuelle d'une note (membre vide pour les critères collectifs)
+    def score(self, team_name, member_name, criterion):
+        team_eval = self.evaluations[team_name]
+        if member_name == "":
+            return team_eval["collective"][criterion]
+        return team_eval["individual"][member_name][criterion]
+
+    # Moyenne des scores individuels d'une équipe
+    def individual_average(self, team_name):
+        member_count = len(self.evaluations[team_name]["individual"])
+        if member_count == 0:
+            return 0.0
+        return self._individual_sums[team_name] / member_count
+
+    # Résumé utilisé par les cartes d'équipe et le classement
+    def team_summary(self, team_name):
+        team_eval = self.ensure_team(team_name)
+        return {
+            "collective": team_eval["collective"]["totalScore"],
+            "individual_average": self.individual_average(team_name),
+            "individual": {member: scores["totalScore"] for member, scores in team_eval["individual"].items()},
+            "final": team_eval["finalScore"],
+        }
+
+    # S'abonner aux changements de score final (classement, notifications)
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    # Retourner et vider l'ensemble des notes modifiées
+    def pop_changes(self):
+        changes, self.changes = self.changes, set()
+        return changes
+
+    def _update_final_score(self, team_name):
+        team_eval = self.evaluations[team_name]
+        collective_score = float(team_eval["collective"]["totalScore"])
+        team_eval["finalScore"] = EVALUATOR.final_score(collective_score, self.individual_average(team_name))
+        self._notify(team_name)
+
+    def _notify(self, team_name):
+        for callback in self._listeners:
+            callback(team_name, self.evaluations[team_name]["finalScore"])
+
+    def _record_change(self, team_name, member_name, criterion, record=True):
+        self.version += 1
+        if record:
+            self.changes.add((team_name, member_name, criterion))
@@ -0,0 +1,177 @@
+import re
+import unicodedata
+from bisect import bisect_left
+
+# ------ INDEX DE RECHERCHE DES ÉQUIPES ------
+# Index construit une seule fois par roster : les textes sont normalisés (minuscules, sans accents),
+# découpés en mots, puis indexés par mot (recherche par préfixe via une liste triée) et par
+# trigramme (recherche de sous-chaîne). Une requête combine du texte libre et des filtres
+# "clé:valeur" comme "language:python" ou "level:3".
+
+# Poids de chaque champ dans le classement des résultats
+FIELD_WEIGHTS = {
+    "team": 8,
+    "member": 6,
+    "github": 4,
+    "email": 3,
+    "languages": 2,
+    "description": 1,
+}
+
+# Bonus selon la qualité de la correspondance d'un mot
+EXACT_MATCH, PREFIX_MATCH, SUBSTRING_MATCH = 3, 2, 1
+
+# Filtres "clé:valeur" acceptés et attribut Member correspondant
+FILTER_ALIASES = {
+    "language": "languages",
+    "lang": "languages",
+    "langage": "languages",
+    "level": "level",
+    "niveau": "level",
+    "cycle": "cycle",
+    "department": "department",
+    "departement": "department",
+    "dept": "department",
+    "frontend": "frontend_skill",
+    "backend": "backend_skill",
+    "database": "database_skill",
+    "devops": "devops_skill",
+}
+
+FILTER_PATTERN = re.compile(r"(\w+):(\S+)")
+
+# Mots ignorés (fragments d'URL ou d'adresse collés dans la recherche)
+STOP_WORDS = {"http", "https", "www", "github", "com", "gmail"}
+
+
+# Fonction pour normaliser un texte : minuscules, accents supprimés, ponctuation -> espace
+def normalize(text):
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r"[^0-9a-z]+", " ", text.lower()).strip()
+
+def tokenize(text):
+    return [token for token in normalize(text).split() if token not in STOP_WORDS]
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+# Fonction pour extraire l'identifiant GitHub d'une URL de profil
+def github_handle(url):
+    return url.rstrip("/").rsplit("/", 1)[-1] if url else ""
+
+def team_members(team):
+    return [member for member in team.members if member.name]
+
+
+class TeamSearchIndex:
+    def __init__(self, teams):
+        self.team_count = len(teams)
+        # mot -> {indice d'équipe: poids du meilleur champ}
+        self._postings = {}
+        # trigramme -> mots qui le contiennent
+        self._trigrams = {}
+        # facette -> mot -> indices d'équipes (pour les filtres)
+        self._facets = {field: {} for field in set(FILTER_ALIASES.values())}
+
+        for team_index, team in enumerate(teams):
+            self._add(team_index, team.name, FIELD_WEIGHTS["team"])
+            self._add(team_index, team.description, FIELD_WEIGHTS["description"])
+            for member in team_members(team):
+                self._add(team_index, member.name, FIELD_WEIGHTS["member"])
+                self._add(team_index, member.email.split("@")[0], FIELD_WEIGHTS["email"])
+                self._add(team_index, github_handle(member.github), FIELD_WEIGHTS["github"])
+                self._add(team_index, member.languages, FIELD_WEIGHTS["languages"])
+                for field, values in self._facets.items():
+                    for token in tokenize(getattr(member, field)):
+                        values.setdefault(token, set()).add(team_index)
+
+        self._vocabulary = sorted(self._postings)
+        for token in self._vocabulary:
+            for gram in trigrams(token):
+                self._trigrams.setdefault(gram, []).append(token)
+        self._facet_vocabularies = {field: sorted(values) for field, values in self._facets.items()}
+
+    def _add(self, team_index, text, weight):
+        for token in tokenize(text):
+            postings = self._postings.setdefault(token, {})
+            if postings.get(team_index, 0) < weight:
+                postings[team_index] = weight
+
+    # Mots du vocabulaire commençant par un préfixe (liste triée + recherche dichotomique)
+    @staticmethod
+    def _prefixed(vocabulary, prefix):
+        start = bisect_left(vocabulary, prefix)
+        end = bisect_left(vocabulary, prefix + "\uffff")
+        return vocabulary[start:end]
+
+    # Scores des équipes pour un mot de la requête : exact > préfixe > sous-chaîne
+    def _term_scores(self, term):
+        scores = {}
+
+        def merge(token, bonus):
+            for team_index, weight in self._postings[token].items():
+                score = weight * bonus
+                if scores.get(team_index, 0) < score:
+                    scores[team_index] = score
+
+        prefixed = self._prefixed(self._vocabulary, term)
+        for token in prefixed:
+            merge(token, EXACT_MATCH if token == term else PREFIX_MATCH)
+
+        if len(term) >= 3:
+            grams = sorted(trigrams(term), key=lambda gram: len(self._trigrams.get(gram, ())))
+            candidates = set(self._trigrams.get(grams[0], ()))
+            for gram in grams[1:]:
+                candidates.intersection_update(self._trigrams.get(gram, ()))
+                if not candidates:
+                    break
+            for token in candidates:
+                if term in token and not token.startswith(term):
+                    merge(token, SUBSTRING_MATCH)
+        return scores
+
+    def _filter(self, key, value):
+        field = FILTER_ALIASES.get(key)
+        if field is None:
+            return None
+        matches = None
+        for term in tokenize(value):
+            term_matches = set()
+            for token in self._prefixed(self._facet_vocabularies[field], term):
+                term_matches |= self._facets[field][token]
+            matches = term_matches if matches is None else matches & term_matches
+        return matches if matches is not None else set()
+
+    # Rechercher des équipes ; retourne les indices triés par pertinence (puis ordre d'inscription)
+    def search(self, query):
+        allowed = None
+
+        # Les filtres reconnus sont retirés du texte libre ; les autres "a:b" (URL...) restent du texte
+        def apply_filter(match):
+            nonlocal allowed
+            matches = self._filter(normalize(match.group(1)), match.group(2))
+            if matches is None:
+                return match.group(0)
+            allowed = matches if allowed is None else allowed & matches
+            return " "
+
+        free_text = FILTER_PATTERN.sub(apply_filter, query)
+
+        totals = None
+        for term in tokenize(free_text):
+            term_scores = self._term_scores(term)
+            if totals is None:
+                totals = term_scores
+            else:
+                totals = {team_index: totals[team_index] + score
+                          for team_index, score in term_scores.items() if team_index in totals}
+            if not totals:
+                return []
+
+        if totals is None:
+            candidates = range(self.team_count) if allowed is None else sorted(allowed)
+            return list(candidates)
+        if allowed is not None:
+            totals = {team_index: score for team_index, score in totals.items() if team_index in allowed}
+        return sorted(totals, key=lambda team_index: (-totals[team_index], team_index))
@@ -0,0 +1,165 @@
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from team_search import team_members
+
+# ------ MATRICE DES COMPÉTENCES ------
+# Les compétences déclarées à l'inscription sont encodées une seule fois par roster dans des
+# tableaux NumPy denses : niveaux ordinaux (équipe x membre x domaine) et langages en multi-hot
+# (équipe x membre x langage). Les agrégats par équipe (niveau max/moyen par domaine, couverture,
+# langages) sont calculés pour toutes les équipes à la fois ; filtrer et trier des centaines
+# d'équipes revient alors à quelques opérations sur des tableaux.
+
+# Domaines de compétence et attribut Member correspondant
+SKILL_AREAS = {
+    "frontend": "frontend_skill",
+    "backend": "backend_skill",
+    "database": "database_skill",
+    "devops": "devops_skill",
+}
+
+SKILL_AREA_LABELS = {
+    "frontend": "Frontend",
+    "backend": "Backend",
+    "database": "Base de données",
+    "devops": "DevOps",
+}
+
+# Niveaux ordinaux (textes normalisés). DevOps est renseigné en Oui/Non : Oui compte comme le
+# niveau le plus élevé.
+SKILL_LEVELS = {
+    "non": 0,
+    "debutant": 1,
+    "intermediaire": 2,
+    "avance": 3,
+    "oui": 3,
+}
+MAX_LEVEL = 3
+LEVEL_LABELS = ["Aucun", "Débutant", "Intermédiaire", "Avancé"]
+
+# Un domaine est couvert si au moins un membre y a ce niveau
+COVERED_LEVEL = 2
+
+LANGUAGE_SEPARATORS = re.compile(r"[,;/&]|\bet\b")
+
+
+# Fonction pour normaliser un texte : minuscules, accents supprimés, espaces retirés
+def _normalize(text):
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r"\s+", "", text.lower())
+
+# Niveau ordinal d'un texte (NaN si vide ou inconnu)
+def skill_level(text):
+    return SKILL_LEVELS.get(_normalize(text), np.nan)
+
+# Fonction pour découper la liste des langages d'un membre ("C/C++", "Node.js" = "NodeJS")
+def split_languages(text):
+    languages = []
+    for part in LANGUAGE_SEPARATORS.split(str(text)):
+        part = part.strip()
+        if part:
+            languages.append((_normalize(part).replace(".", ""), part))
+    return languages
+
+
+class SkillMatrix:
+    def __init__(self, teams):
+        self.team_names = [team.name for team in teams]
+        self.areas = list(SKILL_AREAS)
+        team_count = len(teams)
+        # Taille de la plus grande équipe (les équipes plus petites ont des lignes NaN)
+        team_size = max((len(team_members(team)) for team in teams), default=0)
+
+        # Niveaux : NaN pour un membre absent ou un niveau non renseigné
+        self.levels = np.full((team_count, team_size, len(self.areas)), np.nan, dtype=np.float32)
+        # Vocabulaire des langages : clé normalisée -> indice, avec la première orthographe rencontrée
+        self._language_index = {}
+        self.languages = []
+        member_languages = []
+        for team_index, team in enumerate(teams):
+            for member_index, member in enumerate(team_members(team)):
+                for area_index, field in enumerate(SKILL_AREAS.values()):
+                    self.levels[team_index, member_index, area_index] = skill_level(getattr(member, field))
+                for key, label in split_languages(member.languages):
+                    if key not in self._language_index:
+                        self._language_index[key] = len(self.languages)
+                        self.languages.append(label)
+                    member_languages.append((team_index, member_index, self._language_index[key]))
+
+        self.language_hot = np.zeros((team_count, team_size, len(self.languages)), dtype=bool)
+        if member_languages:
+            self.language_hot[tuple(np.array(member_languages).T)] = True
+
+        # Agrégats par équipe, calculés une fois pour toutes les équipes
+        known = ~np.isnan(self.levels)
+        known_counts = known.sum(axis=1)
+        level_sums = np.where(known, self.levels, 0).sum(axis=1)
+        self.skill_max = np.where(known, self.levels, 0).max(axis=1, initial=0)
+        self.skill_mean = np.divide(level_sums, known_counts, out=np.zeros_like(level_sums), where=known_counts > 0)
+        self.covered = self.skill_max >= COVERED_LEVEL
+        self.coverage = self.covered.mean(axis=1) if self.areas else np.zeros(team_count)
+        self.team_languages = self.language_hot.any(axis=1)
+        self.language_counts = self.team_languages.sum(axis=1)
+        self.member_counts = (known.any(axis=2) | self.language_hot.any(axis=2)).sum(axis=1)
+
+    def __len__(self):
+        return len(self.team_names)
+
+    def language_mask(self, languages):
+        mask = np.ones(len(self), dtype=bool)
+        for language in languages:
+            index = self._language_index.get(_normalize(language).replace(".", ""))
+            if index is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.team_languages[:, index]
+        return mask
+
+    # Masque des équipes ayant, pour chaque domaine, un membre au moins au niveau demandé, tous les
+    # langages demandés et une couverture minimale
+    def mask(self, min_levels=None, languages=(), min_coverage=0.0):
+        mask = self.language_mask(languages)
+        for area, level in (min_levels or {}).items():
+            if level > 0:
+                mask &= self.skill_max[:, self.areas.index(area)] >= level
+        if min_coverage > 0:
+            mask &= self.coverage >= min_coverage
+        return mask
+
+    # Clé de tri décroissante : "coverage", "languages" ou un domaine (niveau max puis moyen)
+    def sort_keys(self, sort_by):
+        if sort_by == "coverage":
+            return (self.coverage, self.skill_mean.mean(axis=1))
+        if sort_by == "languages":
+            return (self.language_counts,)
+        area_index = self.areas.index(sort_by)
+        return (self.skill_max[:, area_index], self.skill_mean[:, area_index])
+
+    # Filtrer (et trier) des indices d'équipes ; sans tri, l'ordre des indices est conservé
+    def select(self, team_indices, min_levels=None, languages=(), min_coverage=0.0, sort_by=None):
+        team_indices = np.asarray(team_indices, dtype=np.intp)
+        team_indices = team_indices[self.mask(min_levels, languages, min_coverage)[team_indices]]
+        if sort_by:
+            # lexsort : dernière clé prioritaire ; à égalité, l'ordre d'entrée est conservé
+            keys = [-key[team_indices] for key in reversed(self.sort_keys(sort_by))]
+            team_indices = team_indices[np.lexsort([np.arange(len(team_indices))] + keys)]
+        return team_indices.tolist()
+
+    # Tableau des agrégats par équipe (une ligne par équipe, dans l'ordre des indices donnés)
+    def summary_frame(self, team_indices=None):
+        if team_indices is None:
+            team_indices = range(len(self))
+        team_indices = np.asarray(team_indices, dtype=np.intp)
+        data = {"Équipe": [self.team_names[index] for index in team_indices]}
+        for area_index, area in enumerate(self.areas):
+            data[f"{SKILL_AREA_LABELS[area]} (max)"] = self.skill_max[team_indices, area_index]
+            data[f"{SKILL_AREA_LABELS[area]} (moyen)"] = self.skill_mean[team_indices, area_index].round(2)
+        data["Couverture"] = self.coverage[team_indices]
+        data["Langages"] = [
+            ", ".join(self.languages[i] for i in np.flatnonzero(self.team_languages[index]))
+            for index in team_indices
+        ]
+        return pd.DataFrame(data)
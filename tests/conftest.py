@@ -0,0 +1,27 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Les modules de l'application sont à la racine du dépôt
+sys.path.insert(0, ROOT_DIR)
+
+DASHBOARD = os.path.join(ROOT_DIR, "hackathon_dashboard.py")
+
+
+# Tableau de bord exécuté dans un dossier de travail vide (base, journal et instantané du roster
+# créés dans tmp_path) avec le data.csv du dépôt
+@pytest.fixture
+def dashboard(tmp_path, monkeypatch):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    shutil.copy(os.path.join(ROOT_DIR, "data.csv"), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    # Les ressources partagées (base, roster) sont liées au dossier de travail
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    return AppTest.from_file(DASHBOARD, default_timeout=120)
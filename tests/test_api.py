@@ -0,0 +1,61 @@
+import asyncio
+
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from api import ScoreSubmission, ScoringService
+from evaluation_db import EvaluationStore
+from evaluation_storage import COLLECTIVE_CRITERIA
+from roster import Member, Team
+
+COLLECTIVE = COLLECTIVE_CRITERIA[0]
+
+TEAMS = [
+    Team(name="Alpha", members=(Member(slot="leader", name="Awa Diop", email="awa@example.com"),)),
+    Team(name="Beta", members=(Member(slot="leader", name="Marie Ngo"),)),
+]
+
+
+@pytest.fixture
+def service(tmp_path):
+    return ScoringService(EvaluationStore(str(tmp_path / "evaluations.db")), TEAMS)
+
+def submit(service, score, expected_version, force=False):
+    submission = ScoreSubmission(team="Alpha", criterion=COLLECTIVE, score=score,
+                                 expected_version=expected_version, force=force)
+    return asyncio.run(service.submit(submission))
+
+
+def test_expected_version_is_required():
+    with pytest.raises(ValidationError):
+        ScoreSubmission(team="Alpha", criterion=COLLECTIVE, score=10)
+
+
+def test_stale_version_is_refused_unless_forced(service):
+    assert submit(service, 10, expected_version=0).ok
+    refused = submit(service, 12, expected_version=0)
+    assert (refused.ok, refused.score, refused.version) == (False, 10.0, 1)
+    forced = submit(service, 12, expected_version=0, force=True)
+    assert (forced.ok, forced.version) == (True, 2)
+    assert service.engine.score("Alpha", "", COLLECTIVE) == 12.0
+
+
+def test_export_uses_scores_at_request_time(service):
+    submit(service, 10, expected_version=0)
+
+    async def export_while_scoring():
+        export = asyncio.ensure_future(service.export_file("evaluations", "csv"))
+        # Écriture sur la boucle pendant la génération du fichier dans le pool de threads
+        await asyncio.sleep(0)
+        service._apply("Alpha", "", COLLECTIVE, 15, 2)
+        return await export
+
+    exported = pd.read_csv(asyncio.run(export_while_scoring()), keep_default_na=False)
+    row = exported[(exported["team_name"] == "Alpha") & (exported["criterion"] == COLLECTIVE)]
+    assert row["score"].tolist() == [10.0]
+
+
+def test_team_etags_differ_between_teams(service):
+    assert service.team_etag("Alpha") != service.team_etag("Beta")
+    assert service.team_etag("Équipe «Été»").isascii()
@@ -0,0 +1,31 @@
+from evaluation_db import DB_FILE, EvaluationStore
+from evaluation_storage import INDIVIDUAL_CRITERIA
+from roster import DATA_FILE, load_roster_snapshot, member_keys
+
+INDIVIDUAL = INDIVIDUAL_CRITERIA[0]
+
+
+def scores_of(store, team_name):
+    return {(row.member, row.criterion): (row.score, row.version) for row in store.load()[0] if row.team == team_name}
+
+# Exécuter le script avec un onglet affiché (AppTest ne conserve pas l'onglet choisi)
+def run_with_tab(at, label):
+    at.session_state["active_tab"] = label
+    return at.run()
+
+
+def test_orphan_cleanup_keeps_moved_score(dashboard):
+    team = next(team for team in load_roster_snapshot(DATA_FILE).teams if len(team.members) >= 2)
+    member_id, member_name = member_keys(team)[1]
+    dashboard.run()
+    store = EvaluationStore(DB_FILE)
+    # Note rangée sous l'ancien nom du membre : déplacée vers son identifiant par le nettoyage
+    store.upsert(team.name, member_name.lower(), INDIVIDUAL, 15.0, judge="Ancien")
+    run_with_tab(dashboard, "Doublons")
+
+    dashboard.button(key="dedup_orphans").click()
+    run_with_tab(dashboard, "Doublons")
+    dashboard.run()
+    assert not dashboard.exception
+    assert scores_of(store, team.name) == {(member_id, INDIVIDUAL): (15.0, 1)}
+    assert dashboard.number_input(key=f"score|{team.name}|{member_id}|{INDIVIDUAL}").value == 15.0
@@ -0,0 +1,19 @@
+from dedup import find_duplicate_people, find_duplicate_teams, person_records
+from roster import Member, Team
+
+
+def team(name, *people):
+    return Team(name=name, members=tuple(
+        Member(slot="leader" if i == 0 else f"member{i}", name=person, email=f"{person.split()[0].lower()}@example.com")
+        for i, person in enumerate(people)
+    ))
+
+
+def test_shared_members_score_uses_smaller_team_size():
+    teams = [
+        team("Alpha", "Awa Diop", "Paul Eto"),
+        team("Les Bâtisseurs", "Awa Diop", "Paul Eto", "Marie Ngo", "Jean Fouda", "Serge Belinga"),
+    ]
+    records = person_records(teams)
+    groups = find_duplicate_teams(teams, records, find_duplicate_people(records))
+    assert [(group.items, group.score) for group in groups] == [([0, 1], 1.0)]
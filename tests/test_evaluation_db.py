@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+from evaluation_db import EvaluationStore, evaluations_from_rows
+from evaluation_model import RUBRIC
+from evaluation_journal import EvaluationJournal
+from evaluation_storage import COLLECTIVE_CRITERIA, INDIVIDUAL_CRITERIA, TEAM_LEVEL_MEMBER
+
+COLLECTIVE = COLLECTIVE_CRITERIA[0]
+INDIVIDUAL = INDIVIDUAL_CRITERIA[0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EvaluationStore(str(tmp_path / "evaluations.db"))
+
+
+def test_upsert_versions_each_write(store):
+    first = store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10, expected_version=0, judge="J1")
+    second = store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 12, expected_version=1, judge="J2")
+    assert (first.ok, first.version) == (True, 1)
+    assert (second.ok, second.version) == (True, 2)
+    assert second.seq > first.seq
+    rows, seq = store.load()
+    assert [(row.score, row.version, row.judge) for row in rows] == [(12.0, 2, "J2")]
+    assert seq == second.seq
+
+
+def test_upsert_conflict_keeps_current_score(store):
+    store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10, expected_version=0, judge="J1")
+    result = store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 15, expected_version=0, judge="J2")
+    assert not result.ok
+    assert (result.version, result.score, result.judge) == (1, 10.0, "J1")
+    rows, _ = store.load()
+    assert [row.score for row in rows] == [10.0]
+
+
+def test_upsert_without_expected_version_overwrites(store):
+    store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10, expected_version=0)
+    result = store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 15)
+    assert (result.ok, result.version) == (True, 2)
+
+
+def test_out_of_range_stored_scores_are_clamped_on_load(store):
+    max_score = RUBRIC.max_scores[COLLECTIVE]
+    store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, max_score + 5)
+    store.upsert("A", "m1", INDIVIDUAL, -1)
+    rows, _ = store.load()
+    evaluations = evaluations_from_rows(rows)
+    assert evaluations["A"]["collective"][COLLECTIVE] == max_score
+    assert evaluations["A"]["individual"]["m1"][INDIVIDUAL] == 0.0
+
+
+def test_upsert_many_with_versions_reports_conflicts(store):
+    store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10, expected_version=0, judge="J1")
+    # Le jury J2 a chargé la version 1, puis J1 a modifié la note
+    store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 11, expected_version=1, judge="J1")
+    written, conflicts = store.upsert_many(
+        [("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 15), ("B", TEAM_LEVEL_MEMBER, COLLECTIVE, 7)],
+        judge="J2", expected_versions={("A", TEAM_LEVEL_MEMBER, COLLECTIVE): 1}
+    )
+    assert written == 1
+    assert [(c.team, c.score, c.current_score, c.current_judge) for c in conflicts] == [("A", 15.0, 11.0, "J1")]
+    rows, _ = store.load()
+    assert sorted((row.team, row.score) for row in rows) == [("A", 11.0), ("B", 7.0)]
+
+
+def test_changes_since_returns_only_new_rows(store):
+    first = store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10)
+    store.upsert("B", "m1", INDIVIDUAL, 8)
+    rows, latest = store.changes_since(first.seq)
+    assert [(row.team, row.member, row.score) for row in rows] == [("B", "m1", 8.0)]
+    assert latest == store.latest_seq()
+    assert store.changes_since(latest) == ([], latest)
+
+
+def test_import_saved_reports_newer_scores_as_conflicts(store):
+    store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10, judge="J1")
+    saved_at = time.time()
+    time.sleep(0.01)
+    store.upsert("A", "m1", INDIVIDUAL, 14, judge="J2")
+    written, conflicts = store.import_saved([
+        ("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 11, saved_at),
+        ("A", "m1", INDIVIDUAL, 9, saved_at),
+        ("B", TEAM_LEVEL_MEMBER, COLLECTIVE, 5, saved_at),
+    ], judge="J3")
+    assert written == 2
+    assert [(c.team, c.member, c.score, c.current_score, c.current_judge) for c in conflicts] == [
+        ("A", "m1", 9.0, 14.0, "J2")
+    ]
+    scores = {(row.team, row.member): row.score for row in store.load()[0]}
+    assert scores == {("A", TEAM_LEVEL_MEMBER): 11.0, ("A", "m1"): 14.0, ("B", TEAM_LEVEL_MEMBER): 5.0}
+
+
+def test_import_saved_skips_identical_scores(store):
+    store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10)
+    seq = store.latest_seq()
+    written, conflicts = store.import_saved([("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10, 0.0)])
+    assert (written, conflicts) == (0, [])
+    assert store.latest_seq() == seq
+
+
+def test_later_save_of_another_score_does_not_hide_a_conflict(store, tmp_path):
+    journal = EvaluationJournal(str(tmp_path / "evaluations.csv"))
+    journal.append([("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 5)])
+    time.sleep(0.01)
+    store.upsert("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 7, judge="B")
+    time.sleep(0.01)
+    journal.append([("A", "m1", INDIVIDUAL, 3)])
+
+    entries = [(*key, *value) for key, value in journal.saved_scores().items()]
+    written, conflicts = store.import_saved(entries, judge="A")
+    assert written == 1
+    assert [(c.score, c.current_score, c.current_judge) for c in conflicts] == [(5.0, 7.0, "B")]
+
+
+def test_only_saved_criteria_are_imported_after_compaction(store, tmp_path):
+    journal = EvaluationJournal(str(tmp_path / "evaluations.csv"), compact_every=2)
+    journal.append([("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 5), ("A", "m1", INDIVIDUAL, 3)])
+    # L'instantané contient toutes les notes des évaluations (critères à 0 et totaux compris)
+    entries = [(*key, *value) for key, value in journal.saved_scores().items()]
+    assert sorted(entry[:4] for entry in entries) == [("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 5.0), ("A", "m1", INDIVIDUAL, 3.0)]
+    assert store.import_saved(entries) == (2, [])
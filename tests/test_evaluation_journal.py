@@ -0,0 +1,87 @@
+import pytest
+
+from evaluation_journal import EvaluationJournal
+from evaluation_storage import COLLECTIVE_CRITERIA, INDIVIDUAL_CRITERIA, TEAM_LEVEL_MEMBER
+from roster import Member, MemberDirectory, Team, member_keys
+
+COLLECTIVE = COLLECTIVE_CRITERIA[0]
+INDIVIDUAL = INDIVIDUAL_CRITERIA[0]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return EvaluationJournal(str(tmp_path / "evaluations.csv"))
+
+
+def test_restore_replays_journal(journal):
+    assert journal.restore() is None
+    journal.append([("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10), ("A", "m1", INDIVIDUAL, 7)])
+    journal.append([("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 12)])
+    evaluations = journal.restore()
+    assert evaluations["A"]["collective"][COLLECTIVE] == 12.0
+    assert evaluations["A"]["individual"]["m1"][INDIVIDUAL] == 7.0
+
+
+def test_restore_ignores_truncated_last_line(journal):
+    journal.append([("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10)])
+    with open(journal.journal_file, "ab") as f:
+        f.write(b'{"team": "A", "member": "", "crit')
+    evaluations = journal.restore()
+    assert evaluations["A"]["collective"][COLLECTIVE] == 10.0
+
+
+def test_append_after_truncated_write_drops_partial_line(journal):
+    journal.append([("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10)])
+    with open(journal.journal_file, "ab") as f:
+        f.write(b'{"team": "A", "member": "", "crit')
+    # Nouveau processus : le journal est relu depuis le disque
+    journal = EvaluationJournal(journal.snapshot_file)
+    journal.append([("B", TEAM_LEVEL_MEMBER, COLLECTIVE, 5)])
+    with open(journal.journal_file, "rb") as f:
+        assert f.read().count(b"\n") == 2
+    evaluations = journal.restore()
+    assert evaluations["A"]["collective"][COLLECTIVE] == 10.0
+    assert evaluations["B"]["collective"][COLLECTIVE] == 5.0
+
+
+def test_corrupt_line_before_the_end_is_an_error(journal):
+    journal.append([("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10)])
+    with open(journal.journal_file, "ab") as f:
+        f.write(b"pas du json\n")
+    journal.append([("B", TEAM_LEVEL_MEMBER, COLLECTIVE, 5)])
+    with pytest.raises(ValueError, match="ligne 2"):
+        journal.restore()
+
+
+def test_compaction_keeps_scores_and_empties_journal(tmp_path):
+    journal = EvaluationJournal(str(tmp_path / "evaluations.csv"), compact_every=3)
+    journal.append([("A", TEAM_LEVEL_MEMBER, COLLECTIVE, 10), ("A", "m1", INDIVIDUAL, 7)])
+    journal.append([("B", TEAM_LEVEL_MEMBER, COLLECTIVE, 5)])
+    with open(journal.journal_file, "rb") as f:
+        assert f.read() == b""
+    journal.append([("B", TEAM_LEVEL_MEMBER, COLLECTIVE, 6)])
+    evaluations = EvaluationJournal(journal.snapshot_file).restore()
+    assert evaluations["A"]["collective"][COLLECTIVE] == 10.0
+    assert evaluations["A"]["individual"]["m1"][INDIVIDUAL] == 7.0
+    assert evaluations["B"]["collective"][COLLECTIVE] == 6.0
+
+
+def test_member_ids_survive_save_and_reload(tmp_path):
+    team = Team(name="Alpha", members=(
+        Member(slot="leader", name="Awa_Diop, Jr.", email="awa@example.com"),
+        Member(slot="member1", name="Paul Eto "),
+    ))
+    (leader_id, _), (member_id, _) = member_keys(team)
+    assert member_id == "slot:member1"
+    journal = EvaluationJournal(str(tmp_path / "evaluations.csv"), compact_every=3)
+    journal.append([("Alpha", leader_id, INDIVIDUAL, 7), ("Alpha", member_id, INDIVIDUAL, 4)])
+    # Compaction : les notes passent par l'instantané CSV
+    journal.append([("Alpha", TEAM_LEVEL_MEMBER, COLLECTIVE, 10)])
+    journal.append([("Alpha", member_id, INDIVIDUAL, 5)])
+
+    evaluations = EvaluationJournal(journal.snapshot_file).restore()
+    assert set(evaluations["Alpha"]["individual"]) == {leader_id, member_id}
+    assert evaluations["Alpha"]["individual"][leader_id][INDIVIDUAL] == 7.0
+    assert evaluations["Alpha"]["individual"][member_id][INDIVIDUAL] == 5.0
+    directory = MemberDirectory([team])
+    assert [directory.name("Alpha", key) for key in evaluations["Alpha"]["individual"]] == ["Awa_Diop, Jr.", "Paul Eto "]
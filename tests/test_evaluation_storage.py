@@ -0,0 +1,46 @@
+import os
+
+from evaluation_storage import COLLECTIVE_CRITERIA, INDIVIDUAL_CRITERIA, read_evaluations_from_csv
+from roster import Member, MemberDirectory, Team
+
+COLLECTIVE = COLLECTIVE_CRITERIA[0]
+INDIVIDUAL = INDIVIDUAL_CRITERIA[0]
+
+TEAMS = [
+    Team(name="Alpha", members=(Member(slot="leader", name="Awa Diop"),)),
+    Team(name="Beta", members=(Member(slot="leader", name="Marie Ngo"), Member(slot="member1", name="Paul Eto"))),
+]
+
+
+# Ancien format large : chaque ligne a les colonnes de tous les membres, remplies de 0 pour les
+# membres des autres équipes
+def write_wide_csv(path):
+    columns = ["team_name", f"collective_{COLLECTIVE}", "collective_totalScore", "finalScore"]
+    for member in ["Awa_Diop", "Marie_Ngo", "Paul_Eto"]:
+        columns += [f"individual_{member}_{INDIVIDUAL}", f"individual_{member}_totalScore"]
+    rows = [
+        ["Alpha", 12, 12, 0, 8, 8, 0, 0, 0, 0],
+        ["Beta", 5, 5, 0, 0, 0, 6, 6, 0, 0],
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(columns) + "\n")
+        for row in rows:
+            f.write(",".join(map(str, row)) + "\n")
+
+
+def test_migration_drops_padding_members(tmp_path):
+    path = str(tmp_path / "evaluations.csv")
+    write_wide_csv(path)
+    evaluations = read_evaluations_from_csv(path, MemberDirectory(TEAMS))
+
+    assert os.path.exists(f"{path}.wide.bak")
+    assert evaluations["Alpha"]["collective"][COLLECTIVE] == 12.0
+    assert set(evaluations["Alpha"]["individual"]) == {"Awa Diop"}
+    assert evaluations["Alpha"]["individual"]["Awa Diop"][INDIVIDUAL] == 8.0
+    # Paul Eto est inscrit dans Beta : gardé même sans note ; Awa Diop n'y est pas inscrite
+    assert set(evaluations["Beta"]["individual"]) == {"Marie Ngo", "Paul Eto"}
+    assert evaluations["Beta"]["individual"]["Marie Ngo"][INDIVIDUAL] == 6.0
+
+    # Le fichier migré (format long) est relu sans les membres ajoutés par l'ancien format
+    evaluations = read_evaluations_from_csv(path)
+    assert set(evaluations["Alpha"]["individual"]) == {"Awa Diop"}
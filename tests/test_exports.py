@@ -0,0 +1,71 @@
+import os
+
+import pandas as pd
+import pytest
+
+from evaluation_storage import COLLECTIVE_CRITERIA, INDIVIDUAL_CRITERIA
+from exports import ExportCache, evaluation_chunks, ranking_chunks
+from leaderboard import Leaderboard
+from roster import Member, Team, member_ids
+from scoring import ScoreEngine
+
+COLLECTIVE = COLLECTIVE_CRITERIA[0]
+INDIVIDUAL = INDIVIDUAL_CRITERIA[0]
+
+TEAMS = [
+    Team(name=f"Equipe_{i}", members=tuple(
+        Member(slot="leader" if j == 0 else f"member{j}", name=f"Membre {i}.{j}") for j in range(i % 3 + 1)
+    ))
+    for i in range(7)
+]
+
+
+@pytest.fixture
+def engine():
+    engine = ScoreEngine({})
+    for i, team in enumerate(TEAMS):
+        engine.set_score(team.name, "", COLLECTIVE, i)
+        for member_id in member_ids(team):
+            engine.set_score(team.name, member_id, INDIVIDUAL, 1)
+    return engine
+
+def leaderboard_of(engine):
+    return Leaderboard([team.name for team in TEAMS], {
+        team_name: team_eval["finalScore"] for team_name, team_eval in engine.evaluations.items()
+    })
+
+
+def test_ranking_export_is_written_in_chunks(engine, tmp_path):
+    cache = ExportCache(str(tmp_path))
+    path = cache.get("classement", "csv", 1, lambda: ranking_chunks(engine, leaderboard_of(engine), TEAMS, chunk_rows=2))
+    exported = pd.read_csv(path)
+    assert exported["Équipe"].tolist() == [f"Equipe_{i}" for i in reversed(range(7))]
+    # Une paire de colonnes par emplacement : chef d'équipe, membre 1, membre 2
+    assert "Membre 2 (Score)" in exported.columns
+
+
+def test_export_is_cached_per_version(engine, tmp_path):
+    cache = ExportCache(str(tmp_path))
+    calls = []
+
+    def chunks():
+        calls.append(1)
+        return evaluation_chunks(engine.evaluations, chunk_rows=20)
+
+    first = cache.get("evaluations", "csv", 1, chunks)
+    assert cache.get("evaluations", "csv", 1, chunks) == first
+    assert len(calls) == 1
+    second = cache.get("evaluations", "csv", 2, chunks)
+    assert len(calls) == 2
+    assert not os.path.exists(first)
+    exported = pd.read_csv(second, keep_default_na=False)
+    assert set(exported["team_name"]) == {team.name for team in TEAMS}
+
+
+@pytest.mark.parametrize("export_format, module", [("xlsx", "openpyxl"), ("parquet", "pyarrow")])
+def test_optional_formats(engine, tmp_path, export_format, module):
+    pytest.importorskip(module)
+    cache = ExportCache(str(tmp_path))
+    path = cache.get("evaluations", export_format, 1, lambda: evaluation_chunks(engine.evaluations, chunk_rows=20))
+    exported = pd.read_excel(path) if export_format == "xlsx" else pd.read_parquet(path)
+    assert len(exported) == len(pd.concat(list(evaluation_chunks(engine.evaluations))))
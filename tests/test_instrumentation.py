@@ -0,0 +1,32 @@
+import threading
+
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+from instrumentation import RunHistory, RunProfile, section
+
+
+def test_streamlit_is_patched_only_while_a_run_is_measured():
+    button, rerun, method = st.button, st.rerun, DeltaGenerator.button
+    history = RunHistory()
+    profile = RunProfile(history=history).start()
+    assert st.button is not button and DeltaGenerator.button is not method
+    with section("calcul"):
+        pass
+    profile.stop()
+    assert (st.button, st.rerun, DeltaGenerator.button) == (button, rerun, method)
+    assert list(history.runs_named("page")[0]["sections_ms"]) == ["calcul"]
+
+
+def test_patches_stay_until_the_last_measured_run_stops():
+    button = st.button
+    first = RunProfile().start()
+    # Exécution d'une autre session (autre thread), mesurée en même temps
+    second = RunProfile()
+    thread = threading.Thread(target=second.start)
+    thread.start()
+    thread.join()
+    first.stop()
+    assert st.button is not button
+    second.stop()
+    assert st.button is button
@@ -0,0 +1,77 @@
+import pytest
+
+from judge_assignment import Judge, assign_teams, conflict_matrix, parse_judges
+from roster import Member, Team
+
+
+def team(name, department="", level=""):
+    return Team(name=name, members=(Member(slot="leader", name=f"Chef {name}", department=department, level=level),))
+
+TEAMS = [
+    team("T0", "Informatique", "Niveau 3"),
+    team("T1", "Informatique", "Niveau 1"),
+    team("T2", "Génie civil"),
+    team("T3", "Réseaux"),
+    team("T4"),
+    team("T5", "Informatique", "Niveau 3"),
+]
+
+JUDGES = [
+    Judge("J0", "informatique", ""),
+    Judge("J1", "Informatique", "niveau 3"),
+    Judge("J2", "", ""),
+    Judge("J3", "Réseaux", ""),
+]
+
+
+def test_conflicts_follow_department_and_declared_level():
+    conflicts = conflict_matrix(TEAMS, JUDGES)
+    # J0 : tout le département ; J1 : seulement le même niveau ; J2 : aucun conflit
+    assert conflicts[:, 0].tolist() == [True, True, False, False, False, True]
+    assert conflicts[:, 1].tolist() == [True, False, False, False, False, True]
+    assert not conflicts[:, 2].any()
+    assert conflicts[:, 3].tolist() == [False, False, False, True, False, False]
+
+
+@pytest.mark.parametrize("overlap", [1, 2, 3])
+def test_assignment_respects_conflicts_and_overlap(overlap):
+    schedule = assign_teams(TEAMS, JUDGES, overlap)
+    conflicts = conflict_matrix(TEAMS, JUDGES)
+    for team_index, judge_indices in enumerate(schedule.team_judges):
+        assert len(set(judge_indices)) == len(judge_indices)
+        assert not any(conflicts[team_index, judge_index] for judge_index in judge_indices)
+        eligible = int((~conflicts[team_index]).sum())
+        assert len(judge_indices) == min(overlap, eligible)
+
+
+def test_loads_are_balanced_without_conflicts():
+    teams = [team(f"T{i}") for i in range(10)]
+    judges = [Judge(f"J{j}", "", "") for j in range(4)]
+    loads = assign_teams(teams, judges, overlap=2).loads()
+    assert sum(loads) == 20
+    assert max(loads) - min(loads) <= 1
+
+
+def test_shortfall_when_too_few_judges_are_eligible():
+    schedule = assign_teams(TEAMS, JUDGES, overlap=4)
+    # T0 et T5 n'ont que J2 et J3, T1 et T3 ont trois jurys possibles
+    assert dict(schedule.shortfalls()) == {"T0": 2, "T1": 1, "T3": 1, "T5": 2}
+
+
+def test_assignment_is_deterministic():
+    first = assign_teams(TEAMS, JUDGES, 2)
+    second = assign_teams(TEAMS, JUDGES, 2)
+    assert first.team_judges == second.team_judges
+    assert first.teams_for("j0") == first.teams_for("J0")
+    assert first.teams_for("Inconnu") is None
+
+
+def test_parse_judges_rejects_invalid_descriptions():
+    with pytest.raises(ValueError, match="aucun jury"):
+        parse_judges({"judges": []})
+    with pytest.raises(ValueError, match="en double"):
+        parse_judges({"judges": [{"name": "Dr Ngono"}, {"name": "dr ngono"}]})
+    with pytest.raises(ValueError, match="overlap"):
+        parse_judges({"overlap": 3, "judges": [{"name": "A"}, {"name": "B"}]})
+    judges, overlap = parse_judges({"judges": [{"name": " A ", "department": "Info"}]})
+    assert (judges, overlap) == ([Judge("A", "Info", "")], 1)
@@ -0,0 +1,35 @@
+import random
+
+from leaderboard import Leaderboard
+
+
+def test_ties_share_a_rank_and_keep_registration_order():
+    leaderboard = Leaderboard(["A", "B", "C", "D"], {"A": 10, "B": 12, "C": 12, "D": 5})
+    assert leaderboard.top() == [(1, "B", 12.0), (1, "C", 12.0), (3, "A", 10.0), (4, "D", 5.0)]
+    assert leaderboard.top(2) == [(1, "B", 12.0), (1, "C", 12.0)]
+    assert (leaderboard.rank_of("C"), leaderboard.position_of("C")) == (1, 2)
+    assert leaderboard.rank_of("D") == 4
+
+
+def test_updates_move_teams_without_full_resort():
+    leaderboard = Leaderboard(["A", "B"], {"A": 10, "B": 12})
+    leaderboard.update("A", 15)
+    leaderboard.update("E", 11)
+    assert [team_name for _, team_name, _ in leaderboard.top()] == ["A", "B", "E"]
+    assert "E" in leaderboard and len(leaderboard) == 3
+    assert leaderboard.score_of("A") == 15.0
+
+
+def test_random_updates_match_a_full_sort():
+    rng = random.Random(8)
+    names = [f"Equipe_{i}" for i in range(50)]
+    leaderboard = Leaderboard(names)
+    scores = dict.fromkeys(names, 0.0)
+    for _ in range(500):
+        team_name = rng.choice(names)
+        scores[team_name] = float(rng.randint(0, 20))
+        leaderboard.update(team_name, scores[team_name])
+    expected = sorted(names, key=lambda team_name: (-scores[team_name], names.index(team_name)))
+    assert [team_name for _, team_name, _ in leaderboard.top()] == expected
+    for team_name in names:
+        assert leaderboard.rank_of(team_name) == 1 + sum(score > scores[team_name] for score in scores.values())
@@ -0,0 +1,47 @@
+from roster import load_roster_snapshot, read_registrations, snapshot_file, transform_data
+
+HEADER = "team_name,team_description,team_projects,leader_name,leader_phone,leader_level,member1_name,member1_level\n"
+
+
+def write_registrations(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        for row in rows:
+            f.write(row + "\n")
+
+
+def test_chunked_read_keeps_used_columns_and_reports_bad_rows(tmp_path):
+    path = tmp_path / "data.csv"
+    write_registrations(path, [
+        "Alpha,Web,long texte,Awa Diop,690065308,3,Paul Eto,2",
+        "Beta,Mobile,long texte,Marie Ngo,,2,,,en trop",
+        ",IA,long texte,Jean Fouda,,1,,",
+        "Gamma,Jeux,long texte,Serge Belinga,,3,,",
+    ])
+    df, problems = read_registrations(str(path), chunksize=2)
+
+    assert "team_projects" not in df.columns
+    assert str(df["leader_level"].dtype) == "category"
+    assert set(df["leader_level"].cat.categories) == {"1", "3"}
+    assert df["team_name"].fillna("").tolist() == ["Alpha", "", "Gamma"]
+    assert any("Ligne 3 ignorée" in problem for problem in problems)
+    assert any("nom d'équipe manquant" in problem for problem in problems)
+
+    teams = transform_data(df)
+    assert [team.name for team in teams] == ["Alpha", "Équipe_1", "Gamma"]
+    assert [member.name for member in teams[0].members] == ["Awa Diop", "Paul Eto"]
+    assert teams[0].members[0].phone == "690065308"
+    assert [member.slot for member in teams[2].members] == ["leader"]
+
+
+def test_roster_snapshot_is_reused_until_the_file_changes(tmp_path):
+    path = tmp_path / "data.csv"
+    write_registrations(path, ["Alpha,Web,,Awa Diop,,3,,"])
+    first = load_roster_snapshot(str(path))
+    assert (tmp_path / ".data.csv.roster.pkl").exists() and snapshot_file(str(path)).endswith(".data.csv.roster.pkl")
+    assert load_roster_snapshot(str(path)) == first
+
+    write_registrations(path, ["Alpha,Web,,Awa Diop,,3,,", "Beta,IA,,Marie Ngo,,2,,"])
+    second = load_roster_snapshot(str(path))
+    assert second.fingerprint != first.fingerprint
+    assert [team.name for team in second.teams] == ["Alpha", "Beta"]
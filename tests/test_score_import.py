@@ -0,0 +1,101 @@
+import io
+
+import pandas as pd
+import pytest
+
+from evaluation_model import CRITERION_MAX
+from evaluation_storage import COLLECTIVE_CRITERIA, INDIVIDUAL_CRITERIA, TEAM_LEVEL_MEMBER
+from roster import Member, Team, member_ids
+from score_import import load_score_sheet, score_sheet_template, sheet_to_long, validate_scores
+
+COLLECTIVE, OTHER_COLLECTIVE = COLLECTIVE_CRITERIA[:2]
+INDIVIDUAL = INDIVIDUAL_CRITERIA[0]
+
+TEAMS = [
+    Team(name="Alpha", members=(
+        Member(slot="leader", name="Awa Diop", email="awa@example.com"),
+        Member(slot="member1", name="Paul Biya"),
+    )),
+    Team(name="Beta", members=(Member(slot="leader", name="Marie Ngo"),)),
+]
+
+
+def load_csv(text):
+    return load_score_sheet(io.StringIO(text), TEAMS, filename="notes.csv")
+
+def errors_by_line(errors):
+    return dict(zip(errors["ligne"], errors["erreur"]))
+
+
+def test_sheet_imports_scores_and_resolves_members():
+    valid, errors = load_csv(
+        f"team_name,member_name,{COLLECTIVE},{INDIVIDUAL}\n"
+        f"Alpha,,12,\n"
+        f"Alpha,Awa Diop,,\"7,5\"\n"
+    )
+    assert errors.empty
+    assert valid.values.tolist() == [
+        ["Alpha", TEAM_LEVEL_MEMBER, COLLECTIVE, 12.0],
+        ["Alpha", member_ids(TEAMS[0])[0], INDIVIDUAL, 7.5],
+    ]
+
+
+def test_invalid_rows_are_reported_with_their_sheet_line():
+    valid, errors = load_csv(
+        f"team_name,member_name,criterion,score\n"
+        f"Alpha,,{COLLECTIVE},10\n"
+        f"Gamma,,{COLLECTIVE},10\n"
+        f"Alpha,,inconnu,10\n"
+        f"Alpha,,{OTHER_COLLECTIVE},dix\n"
+        f"Beta,,{COLLECTIVE},{CRITERION_MAX[COLLECTIVE] + 1}\n"
+        f"Beta,Marie Ngo,{COLLECTIVE},5\n"
+        f"Beta,,{INDIVIDUAL},5\n"
+        f"Beta,Inconnu,{INDIVIDUAL},5\n"
+    )
+    assert valid.values.tolist() == [["Alpha", TEAM_LEVEL_MEMBER, COLLECTIVE, 10.0]]
+    assert errors_by_line(errors) == {
+        3: "équipe inconnue",
+        4: "critère inconnu",
+        5: "note non numérique",
+        6: "note hors de l'intervalle autorisé",
+        7: "critère collectif noté pour un membre",
+        8: "critère individuel sans membre",
+        9: "membre inconnu dans cette équipe",
+    }
+
+
+def test_negative_score_is_rejected():
+    _, errors = load_csv(f"team_name,member_name,criterion,score\nAlpha,,{COLLECTIVE},-1\n")
+    assert errors_by_line(errors) == {2: "note hors de l'intervalle autorisé"}
+
+
+def test_same_member_by_name_and_id_is_a_duplicate():
+    member_id = member_ids(TEAMS[0])[0]
+    valid, errors = load_csv(
+        f"team_name,member_name,criterion,score\n"
+        f"Alpha,Awa Diop,{INDIVIDUAL},5\n"
+        f"Alpha,{member_id},{INDIVIDUAL},6\n"
+    )
+    assert valid.empty
+    assert errors_by_line(errors) == {2: "note en double dans la feuille", 3: "note en double dans la feuille"}
+
+
+def test_several_errors_on_one_row_are_joined():
+    _, errors = load_csv("team_name,member_name,criterion,score\nGamma,,inconnu,abc\n")
+    assert errors_by_line(errors) == {2: "équipe inconnue; critère inconnu; note non numérique"}
+
+
+def test_sheet_without_criteria_is_refused():
+    with pytest.raises(ValueError):
+        sheet_to_long(pd.DataFrame({"team_name": ["Alpha"], "commentaire": ["ok"]}))
+    with pytest.raises(ValueError):
+        sheet_to_long(pd.DataFrame({"equipe": ["Alpha"], COLLECTIVE: ["10"]}))
+
+
+def test_template_round_trips_without_errors():
+    template = score_sheet_template(TEAMS).astype(object)
+    template.loc[0, COLLECTIVE] = "10"
+    template.loc[1, INDIVIDUAL] = "8"
+    valid, errors = validate_scores(sheet_to_long(template), TEAMS)
+    assert errors.empty
+    assert len(valid) == 2
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from evaluation_model import RUBRIC
+from evaluation_storage import COLLECTIVE_CRITERIA, INDIVIDUAL_CRITERIA
+from leaderboard import Leaderboard
+from scoring import ScoreEngine, calculate_final_score
+
+MAX_SCORES = RUBRIC.max_scores
+
+
+def random_score(rng, criterion):
+    return rng.randint(0, int(MAX_SCORES[criterion]))
+
+# Évaluations de départ : quelques équipes déjà notées, de tailles différentes
+def initial_evaluations(rng):
+    engine = ScoreEngine({})
+    for team_index in range(5):
+        team_name = f"Equipe_{team_index}"
+        for criterion in COLLECTIVE_CRITERIA:
+            engine.set_score(team_name, "", criterion, random_score(rng, criterion))
+        for member_index in range(team_index % 4 + 1):
+            for criterion in INDIVIDUAL_CRITERIA:
+                engine.set_score(team_name, f"m{member_index}", criterion, random_score(rng, criterion))
+    return engine.evaluations
+
+# Scores recalculés entièrement, sur une copie des évaluations
+def recomputed(evaluations):
+    copies = {team_name: team_eval.copy() for team_name, team_eval in evaluations.items()}
+    for team_name in copies:
+        calculate_final_score(copies, team_name)
+    return copies
+
+def assert_matches_full_recompute(engine):
+    expected = recomputed(engine.evaluations)
+    for team_name, team_eval in engine.evaluations.items():
+        assert team_eval["finalScore"] == pytest.approx(expected[team_name]["finalScore"], abs=1e-6)
+        assert team_eval["collective"]["totalScore"] == pytest.approx(expected[team_name]["collective"]["totalScore"], abs=1e-6)
+        for member, scores in team_eval["individual"].items():
+            assert scores["totalScore"] == pytest.approx(expected[team_name]["individual"][member]["totalScore"], abs=1e-6)
+
+
+def test_recompute_all_matches_full_recompute():
+    engine = ScoreEngine(initial_evaluations(random.Random(1)))
+    assert_matches_full_recompute(engine)
+
+
+def test_incremental_updates_match_full_recompute():
+    rng = random.Random(2)
+    engine = ScoreEngine(initial_evaluations(rng))
+    for _ in range(500):
+        team_name = f"Equipe_{rng.randrange(6)}"
+        if rng.random() < 0.4:
+            criterion = rng.choice(COLLECTIVE_CRITERIA)
+            engine.set_score(team_name, "", criterion, random_score(rng, criterion))
+        else:
+            criterion = rng.choice(INDIVIDUAL_CRITERIA)
+            engine.set_score(team_name, f"m{rng.randrange(5)}", criterion, random_score(rng, criterion))
+    assert_matches_full_recompute(engine)
+
+
+def test_unchanged_score_is_not_recorded():
+    engine = ScoreEngine({})
+    criterion = COLLECTIVE_CRITERIA[0]
+    assert engine.set_score("A", "", criterion, 10)
+    engine.pop_changes()
+    version = engine.version
+    assert not engine.set_score("A", "", criterion, 10)
+    assert engine.version == version
+    assert engine.pop_changes() == set()
+
+
+def test_record_false_updates_scores_without_pending_change():
+    engine = ScoreEngine({})
+    assert engine.set_score("A", "", COLLECTIVE_CRITERIA[0], 10, record=False)
+    assert engine.pop_changes() == set()
+    assert engine.evaluations["A"]["finalScore"] > 0
+
+
+def test_stored_score_above_lowered_max_is_clamped():
+    engine = ScoreEngine({})
+    criterion = COLLECTIVE_CRITERIA[0]
+    # Note sauvegardée avant une baisse de la note maximale dans rubric.json
+    assert engine.set_score("A", "", criterion, MAX_SCORES[criterion] + 5, record=False)
+    assert engine.evaluations["A"]["collective"][criterion] == MAX_SCORES[criterion]
+    # Une note saisie reste validée strictement
+    with pytest.raises(ValueError):
+        engine.set_score("A", "", criterion, MAX_SCORES[criterion] + 5)
+
+
+def test_leaderboard_follows_engine():
+    engine = ScoreEngine(initial_evaluations(random.Random(3)))
+    leaderboard = Leaderboard(list(engine.evaluations), {
+        team_name: team_eval["finalScore"] for team_name, team_eval in engine.evaluations.items()
+    })
+    engine.subscribe(lambda team_name, score: leaderboard.update(team_name, score))
+    criterion = COLLECTIVE_CRITERIA[0]
+    for team_name in engine.evaluations:
+        engine.set_score(team_name, "", criterion, MAX_SCORES[criterion])
+    expected = sorted(engine.evaluations, key=lambda team_name: -engine.evaluations[team_name]["finalScore"])
+    assert [team_name for _, team_name, _ in leaderboard.top()] == expected
@@ -0,0 +1,35 @@
+from roster import Member, Team
+from team_search import TeamSearchIndex
+
+TEAMS = [
+    Team(name="Les Bâtisseurs", members=(
+        Member(slot="leader", name="Awa Diop", email="awa.diop@example.com", languages="Python, SQL", level="3"),
+    )),
+    Team(name="CodeMasters", description="Applications web", members=(
+        Member(slot="leader", name="Élodie Batiste", github="https://github.com/elodieb", languages="JavaScript", level="2"),
+    )),
+    Team(name="DevWarriors", members=(
+        Member(slot="leader", name="Paul Eto", languages="Python", level="2"),
+    )),
+]
+
+
+def test_search_is_accent_folded_and_ranked():
+    index = TeamSearchIndex(TEAMS)
+    # Nom d'équipe (exact) avant nom de membre (préfixe)
+    assert index.search("batis") == [0, 1]
+    assert index.search("elodie") == [1]
+    assert index.search("elodieb") == [1]
+    # Sous-chaîne d'un mot
+    assert index.search("master") == [1]
+    assert index.search("inconnu") == []
+
+
+def test_filters_combine_with_free_text():
+    index = TeamSearchIndex(TEAMS)
+    assert index.search("language:python") == [0, 2]
+    assert index.search("language:python level:2") == [2]
+    assert index.search("lang:python awa") == [0]
+    # Une clé inconnue reste du texte libre
+    assert index.search("foo:bar") == []
+    assert index.search("") == [0, 1, 2]